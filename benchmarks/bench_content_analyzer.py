@@ -0,0 +1,89 @@
+"""Benchmark ContentAnalyzer.extract_diagram_info on growing inputs.
+
+Builds synthetic blog posts from the generated posts in output/ (or a built-in
+sample when there are none) and reports the time per input size. With the
+single-pass scanner the time per MB stays flat as the input grows.
+
+Usage:
+    python benchmarks/bench_content_analyzer.py [--max-kb 1024] [--repeat 3] [--bounded]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blog_generator.utils.content_analyzer import ContentAnalyzer  # noqa: E402
+
+SAMPLE = """## Architecture
+
+The system "Order Service" is built using Python and FastAPI. The component 'Payment Gateway' integrates with Stripe.
+OrderService calls PaymentGateway via gRPC. PaymentGateway uses Ledger.
+
+## Workflow
+
+Step 1: Validate the incoming request. Step 2: Reserve the inventory. Phase 3: Charge the customer.
+If the payment fails, then release the reservation. When the retry budget is exhausted, then transition from Retrying to Failed.
+
+State: Pending contains validating, reserving
+Status: Completed
+
+```python
+class OrderService(BaseService):
+    retries: int = 3
+    def place(self, order, customer) -> Receipt:
+        self.pending = order
+}
+```
+"""
+
+# A long run of letters, such as an embedded base64 image, that the old
+# per-pattern scan re-read from every position
+BLOB = "data:image/png;base64," + "QUFBQkFBQUNBQUFE" * 1000 + "\n"
+
+
+def load_corpus() -> str:
+    posts = [open(path, "r", encoding="utf-8").read()
+             for path in sorted(glob.glob(os.path.join(os.getcwd(), "output", "*.md")))]
+    return "\n".join(posts) or SAMPLE
+
+
+def build_input(corpus: str, size: int) -> str:
+    return (corpus * (size // len(corpus) + 1))[:size]
+
+
+def time_analysis(content: str, repeat: int, bounded: bool) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ContentAnalyzer.extract_diagram_info(content, bounded=bounded, time_budget=None)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-kb", type=int, default=1024, help="Largest input size in KB")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size (best is reported)")
+    parser.add_argument("--bounded", action="store_true", help="Use bounded extraction (capped spans)")
+    args = parser.parse_args()
+
+    corpora = {'posts': load_corpus(), 'posts+blobs': load_corpus() + BLOB}
+    sizes = []
+    size = 64
+    while size <= args.max_kb:
+        sizes.append(size)
+        size *= 2
+
+    print(f"{'corpus':<12} {'size':>8} {'time':>10} {'ms/MB':>10}")
+    for label, corpus in corpora.items():
+        for kb in sizes:
+            content = build_input(corpus, kb * 1024)
+            elapsed = time_analysis(content, args.repeat, args.bounded)
+            print(f"{label:<12} {kb:>6}KB {elapsed * 1000:>8.1f}ms {elapsed * 1000 / (kb / 1024):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark building a BlogGenerator and its crew for one topic.
+
+Times `BlogGenerator(...).crew()` with the configs parsed by CrewBase for
+every generator (as before the config cache) and served from ConfigCache,
+and reports the mean and p95 per construction. It then reports how long a
+request waits for a crew from a CrewPool that builds the next ones while
+the previous run (simulated by a short sleep) is busy. Crews use the
+offline fake LLM and are built in a temporary directory.
+
+Usage:
+    python benchmarks/bench_crew_construction.py [--runs 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from blog_generator import crew_pool  # noqa: E402
+from blog_generator.crew import BlogGenerator  # noqa: E402
+from blog_generator.utils.config_cache import ConfigCache  # noqa: E402
+from blog_generator.utils.fake_llm import FakeLLM  # noqa: E402
+
+
+def uncached_load_yaml(path):
+    """What CrewBase.load_yaml does: parse the file with the pure Python safe loader."""
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def llm_factory(agent_name):
+    return FakeLLM(samples=["Canned answer."])
+
+
+def measure(runs: int) -> list:
+    timings = []
+    for number in range(runs):
+        start = time.perf_counter()
+        BlogGenerator(use_cache=False, llm_factory=llm_factory).crew()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def measure_pool(runs: int, run_time: float) -> list:
+    crew_pool.BlogGenerator = lambda **options: BlogGenerator(llm_factory=llm_factory, **options)
+    pool = crew_pool.CrewPool(size=2, total=runs, use_cache=False)
+    pool.warm()
+    timings = []
+    for number in range(runs):
+        time.sleep(run_time)
+        start = time.perf_counter()
+        pool.acquire()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50, help="Crews built per measurement")
+    parser.add_argument("--run-time", type=float, default=0.05, help="Seconds each pooled run takes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        # Warm up imports and the knowledge index
+        measure(2)
+
+        cached_load_yaml = ConfigCache.load_yaml
+        ConfigCache.load_yaml = staticmethod(uncached_load_yaml)
+        try:
+            before = measure(args.runs)
+        finally:
+            ConfigCache.load_yaml = cached_load_yaml
+        ConfigCache.clear()
+        after = measure(args.runs)
+        pooled = measure_pool(args.runs, args.run_time)
+
+    for label, timings in (("parsed per crew", before), ("config cache", after), ("crew pool", pooled)):
+        print(f"{label:<16} mean {sum(timings) / len(timings):>7.2f}ms  p95 {percentile(timings, 0.95):>7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
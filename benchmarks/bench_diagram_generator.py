@@ -0,0 +1,102 @@
+"""Micro-benchmark DiagramGenerator on graphs with thousands of nodes and edges.
+
+For each diagram type and size it reports the first (cold) render, a repeated
+render answered from the memo cache, and a batch render of all four types.
+
+Usage:
+    python benchmarks/bench_diagram_generator.py [--sizes 1000 5000 20000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blog_generator.utils.diagram_generator import DiagramGenerator  # noqa: E402
+
+
+def flowchart(n: int) -> Dict:
+    nodes = {f"n{i}": {'label': f"Step {i}", 'shape': ('circle', 'diamond', 'rectangle')[i % 3]} for i in range(n)}
+    connections = [{'from': f"n{i}", 'to': f"n{(i * 7 + 1) % n}", 'label': 'yes' if i % 2 else ''} for i in range(n)]
+    return {'nodes': nodes, 'connections': connections}
+
+
+def class_diagram(n: int) -> Dict:
+    classes = {
+        f"Class{i}": {
+            'attributes': [{'name': f"attr{j}: int"} for j in range(3)],
+            'methods': [{'name': f"method{j}", 'params': ['self', 'value'], 'return_type': 'str'} for j in range(2)],
+        }
+        for i in range(n // 5)
+    }
+    relationships = [{'from': f"Class{i}", 'type': '<|--', 'to': f"Class{i + 1}"} for i in range(n // 5 - 1)]
+    return {'classes': classes, 'relationships': relationships}
+
+
+def component(n: int) -> Dict:
+    containers = [{'id': f"c{i}", 'name': f"Service {i}", 'tech': 'Python', 'desc': f"Service {i} using Python"}
+                  for i in range(n)]
+    relationships = [{'from': f"c{i}", 'to': f"c{(i + 1) % n}", 'label': 'uses', 'tech': 'API'} for i in range(n)]
+    return {'containers': containers, 'components': [], 'relationships': relationships}
+
+
+def state(n: int) -> Dict:
+    states = [{'name': f"S{i}", 'composite': i % 10 == 0, 'substates': [f"S{i}_{j}" for j in range(3)]}
+              for i in range(n)]
+    transitions = [{'from': f"S{i}", 'to': f"S{(i + 1) % n}", 'label': f"event{i}"} for i in range(n)]
+    return {'states': states, 'transitions': transitions}
+
+
+BUILDERS: Dict[str, Callable[[int], Dict]] = {
+    'flowchart': flowchart,
+    'class': class_diagram,
+    'component': component,
+    'state': state,
+}
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000],
+                        help="Number of nodes (and edges) per diagram")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'diagram':<10} {'nodes':>7} {'cold':>10} {'memoized':>10} {'output':>10}")
+    for n in args.sizes:
+        batch = {}
+        for diagram_type, build in BUILDERS.items():
+            data = build(n)
+            batch[diagram_type] = {'type': diagram_type, 'data': data}
+
+            def cold():
+                DiagramGenerator.clear_cache()
+                return DiagramGenerator.generate_diagram(diagram_type, data)
+
+            cold_time = best_of(args.repeat, cold)
+            output = DiagramGenerator.generate_diagram(diagram_type, data)
+            warm_time = best_of(args.repeat, lambda: DiagramGenerator.generate_diagram(diagram_type, data))
+            print(f"{diagram_type:<10} {n:>7} {cold_time * 1000:>8.2f}ms {warm_time * 1000:>8.2f}ms "
+                  f"{len(output) // 1024:>8}KB")
+
+        def cold_batch():
+            DiagramGenerator.clear_cache()
+            return DiagramGenerator.generate_diagrams(batch)
+
+        batch_time = best_of(args.repeat, cold_batch)
+        print(f"{'batch (4)':<10} {n:>7} {batch_time * 1000:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
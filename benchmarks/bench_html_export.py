@@ -0,0 +1,88 @@
+"""Benchmark the HTML export of single posts and of a whole output archive.
+
+Copies the generated posts in output/ into a temporary archive of the
+requested size and reports the time to render one post (uncached and
+cached by content hash), to export the archive to a static site, and to
+export it again after one post changed.
+
+Usage:
+    python benchmarks/bench_html_export.py [--posts 2000] [--workers 0]
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blog_generator.utils import html_export  # noqa: E402
+from blog_generator.utils.html_export import export_site, render_html  # noqa: E402
+
+SAMPLE = """# Sample post
+
+## Overview
+
+Some **text** with `code` and a table:
+
+| Name | Value |
+| --- | --- |
+| retries | 3 |
+
+```python
+def handler(event):
+    return event
+```
+"""
+
+
+def load_samples():
+    samples = []
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "output", "*.md"))):
+        with open(path, "r", encoding="utf-8") as f:
+            samples.append(f.read())
+    return samples or [SAMPLE]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=2000, help="Number of posts in the archive")
+    parser.add_argument("--repeat", type=int, default=20, help="Renders timed per single-post measurement")
+    parser.add_argument("--workers", type=int, default=0, help="Rendering processes (0: one per CPU)")
+    args = parser.parse_args()
+
+    samples = load_samples()
+    post = samples[0]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        html_export._cache.clear()
+        render_html(post)
+    print(f"render       {(time.perf_counter() - start) / args.repeat * 1000:>8.2f}ms per post ({len(post)} chars)")
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        render_html(post)
+    print(f"cached       {(time.perf_counter() - start) / args.repeat * 1000:>8.3f}ms per post")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = os.path.join(tmp, "output")
+        site_dir = os.path.join(tmp, "site")
+        os.makedirs(output_dir)
+        for number in range(args.posts):
+            with open(os.path.join(output_dir, f"Post_{number:06d}.md"), "w", encoding="utf-8") as f:
+                f.write(f"# Post {number}\n\n" + samples[number % len(samples)])
+
+        start = time.perf_counter()
+        stats = export_site(output_dir, site_dir, workers=args.workers or None)
+        print(f"export       {time.perf_counter() - start:>8.2f}s  {stats}")
+
+        time.sleep(0.01)
+        with open(os.path.join(output_dir, "Post_000000.md"), "a", encoding="utf-8") as f:
+            f.write("\nOne more line.\n")
+        start = time.perf_counter()
+        stats = export_site(output_dir, site_dir, workers=args.workers or None)
+        print(f"re-export    {time.perf_counter() - start:>8.2f}s  {stats}")
+
+
+if __name__ == "__main__":
+    main()
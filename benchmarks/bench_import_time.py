@@ -0,0 +1,86 @@
+"""Measure CLI startup cost with `python -X importtime` and enforce a budget.
+
+Each target is imported in a fresh interpreter. The report lists its total
+import time, the slowest top-level packages it pulled in and whether crewAI
+was loaded. Exits with status 1 when a target exceeds its budget, so it can
+guard startup time in CI.
+
+Usage:
+    python benchmarks/bench_import_time.py [--budget-ms 300] [--repeat 3] [--top 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Modules that must start without importing crewAI, and what each is used for
+TARGETS = {
+    'blog_generator.main': "CLI entry point (--help, validate-config)",
+    'blog_generator.utils.config_validator': "config validation",
+    'blog_generator.jobs': "UI job queue",
+}
+
+
+def import_times(module: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Import module in a fresh interpreter and return (cumulative, self) microseconds per module."""
+    env = dict(os.environ, PYTHONPATH=SRC_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, stdin=subprocess.DEVNULL,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative, own = {}, {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name.strip()
+        own[name] = int(self_us)
+        cumulative[name] = int(cumulative_us)
+    return cumulative, own
+
+
+def top_packages(cumulative: Dict[str, int], own: Dict[str, int], count: int) -> List[Tuple[str, int]]:
+    """Slowest top-level packages by the total self time of their modules."""
+    totals: Dict[str, int] = {}
+    for name, us in own.items():
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=300.0,
+                        help="Maximum import time of each target in milliseconds")
+    parser.add_argument("--repeat", type=int, default=3, help="Imports per target (best is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest packages listed per target")
+    args = parser.parse_args()
+
+    over_budget = []
+    for module, purpose in TARGETS.items():
+        runs = [import_times(module) for _ in range(args.repeat)]
+        cumulative, own = min(runs, key=lambda run: run[0].get(module, 0))
+        total_ms = cumulative.get(module, 0) / 1000
+        status = "ok" if total_ms <= args.budget_ms else "OVER BUDGET"
+        print(f"{module:<40} {total_ms:>8.1f}ms  {status}  ({purpose})")
+        if 'crewai' in cumulative:
+            print(f"  imports crewai ({cumulative['crewai'] / 1000:.1f}ms)")
+        for package, us in top_packages(cumulative, own, args.top):
+            print(f"  {package:<38} {us / 1000:>8.1f}ms")
+        if total_ms > args.budget_ms:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"\n{len(over_budget)} target(s) over the {args.budget_ms:.0f}ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark building, updating and querying the knowledge index.
+
+Writes a synthetic corpus of technical prose (Zipf-distributed vocabulary,
+about 120 words per chunk) to a temporary knowledge directory, builds the
+index, measures an incremental update after one file changed, and reports
+the query latency percentiles, idle and while an update merges in the
+background (as it does when a generator is created). Exits with status 1 when the p95 query
+latency exceeds the budget.
+
+Usage:
+    python benchmarks/bench_knowledge_index.py [--chunks 100000] [--queries 500] [--budget-ms 10]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blog_generator.utils.knowledge_index import KnowledgeIndex  # noqa: E402
+
+TERMS = """kubernetes pod deployment service ingress cache redis postgres index query latency throughput
+replica shard partition consumer producer kafka queue retry backoff timeout circuit breaker gateway
+token auth oauth jwt session cookie schema migration transaction lock deadlock isolation snapshot
+vector embedding model prompt agent tool memory context window batch stream pipeline scheduler worker
+thread async await coroutine event loop callback future promise container image registry helm chart
+metric trace span log alert dashboard budget slo error rate saturation cpu heap garbage collector
+python java golang rust typescript react graphql rest grpc protobuf json yaml terraform ansible""".split()
+
+CHUNKS_PER_FILE = 1000
+
+
+def make_vocabulary(size: int, rng: random.Random):
+    vocabulary = list(TERMS)
+    while len(vocabulary) < size:
+        vocabulary.append(''.join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10))))
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return vocabulary, weights
+
+
+def make_chunk(vocabulary, weights, rng: random.Random) -> str:
+    return ' '.join(rng.choices(vocabulary, weights, k=120)) + '.'
+
+
+def write_corpus(knowledge_dir: str, chunks: int, rng: random.Random, vocabulary, weights) -> None:
+    for number in range(0, chunks, CHUNKS_PER_FILE):
+        count = min(CHUNKS_PER_FILE, chunks - number)
+        with open(os.path.join(knowledge_dir, f"doc_{number // CHUNKS_PER_FILE:05d}.md"), "w") as f:
+            f.write(f"# Document {number}\n\n")
+            f.write('\n\n'.join(make_chunk(vocabulary, weights, rng) for _ in range(count)))
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def time_queries(index: KnowledgeIndex, count: int, top_k: int, rng: random.Random):
+    latencies = []
+    for _ in range(count):
+        query = ' '.join(rng.sample(TERMS, rng.randint(2, 6)))
+        start = time.perf_counter()
+        index.search(query, top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=100000, help="Number of chunks in the corpus")
+    parser.add_argument("--vocabulary", type=int, default=50000, help="Number of distinct terms")
+    parser.add_argument("--queries", type=int, default=500, help="Number of queries timed")
+    parser.add_argument("--top-k", type=int, default=5, help="Chunks retrieved per query")
+    parser.add_argument("--budget-ms", type=float, default=10.0, help="Maximum p95 query latency in milliseconds")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary, weights = make_vocabulary(args.vocabulary, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        knowledge_dir = os.path.join(tmp, "knowledge")
+        index_dir = os.path.join(tmp, "index")
+        os.makedirs(knowledge_dir)
+        write_corpus(knowledge_dir, args.chunks, rng, vocabulary, weights)
+
+        index = KnowledgeIndex(knowledge_dir, index_dir)
+        start = time.perf_counter()
+        index.update()
+        build = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(index_dir) for name in names)
+        print(f"build        {build:>8.2f}s  {len(index)} chunks, {size / 1024 / 1024:.1f}MB on disk")
+
+        start = time.perf_counter()
+        stats = index.update()
+        print(f"no-op update {(time.perf_counter() - start) * 1000:>8.1f}ms  {stats}")
+
+        with open(os.path.join(knowledge_dir, "doc_00000.md"), "a") as f:
+            f.write("\n\n" + make_chunk(vocabulary, weights, rng))
+        start = time.perf_counter()
+        stats = index.update()
+        print(f"update       {time.perf_counter() - start:>8.2f}s  {stats}")
+
+        start = time.perf_counter()
+        index = KnowledgeIndex(knowledge_dir, index_dir)
+        index.search("warm up")
+        print(f"load         {(time.perf_counter() - start) * 1000:>8.1f}ms")
+
+        with open(os.path.join(knowledge_dir, "doc_00000.md"), "a") as f:
+            f.write("\n\n" + make_chunk(vocabulary, weights, rng))
+        updater = index.update_in_background()
+        start = time.perf_counter()
+        busy = time_queries(index, 10, args.top_k, rng)
+        while updater.is_alive():
+            busy += time_queries(index, 10, args.top_k, rng)
+        print(f"background update {time.perf_counter() - start:>5.2f}s  {len(busy)} queries meanwhile: "
+              f"p50 {percentile(busy, 0.5):.2f}ms  p95 {percentile(busy, 0.95):.2f}ms  max {max(busy):.2f}ms")
+
+        latencies = time_queries(index, args.queries, args.top_k, rng)
+        p50, p95 = percentile(latencies, 0.5), percentile(latencies, 0.95)
+        status = "ok" if p95 <= args.budget_ms else "OVER BUDGET"
+        print(f"query        p50 {p50:.2f}ms  p95 {p95:.2f}ms  max {max(latencies):.2f}ms  {status}")
+        if p95 > args.budget_ms:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
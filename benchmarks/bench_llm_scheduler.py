@@ -0,0 +1,153 @@
+"""Benchmark the LLM scheduler against a local fake endpoint that rate limits.
+
+Starts an OpenAI-compatible chat completions server on localhost that
+allows `--server-rpm` requests per minute (answering 429 with Retry-After
+beyond that) and fails a random `--error-rate` of the other requests with
+429 as well. Interactive and batch callers then send requests through
+ScheduledLLM-wrapped crewAI LLMs pointed at it, and the latency per
+priority, the 429s the server sent and the failed calls are reported.
+Exits with status 1 when a call failed.
+
+Usage:
+    python benchmarks/bench_llm_scheduler.py [--calls 60] [--server-rpm 240] [--rpm 200] [--error-rate 0.1]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from crewai import LLM  # noqa: E402
+
+from blog_generator.utils.llm_scheduler import LLMScheduler, ScheduledLLM  # noqa: E402
+
+
+class FakeProvider(BaseHTTPRequestHandler):
+    """Chat completions endpoint with a sliding-window rate limit and random 429s."""
+
+    rpm = 240
+    error_rate = 0.0
+    rng = random.Random(7)
+    lock = threading.Lock()
+    recent: deque = deque()
+    served = 0
+    limited = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        cls = type(self)
+        with cls.lock:
+            now = time.monotonic()
+            while cls.recent and now - cls.recent[0] > 60:
+                cls.recent.popleft()
+            over_limit = len(cls.recent) >= cls.rpm
+            unlucky = cls.rng.random() < cls.error_rate
+            if over_limit or unlucky:
+                cls.limited += 1
+            else:
+                cls.recent.append(now)
+                cls.served += 1
+        if over_limit or unlucky:
+            retry = str(max(1, int(60 - (now - cls.recent[0])))) if over_limit else None
+            self._reply(429, {'error': {'message': "Rate limit reached", 'type': "rate_limit_error"}},
+                        {'Retry-After': retry} if retry else None)
+            return
+        time.sleep(0.05)
+        self._reply(200, {
+            'id': "chatcmpl-fake", 'object': "chat.completion", 'created': int(time.time()), 'model': "fake",
+            'choices': [{'index': 0, 'finish_reason': "stop",
+                         'message': {'role': "assistant", 'content': "A canned answer. " * 20}}],
+            'usage': {'prompt_tokens': 50, 'completion_tokens': 100, 'total_tokens': 150},
+        })
+
+
+class FakeServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 refuses connections when all callers connect at once
+    request_queue_size = 256
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=60, help="Calls per priority")
+    parser.add_argument("--callers", type=int, default=16, help="Concurrent callers per priority")
+    parser.add_argument("--server-rpm", type=int, default=240, help="Requests per minute the fake endpoint allows")
+    parser.add_argument("--rpm", type=float, default=200, help="Requests per minute budget of the scheduler")
+    parser.add_argument("--tpm", type=float, default=0, help="Tokens per minute budget of the scheduler (0: none)")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="Fraction of requests failed with 429")
+    args = parser.parse_args()
+
+    FakeProvider.rpm = args.server_rpm
+    FakeProvider.error_rate = args.error_rate
+    FakeServer.request_queue_size = max(FakeServer.request_queue_size, 2 * args.callers)
+    server = FakeServer(("127.0.0.1", 0), FakeProvider)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    scheduler = LLMScheduler(requests_per_minute=args.rpm, tokens_per_minute=args.tpm or None,
+                             base_delay=0.5, max_delay=10)
+    latencies = {'interactive': [], 'batch': []}
+    failures = []
+
+    def one_call(priority: str, number: int) -> None:
+        llm = ScheduledLLM(LLM(model="openai/fake", base_url=base_url, api_key="fake", max_retries=0),
+                           scheduler, priority)
+        start = time.perf_counter()
+        try:
+            llm.call([{'role': "user", 'content': f"Question {number} " * 50}])
+            latencies[priority].append(time.perf_counter() - start)
+        except Exception as e:
+            failures.append(f"{priority} {number}: {type(e).__name__}: {e}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=2 * args.callers) as pool:
+        # Batch work is queued first; interactive calls should still finish sooner
+        for number in range(args.calls):
+            pool.submit(one_call, 'batch', number)
+        time.sleep(0.1)
+        for number in range(args.calls):
+            pool.submit(one_call, 'interactive', number)
+    wall_time = time.perf_counter() - start
+    server.shutdown()
+
+    print(f"wall time    {wall_time:>8.1f}s  served {FakeProvider.served}, 429s {FakeProvider.limited}, "
+          f"retried {scheduler.rate_limited}")
+    for priority, values in latencies.items():
+        print(f"{priority:<12} p50 {percentile(values, 0.5):.2f}s  p95 {percentile(values, 0.95):.2f}s  "
+              f"{len(values)} completed")
+    for failure in failures[:5]:
+        print(f"failed       {failure}")
+    if failures:
+        print(f"{len(failures)} calls failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Measure how much of the publisher's diagram extraction the pipelined mode saves on real runs.
+
+Reads the checkpointed runs in `--checkpoints` that saved both the writer's
+draft and the publisher's post, analyzes the draft into a SectionCache as
+the speculative analysis does, then extracts the diagrams of the post with
+that cache. Reports per run the sections taken from the cache and the
+extraction time with and without it. Runs against the fake LLM do not
+count: its answers are unrelated sample posts.
+
+Usage:
+    python benchmarks/bench_pipelined_reuse.py [--checkpoints checkpoints]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blog_generator.utils.checkpoint import CheckpointStore  # noqa: E402
+from blog_generator.utils.content_analyzer import ContentAnalyzer, SectionCache  # noqa: E402
+from blog_generator.utils.markdown_ast import MarkdownDocument  # noqa: E402
+
+DRAFT_TASK = "technical_writer_task"
+POST_TASK = "technical_publisher_task"
+
+
+def measure(draft: str, post: str) -> dict:
+    cache = SectionCache()
+    ContentAnalyzer.extract_diagram_info(MarkdownDocument.parse(draft), bounded=True, section_cache=cache)
+
+    doc = MarkdownDocument.parse(post)
+    start = time.perf_counter()
+    ContentAnalyzer.extract_diagram_info(doc, bounded=True)
+    full = time.perf_counter() - start
+    start = time.perf_counter()
+    diagrams = ContentAnalyzer.extract_diagram_info(doc, bounded=True, section_cache=cache)
+    pipelined = time.perf_counter() - start
+    return {'sections': len(doc.sections), 'reused': diagrams.sections_reused,
+            'full_ms': full * 1000, 'pipelined_ms': pipelined * 1000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checkpoints", default=os.path.join(os.getcwd(), "checkpoints"),
+                        help="Checkpoint directory of the runs to measure")
+    args = parser.parse_args()
+
+    results = []
+    for manifest in CheckpointStore.list_runs(args.checkpoints):
+        outputs = CheckpointStore(args.checkpoints, manifest['run_id']).completed_outputs()
+        if DRAFT_TASK not in outputs or POST_TASK not in outputs:
+            continue
+        result = measure(outputs[DRAFT_TASK]['raw'], outputs[POST_TASK]['raw'])
+        results.append(result)
+        print(f"{manifest['run_id']:<28} {result['reused']:>3}/{result['sections']:<3} sections reused  "
+              f"extraction {result['full_ms']:>7.2f}ms -> {result['pipelined_ms']:>7.2f}ms")
+
+    if not results:
+        print(f"No run in {args.checkpoints} saved both a draft and a published post")
+        sys.exit(1)
+    reused = sum(result['reused'] for result in results)
+    sections = sum(result['sections'] for result in results)
+    print(f"{len(results)} runs: {reused}/{sections} sections reused ({reused / max(sections, 1):.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+import traceback
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from blog_generator.crew_pool import CrewPool
+from blog_generator.utils.output_index import OutputIndex
+from blog_generator.utils.output_writer import OutputWriter
+from blog_generator.utils.topic_dedup import TopicDeduplicator
+
+
+@dataclass
+class BatchResult:
+    """Outcome of generating a single topic in a batch run."""
+    topic: str
+    status: str
+    latency: float
+    filepath: Optional[str] = None
+    error: Optional[str] = None
+    duplicate_of: Optional[str] = None
+    similarity: Optional[float] = None
+
+
+def load_topics(source: Optional[str] = None) -> List[str]:
+    """Read one topic per line from a file, or from stdin when source is None or '-'.
+
+    Blank lines and lines starting with '#' are ignored.
+    """
+    if source is None or source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of values (0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def _generate_topic(topic: str, semaphore: asyncio.Semaphore, pool: CrewPool) -> BatchResult:
+    """Run one isolated crew for a topic once a concurrency slot is free."""
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            # Every topic gets its own generator and crew; crews are not safe to share. The pool
+            # builds the next ones while these run, off the event loop.
+            generator, crew = await asyncio.to_thread(pool.acquire)
+            await crew.kickoff_async(inputs={'topic': topic})
+            return BatchResult(
+                topic=topic,
+                status="completed",
+                latency=time.perf_counter() - start,
+                filepath=generator.saved_filepath,
+            )
+        except Exception as e:
+            print(f"Error generating '{topic}':")
+            print(traceback.format_exc())
+            return BatchResult(
+                topic=topic,
+                status="failed",
+                latency=time.perf_counter() - start,
+                error=str(e),
+            )
+
+
+async def _run_all(topics: List[str], concurrency: int, use_cache: bool,
+                   parallel_research: bool, pipelined: bool) -> List[BatchResult]:
+    semaphore = asyncio.Semaphore(concurrency)
+    pool = CrewPool(size=concurrency, total=len(topics), use_cache=use_cache, parallel_research=parallel_research,
+                    pipelined=pipelined, priority='batch')
+    pool.warm()
+    return await asyncio.gather(*(_generate_topic(topic, semaphore, pool) for topic in topics))
+
+
+def find_duplicates(topics: List[str], output_dir: str,
+                    threshold: float = TopicDeduplicator.DEFAULT_THRESHOLD) -> Dict[int, BatchResult]:
+    """Results for the topics that duplicate a generated post or a topic queued before them, by position.
+
+    A duplicate of a generated post points at that post; a duplicate of a
+    queued topic gets the filepath of the original once the batch is done.
+    """
+    index = OutputIndex(output_dir)
+    index.sync()
+    deduplicator = TopicDeduplicator.from_index(index, threshold)
+    duplicates = {}
+    for number, topic in enumerate(topics):
+        match = deduplicator.check(topic)
+        if match is not None:
+            duplicates[number] = BatchResult(topic=topic, status="duplicate", latency=0.0, filepath=match.path,
+                                             duplicate_of=match.topic, similarity=match.similarity)
+    return duplicates
+
+
+def summarize(results: List[BatchResult], wall_time: float) -> Dict:
+    """Compute throughput and latency figures for a finished batch."""
+    latencies = [r.latency for r in results if r.status == "completed"]
+    completed = len(latencies)
+    duplicates = sum(1 for r in results if r.status == "duplicate")
+    return {
+        'topics': len(results),
+        'completed': completed,
+        'duplicates': duplicates,
+        'failed': len(results) - completed - duplicates,
+        'wall_time': wall_time,
+        'posts_per_minute': completed / (wall_time / 60) if wall_time > 0 else 0.0,
+        'p50_latency': percentile(latencies, 50),
+        'p95_latency': percentile(latencies, 95),
+    }
+
+
+def run_batch(topics: List[str], concurrency: int = 4, output_dir: Optional[str] = None,
+              use_cache: bool = True, parallel_research: bool = False, pipelined: bool = False,
+              force: bool = False, dedup_threshold: Optional[float] = None) -> Dict:
+    """Generate a blog post for every topic with at most `concurrency` crews in flight.
+
+    Unless force is set, topics that are near-duplicates of a generated post
+    or of a topic earlier in the batch are not generated again; their result
+    points at the existing post.
+
+    One JSON line per topic is written to a batch results file next to the
+    generated posts, and the throughput summary is printed and returned.
+    """
+    if not topics:
+        raise ValueError("No topics to generate")
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+
+    output_dir = output_dir or os.path.join(os.getcwd(), "output")
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results_path = os.path.join(output_dir, f"batch_{timestamp}.jsonl")
+
+    duplicates = {} if force else find_duplicates(topics, output_dir,
+                                                  dedup_threshold or TopicDeduplicator.DEFAULT_THRESHOLD)
+    for result in duplicates.values():
+        print(f"Skipping '{result.topic}': near-duplicate of '{result.duplicate_of}' "
+              f"(similarity {result.similarity:.2f})")
+    pending = [number for number in range(len(topics)) if number not in duplicates]
+
+    print(f"Starting batch generation of {len(pending)} topics (concurrency={concurrency})...")
+    start = time.perf_counter()
+    generated = asyncio.run(_run_all([topics[number] for number in pending], concurrency, use_cache,
+                                     parallel_research, pipelined)) if pending else []
+    # Posts written in the background count towards the batch's wall time
+    OutputWriter.flush_all()
+    wall_time = time.perf_counter() - start
+
+    results = dict(zip(pending, generated))
+    filepaths = {result.topic: result.filepath for result in generated}
+    for number, result in duplicates.items():
+        if result.filepath is None:
+            # Duplicate of a topic queued in this batch: point at the post it produced
+            result.filepath = filepaths.get(result.duplicate_of)
+        results[number] = result
+    results = [results[number] for number in range(len(topics))]
+
+    with open(results_path, "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(asdict(result)) + "\n")
+
+    summary = summarize(results, wall_time)
+    summary['results_file'] = results_path
+
+    print("\n=== Batch summary ===")
+    print(f"Topics:          {summary['topics']} ({summary['completed']} completed, "
+          f"{summary['duplicates']} duplicates skipped, {summary['failed']} failed)")
+    print(f"Wall time:       {summary['wall_time']:.1f}s")
+    print(f"Throughput:      {summary['posts_per_minute']:.2f} posts/minute")
+    print(f"Latency p50/p95: {summary['p50_latency']:.1f}s / {summary['p95_latency']:.1f}s")
+    print(f"Results written to: {results_path}")
+
+    return summary
@@ -0,0 +1,173 @@
+import json
+import os
+import pstats
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from blog_generator.batch import percentile
+from blog_generator.crew import BlogGenerator
+from blog_generator.streaming import RunEventStream
+from blog_generator.utils.fake_llm import FakeLLM
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if os.uname().sysname == "Darwin" else peak / 1024
+
+
+class _Timings:
+    """Thread-safe collection of durations by category."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    def add(self, category: str, seconds: float) -> None:
+        with self._lock:
+            self.durations[category].append(seconds)
+
+    def timed(self, category: str, fn: Callable) -> Callable:
+        """Wrap fn so every call is recorded under category."""
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(category, time.perf_counter() - start)
+        return wrapper
+
+
+def _run_one(index: int, work_dir: str, llm_factory: Callable[[str], FakeLLM],
+             parallel_research: bool, timings: _Timings, profiles: Optional[list] = None,
+             pipelined: bool = False) -> bool:
+    """Drive one crew to completion, recording task, callback and file I/O timings."""
+    # Keep benchmark posts, their index and checkpoints out of the real output directories
+    generator = BlogGenerator(use_cache=False, parallel_research=parallel_research, llm_factory=llm_factory,
+                              profile=profiles is not None, pipelined=pipelined,
+                              output_dir=os.path.join(work_dir, "output"),
+                              checkpoint_dir=os.path.join(work_dir, "checkpoints"))
+    if profiles is not None:
+        profiles.append(generator.instrumentation.profiler)
+    generator.save_blog_post = timings.timed("file_io", generator.save_blog_post)
+    generator.checkpoints._write = timings.timed("file_io", generator.checkpoints._write)
+
+    crew = generator.crew()
+    crew.verbose = False
+    for crew_agent in crew.agents:
+        crew_agent.verbose = False
+    for crew_task in crew.tasks:
+        if crew_task.callback is not None:
+            crew_task.callback = timings.timed("callback", crew_task.callback)
+
+    started: Dict[str, float] = {}
+    for event in RunEventStream(crew).run({'topic': f"Benchmark topic {index}"}):
+        now = time.perf_counter()
+        if event.kind == "task_started":
+            started[event.task] = now
+        elif event.kind == "task_completed" and event.task in started:
+            timings.add(f"task:{event.task}", now - started[event.task])
+        elif event.kind == "error":
+            print(f"Run {index} failed: {event.text}")
+            return False
+    return True
+
+
+def _stats(values: List[float]) -> Dict:
+    return {
+        'count': len(values),
+        'total': sum(values),
+        'mean': sum(values) / len(values) if values else 0.0,
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+    }
+
+
+def run_benchmark(runs: int = 5, concurrency: int = 1, latency: float = 0.0, jitter: float = 0.0,
+                  distribution: str = "fixed", tokens_per_second: Optional[float] = None,
+                  parallel_research: bool = False, report_path: Optional[str] = None,
+                  profile_path: Optional[str] = None, pipelined: bool = False) -> Dict:
+    """Run `runs` crews against FakeLLM and report where the time goes.
+
+    The report holds the wall time, per-task latency, task callback time,
+    file I/O time, the simulated LLM time and the peak RSS of the process.
+    With profile_path, the post-processing of all runs is profiled and the
+    merged cProfile stats are written there.
+    """
+    if runs < 1 or concurrency < 1:
+        raise ValueError("Runs and concurrency must be at least 1")
+
+    samples = FakeLLM.load_samples()
+    llms: List[FakeLLM] = []
+    llms_lock = threading.Lock()
+
+    def llm_factory(agent_name: str) -> FakeLLM:
+        llm = FakeLLM(latency=latency, jitter=jitter, distribution=distribution,
+                      tokens_per_second=tokens_per_second, samples=samples)
+        with llms_lock:
+            llms.append(llm)
+        return llm
+
+    timings = _Timings()
+    profiles: Optional[list] = [] if profile_path else None
+    print(f"Benchmarking {runs} runs (concurrency={concurrency}, latency={latency}s, "
+          f"tokens/s={tokens_per_second or 'unlimited'})...")
+    with tempfile.TemporaryDirectory(prefix="blog-benchmark-") as work_dir:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(
+                lambda i: _run_one(i, work_dir, llm_factory, parallel_research, timings, profiles, pipelined),
+                range(runs)))
+        wall_time = time.perf_counter() - start
+
+    tasks = {name[len("task:"):]: _stats(values)
+             for name, values in timings.durations.items() if name.startswith("task:")}
+    report = {
+        'runs': runs,
+        'concurrency': concurrency,
+        'fake_llm': {'latency': latency, 'jitter': jitter, 'distribution': distribution,
+                     'tokens_per_second': tokens_per_second},
+        'completed': sum(outcomes),
+        'failed': runs - sum(outcomes),
+        'wall_time': wall_time,
+        'tasks': tasks,
+        'callback': _stats(timings.durations['callback']),
+        'file_io': _stats(timings.durations['file_io']),
+        'llm_calls': sum(llm.calls for llm in llms),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+    print("\n=== Benchmark report ===")
+    print(f"Runs:        {report['completed']}/{runs} completed in {wall_time:.2f}s")
+    print(f"LLM calls:   {report['llm_calls']}")
+    print(f"{'task':<28} {'count':>6} {'mean':>9} {'p50':>9} {'p95':>9}")
+    for name, stats in tasks.items():
+        print(f"{name:<28} {stats['count']:>6} {stats['mean']:>8.3f}s {stats['p50']:>8.3f}s {stats['p95']:>8.3f}s")
+    print(f"Callbacks:   {report['callback']['total']:.3f}s total over {report['callback']['count']} calls "
+          f"(includes file I/O)")
+    print(f"File I/O:    {report['file_io']['total']:.3f}s total over {report['file_io']['count']} writes")
+    if report['peak_rss_mb'] is not None:
+        print(f"Peak RSS:    {report['peak_rss_mb']:.1f} MB")
+
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to: {report_path}")
+    if profiles:
+        stats = pstats.Stats(*profiles)
+        stats.dump_stats(profile_path)
+        stats.sort_stats("cumulative").print_stats(15)
+        print(f"Profile written to: {profile_path}")
+    return report
@@ -1,16 +1,68 @@
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.utilities.llm_utils import create_llm
+from crewai.project import CrewBase, agent, crew, task, before_kickoff, after_kickoff
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
+from crewai.tools import BaseTool
+from crewai.llms.base_llm import BaseLLM
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.constants import NOT_SPECIFIED
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import os
+import re
+import sqlite3
+import threading
+from contextlib import nullcontext
 from datetime import datetime
+from pydantic import Field, PrivateAttr
 from .utils.diagram_generator import DiagramGenerator
-from .utils.content_analyzer import ContentAnalyzer
+from .utils.content_analyzer import ContentAnalyzer, SectionCache
+from .utils.markdown_ast import MarkdownDocument
+from .utils.context_compactor import ContextCompactor
+from .utils.llm_cache import CachedLLM, ResponseCache
+from .utils.llm_scheduler import ScheduledLLM
+from .utils.model_router import ModelRouter, ModelTier
+from .utils.checkpoint import CheckpointStore
+from .utils.config_cache import ConfigCache
+from .utils.knowledge_index import KnowledgeIndex
+from .utils.output_index import OutputIndex
+from .utils.output_writer import OutputWriter
+from .tools.knowledge_tool import KnowledgeSearchTool
+from .instrumentation import Instrumentation, InstrumentedLLM
 
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
 
+# A numbered section of a task description, e.g. "1. **Fundamental Concepts**:"
+NUMBERED_SECTION = re.compile(r'(\d+)\.\s+(.+)')
+
+
+class CompactingTask(Task):
+    """Task that compacts the upstream outputs it receives as context to a token budget.
+
+    See ContextCompactor; without a budget the context is passed through unchanged.
+    """
+
+    context_token_budget: Optional[int] = Field(
+        default=None, description="Maximum estimated tokens of upstream context passed to the agent"
+    )
+    _instrumentation: Optional[Instrumentation] = PrivateAttr(default=None)
+
+    def _execute_core(self, agent: Optional[BaseAgent], context: Optional[str], tools: Optional[List[Any]]):
+        if context and self.context_token_budget:
+            span = (self._instrumentation.span('step', 'context_compaction', task=self.name)
+                    if self._instrumentation is not None else nullcontext({}))
+            with span as attributes:
+                compacted = ContextCompactor.compact(context, self.context_token_budget)
+                attributes.update(tokens_before=compacted.tokens_before, tokens_after=compacted.tokens_after,
+                                  tokens_saved=compacted.tokens_saved)
+            if compacted.tokens_saved:
+                print(f"Compacted context of {self.name}: {compacted.tokens_before} -> "
+                      f"{compacted.tokens_after} tokens")
+            context = compacted.text
+        return super()._execute_core(agent, context, tools)
+
+
 @CrewBase
 class BlogGenerator():
     """BlogGenerator crew"""
@@ -18,40 +70,231 @@ class BlogGenerator():
     agents: List[BaseAgent]
     tasks: List[Task]
 
-    def __init__(self):
+    # Agents whose tokens are streamed when the generator is created with stream=True
+    STREAMED_AGENTS = ('technical_writer', 'technical_publisher')
+
+    def __init__(self, use_cache: bool = True, run_id: Optional[str] = None, stream: bool = False,
+                 parallel_research: bool = False, llm_factory: Optional[Callable[[str], BaseLLM]] = None,
+                 profile: bool = False, pipelined: bool = False, priority: str = 'interactive',
+                 output_dir: Optional[str] = None, checkpoint_dir: Optional[str] = None):
         super().__init__()
-        # Create output directory if it doesn't exist
-        self.output_dir = os.path.join(os.getcwd(), "output")
+        # CrewBase loads agents.yaml and tasks.yaml through load_yaml after this; serve them from the cache
+        self.load_yaml = ConfigCache.load_yaml
+        # Create output directory if it doesn't exist; output/ of the working directory by default
+        self.output_dir = output_dir or os.path.join(os.getcwd(), "output")
         os.makedirs(self.output_dir, exist_ok=True)
+        # Topic, hash, headings, diagram types and timings of every saved post
+        self.output_index = OutputIndex(self.output_dir)
+        # Responses to identical prompts are replayed from disk unless disabled
+        self.response_cache = ResponseCache(os.path.join(os.getcwd(), ".cache", "llm")) if use_cache else None
+        self.stream = stream
+        # Topic of the current run, captured from the kickoff inputs
+        self.topic = None
+        # Path of the last blog post written by the publisher callback
+        self.saved_filepath = None
+        # Every finished task is checkpointed so a failed run can be resumed
+        self.checkpoints = CheckpointStore(checkpoint_dir or os.path.join(os.getcwd(), "checkpoints"), run_id)
+        # Run the numbered sections of the research task as parallel sub-tasks
+        self.parallel_research = parallel_research
+        # Builds the LLM of an agent by name instead of the configured provider (e.g. FakeLLM)
+        self.llm_factory = llm_factory
+        # Spans of every task, LLM call and post-processing step, exported with the checkpoints
+        self.instrumentation = Instrumentation(self.run_id, profile=profile)
+        # Analyze the writer's draft while the review runs; the publisher then only
+        # rescans the sections that changed since the draft
+        self.pipelined = pipelined
+        self.section_cache = SectionCache()
+        self._speculation: Optional[threading.Thread] = None
+        # BM25 index over knowledge/, searched by the researcher through a tool
+        self.knowledge_index = KnowledgeIndex.open(os.path.join(os.getcwd(), "knowledge"),
+                                                   os.path.join(os.getcwd(), ".cache", "knowledge"))
+        # Pick up edits to knowledge/ without making the researcher's first search wait for the merge
+        self.knowledge_index.update_in_background()
+        # LLM calls wait for the process-wide rate limits of their model; interactive runs go first
+        self.priority = priority
+        # tasks.yaml as written: tasks_config is not loaded yet, and CrewBase replaces its agent names
+        # with the agents it builds
+        task_configs = ConfigCache.configs()['tasks.yaml']
+        self.task_agents = {name: entry.get('agent') for name, entry in task_configs.items()
+                            if isinstance(entry, dict)}
+        # Model tier of every agent and escalation of every task (config/models.yaml)
+        self.model_router = ModelRouter.open()
+        self.escalations = ModelRouter.escalations(task_configs)
+
+    @property
+    def run_id(self) -> str:
+        return self.checkpoints.run_id
+
+    @before_kickoff
+    def capture_topic(self, inputs):
+        """Remember the topic of this run so the publisher callback can use it."""
+        if inputs and inputs.get('topic'):
+            self.topic = inputs['topic']
+        self.checkpoints.start(inputs or {}, options={
+            'parallel_research': self.parallel_research,
+            'pipelined': self.pipelined,
+        })
+        return inputs
+
+    @after_kickoff
+    def export_instrumentation(self, result):
+        """Write the run's spans and metrics next to its checkpoints and print a summary."""
+        paths = self.instrumentation.export(self.checkpoints.run_dir)
+        print("\n=== Run profile ===")
+        print(self.instrumentation.summary())
+        print(f"Spans and metrics written to: {os.path.dirname(paths['spans'])}")
+        return result
+
+    def checkpoint_task(self, task_output) -> None:
+        """Task callback that persists the task output to the run's checkpoint directory."""
+        self.checkpoints.save(task_output.name, task_output.agent, task_output.raw)
+
+    def draft_callback(self, task_output) -> None:
+        """Checkpoint the writer's draft and, in pipelined mode, start analyzing it in the background."""
+        self.checkpoint_task(task_output)
+        if self.pipelined:
+            self._speculation = threading.Thread(target=self._analyze_draft, args=(task_output.raw,), daemon=True)
+            self._speculation.start()
+
+    def _analyze_draft(self, draft: str) -> None:
+        """Fill the section and diagram caches from the draft, off the critical path."""
+        try:
+            with self.instrumentation.span('step', 'speculative_analysis', chars=len(draft)) as attributes:
+                doc = MarkdownDocument.parse(draft)
+                diagrams = ContentAnalyzer.extract_diagram_info(doc, bounded=True, section_cache=self.section_cache)
+                DiagramGenerator.generate_diagrams(diagrams)
+                attributes['sections'] = len(doc.sections)
+        except Exception as e:
+            # The publisher simply does the work itself
+            print(f"Speculative analysis of the draft failed: {e}")
+
+    def resume_crew(self) -> Crew:
+        """Build a crew that only runs the stages this run has not completed yet.
+
+        Completed tasks get their saved output restored and are passed as explicit
+        context to the remaining tasks, so those see the same upstream outputs
+        as in an uninterrupted run. Unfinished async research sub-tasks keep
+        their unspecified context: crewAI forbids async tasks from depending on
+        the async tasks before them, and in an uninterrupted run they get no
+        upstream output either, so they still run in parallel.
+        """
+        completed = self.checkpoints.completed_outputs()
+        full_crew = self.crew()
+        remaining = []
+
+        for index, task in enumerate(full_crew.tasks):
+            if task.name in completed:
+                saved = completed[task.name]
+                task.output = TaskOutput(
+                    name=task.name,
+                    description=task.description,
+                    expected_output=task.expected_output,
+                    raw=saved['raw'],
+                    agent=saved['agent'],
+                )
+                continue
+            if task.context is NOT_SPECIFIED and not task.async_execution:
+                task.context = full_crew.tasks[:index]
+            remaining.append(task)
+
+        if not remaining:
+            raise ValueError(f"Run {self.run_id} has already completed all stages")
+
+        resumed = Crew(
+            agents=full_crew.agents,
+            tasks=remaining,
+            process=full_crew.process,
+            verbose=full_crew.verbose,
+        )
+        resumed.before_kickoff_callbacks.extend(full_crew.before_kickoff_callbacks)
+        resumed.after_kickoff_callbacks.extend(full_crew.after_kickoff_callbacks)
+        return resumed
+
+    @property
+    def output_writer(self) -> OutputWriter:
+        """The shared writer of the output directory (which the benchmark points elsewhere)."""
+        return OutputWriter.open(self.output_dir)
 
     def save_blog_post(self, content: str, topic: str) -> str:
-        """Save the blog post to a markdown file."""
+        """Save the blog post to a markdown file and record it in the output index.
+
+        With background writes the path is returned once the post is queued;
+        it is recorded in the index once it is on disk.
+        """
         print("\n=== Starting save_blog_post function ===")
         print(f"Content length: {len(content)} characters")
         print(f"Topic: {topic}")
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{topic.replace(' ', '_')}_{timestamp}.md"
-        filepath = os.path.join(self.output_dir, filename)
-        
+
+        run_id, timings = self.run_id, self.instrumentation.durations()
+
+        def record(filepath: str, content: str) -> None:
+            try:
+                self.output_index.record(filepath, content, topic, run_id=run_id, timings=timings)
+            except sqlite3.Error as e:
+                # The post itself is saved; `--mode history` picks it up on its next sync
+                print(f"Could not add the blog post to the output index: {e}")
+
+        pending = self.output_writer.write(content, topic, on_written=record)
         print(f"Output directory: {self.output_dir}")
-        print(f"Full filepath: {filepath}")
-        
+        if not pending.done():
+            print(f"Blog post queued for writing to: {pending.path}")
+            print("=== Completed save_blog_post function ===\n")
+            return pending.path
         try:
-            with open(filepath, "w") as f:
-                f.write(content)
+            filepath = pending.result()
             print(f"Successfully saved blog post to: {filepath}")
-            print("=== Completed save_blog_post function ===\n")
-            return filepath
         except Exception as e:
             print(f"Error saving blog post: {str(e)}")
             print("=== Failed save_blog_post function ===\n")
             raise
+        print("=== Completed save_blog_post function ===\n")
+        return filepath
+
+    def _compacting_task(self, task_name: str, **kwargs) -> CompactingTask:
+        """Create a configured task whose context is held to its agent's context_token_budget."""
+        config = self.tasks_config[task_name] # type: ignore[index]
+        agent_name = self.task_agents.get(task_name)
+        budget = self.agents_config[agent_name].get('context_token_budget') if agent_name else None # type: ignore[index]
+        task = CompactingTask(config=config, context_token_budget=budget, **kwargs)
+        task._instrumentation = self.instrumentation
+        return task
+
+    def _build_llm(self, agent_name: str):
+        """Create the LLM for an agent, fronted by the response cache when enabled.
+
+        Calls that miss the cache are routed to the model tier of the agent
+        (or escalated as its task says) and go through the rate limit
+        scheduler of that model. The outermost wrapper records a span per
+        call, so cache hits show up as fast calls and rate limit waits as
+        slow ones, and routed calls carry their tier, model and cost.
+        """
+        def make_llm(tier: ModelTier) -> BaseLLM:
+            if self.llm_factory is not None:
+                llm = self.llm_factory(agent_name)
+            else:
+                llm = create_llm(tier.model)
+            if self.stream and agent_name in self.STREAMED_AGENTS and hasattr(llm, 'stream'):
+                llm.stream = True
+            return ScheduledLLM(llm, priority=self.priority)
+
+        llm = self.model_router.build(self.agents_config[agent_name], self.escalations.get(agent_name), # type: ignore[index]
+                                      make_llm, self.instrumentation)
+        if self.response_cache is not None:
+            llm = CachedLLM(llm, self.response_cache, role=agent_name)
+        return InstrumentedLLM(llm, self.instrumentation, agent_name)
+
+    def _research_tools(self) -> List[BaseTool]:
+        """Tools of the researcher agents: knowledge search when knowledge/ has documents."""
+        if not self.knowledge_index.has_sources():
+            return []
+        return [KnowledgeSearchTool(self.knowledge_index)]
 
     @agent
     def researcher(self) -> Agent:
         return Agent(
             config=self.agents_config['researcher'], # type: ignore[index]
+            llm=self._build_llm('researcher'),
+            tools=self._research_tools(),
             verbose=True
         )
 
@@ -59,6 +302,7 @@ class BlogGenerator():
     def technical_writer(self) -> Agent:
         return Agent(
             config=self.agents_config['technical_writer'], # type: ignore[index]
+            llm=self._build_llm('technical_writer'),
             verbose=True
         )
     
@@ -66,6 +310,7 @@ class BlogGenerator():
     def technical_reviewer(self) -> Agent:
         return Agent( 
             config= self.agents_config['technical_reviewer'], # type: ignore[index]
+            llm=self._build_llm('technical_reviewer'),
             verbose=True
         )
 
@@ -73,6 +318,7 @@ class BlogGenerator():
     def technical_publisher(self) -> Agent:
         return Agent(
             config= self.agents_config['technical_publisher'], # type: ignore[index]
+            llm=self._build_llm('technical_publisher'),
             verbose=True
         )
 
@@ -83,59 +329,81 @@ class BlogGenerator():
     def research_task(self) -> Task:
         return Task(
             config=self.tasks_config['research_task'], # type: ignore[index]
+            callback=self.checkpoint_task,
         )
     
     @task
     def technical_writer_task(self) -> Task:    
-        return Task(
-            config=self.tasks_config['technical_writer_task'], # type: ignore[index]
-        )
+        return self._compacting_task('technical_writer_task', callback=self.draft_callback)
     
     @task
     def technical_reviewer_task(self) -> Task:
-        return Task(
-            config=self.tasks_config['technical_reviewer_task'], # type: ignore[index]
-        )
+        return self._compacting_task('technical_reviewer_task', callback=self.checkpoint_task)
     
-    def _format_content_sections(self, content: str) -> str:
+    def _format_content_sections(self, doc: MarkdownDocument) -> str:
         """Format content sections for better readability."""
-        # Split content into sections
-        sections = content.split('\n#')
         formatted_sections = []
-
-        for section in sections:
-            if not section.strip():
-                continue
-            
-            # Add back the # if it's not the first section
-            if sections.index(section) > 0:
-                section = '#' + section
-            
+        for section in doc.sections:
             # Clean up the section formatting
-            formatted_section = section.strip()
-            formatted_sections.append(formatted_section)
+            formatted_section = doc.section_text(section).strip()
+            if formatted_section:
+                formatted_sections.append(formatted_section)
 
         return '\n\n'.join(formatted_sections)
 
-    def _generate_toc(self, content: str) -> str:
+    def _generate_toc(self, doc: MarkdownDocument) -> str:
         """Generate table of contents from content headings."""
         toc = []
-        lines = content.split('\n')
-        
-        for line in lines:
-            if line.startswith('#'):
-                # Count the heading level
-                level = len(line.split()[0])
-                # Get the heading text
-                text = ' '.join(line.split()[1:])
-                # Create the anchor link
-                anchor = text.lower().replace(' ', '-').replace(':', '').replace('(', '').replace(')', '')
-                # Add indentation based on heading level
-                indent = '  ' * (level - 1)
-                toc.append(f"{indent}- [{text}](#{anchor})")
+        for heading in doc.headings:
+            # Add indentation based on heading level
+            indent = '  ' * (heading.level - 1)
+            toc.append(f"{indent}- [{heading.text}](#{heading.anchor})")
 
         return '\n'.join(toc)
 
+    def _render_diagram_sections(self, diagrams: Dict[str, Dict]) -> str:
+        """Render the extracted diagrams into the sections of the Technical Diagrams part of a post."""
+        diagram_sections = []
+        rendered = DiagramGenerator.generate_diagrams(diagrams)
+        
+        if 'architecture' in diagrams:
+            architecture_diagram = rendered['architecture']
+            diagram_sections.append(f"""
+## System Architecture
+
+{architecture_diagram}
+
+""")
+        
+        if 'workflow' in diagrams:
+            workflow_diagram = rendered['workflow']
+            diagram_sections.append(f"""
+## Process Flow
+
+{workflow_diagram}
+
+""")
+        
+        if 'state_machine' in diagrams:
+            state_diagram = rendered['state_machine']
+            diagram_sections.append(f"""
+## State Transitions
+
+{state_diagram}
+
+""")
+        
+        if 'class' in diagrams:
+            class_diagram = rendered['class']
+            diagram_sections.append(f"""
+## Class Structure
+
+{class_diagram}
+
+""")
+
+        return ''.join(diagram_sections)
+
     @task
     def technical_publisher_task(self) -> Task:
         def save_blog_callback(task_output) -> str:
@@ -151,7 +419,7 @@ class BlogGenerator():
 
             print(f"Content length: {len(content)}")
             # Use the topic from the main input or fallback
-            topic = self.tasks_config['technical_publisher_task']['description'].split('\n')[0].strip()
+            topic = self.topic or self.tasks_config['technical_publisher_task']['description'].split('\n')[0].strip()
 
             # Add simple frontmatter
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -162,51 +430,35 @@ date: "{timestamp}"
 ---
 
 """
+            # Parse the content once; sectioning and diagram extraction work on the parsed document
+            instrumentation = self.instrumentation
+            with instrumentation.profiled(), instrumentation.span('step', 'parse_markdown', chars=len(content)):
+                doc = MarkdownDocument.parse(content)
+
             # Analyze content and extract diagram information
             print("Analyzing content for diagram generation...")
-            diagrams = ContentAnalyzer.extract_diagram_info(content)
+            if self._speculation is not None:
+                # Normally finished long ago, since it only had to beat the review and publishing calls
+                self._speculation.join()
+            section_cache = self.section_cache if self.pipelined else None
+            with instrumentation.profiled(), instrumentation.span('step', 'content_analyzer') as attributes:
+                diagrams = ContentAnalyzer.extract_diagram_info(doc, bounded=True, section_cache=section_cache)
+                attributes['diagrams'] = len(diagrams)
+                attributes['sections_reused'] = diagrams.sections_reused
+            if section_cache is not None:
+                print(f"Reused the draft analysis of {diagrams.sections_reused}/{len(doc.sections)} sections")
+            if diagrams.timed_out:
+                print(f"Diagram extraction timed out in the {diagrams.timed_out} extractor, using default diagrams")
+            elif diagrams.truncated:
+                print(f"Diagram extraction capped long spans in: {', '.join(diagrams.truncated)}")
             
             # Generate diagrams based on the analyzed content
-            diagram_sections = []
-            
-            if 'architecture' in diagrams:
-                architecture_diagram = DiagramGenerator.generate_diagram('component', diagrams['architecture']['data'])
-                diagram_sections.append(f"""
-## System Architecture
-
-{architecture_diagram}
-
-""")
-            
-            if 'workflow' in diagrams:
-                workflow_diagram = DiagramGenerator.generate_diagram('flowchart', diagrams['workflow']['data'])
-                diagram_sections.append(f"""
-## Process Flow
-
-{workflow_diagram}
-
-""")
-            
-            if 'state_machine' in diagrams:
-                state_diagram = DiagramGenerator.generate_diagram('state', diagrams['state_machine']['data'])
-                diagram_sections.append(f"""
-## State Transitions
-
-{state_diagram}
-
-""")
-            
-            if 'class' in diagrams:
-                class_diagram = DiagramGenerator.generate_diagram('class', diagrams['class']['data'])
-                diagram_sections.append(f"""
-## Class Structure
-
-{class_diagram}
-
-""")
+            with instrumentation.profiled(), instrumentation.span('step', 'diagram_generator'):
+                diagram_sections = self._render_diagram_sections(diagrams)
 
             # Format the main content with better readability
-            formatted_content = self._format_content_sections(content)
+            with instrumentation.profiled(), instrumentation.span('step', 'format_sections'):
+                formatted_content = self._format_content_sections(doc)
 
             # Combine everything with topic prefix
             content_with_diagrams = f"""{frontmatter}
@@ -216,7 +468,7 @@ date: "{timestamp}"
 
 ## Technical Diagrams
 
-{''.join(diagram_sections)}
+{diagram_sections}
 
 ---
 
@@ -224,29 +476,145 @@ date: "{timestamp}"
 """
 
             # Save the blog post
-            filepath = self.save_blog_post(content_with_diagrams, topic)
+            with instrumentation.profiled(), instrumentation.span('step', 'file_write',
+                                                                  chars=len(content_with_diagrams)):
+                filepath = self.save_blog_post(content_with_diagrams, topic)
+            self.saved_filepath = filepath
+            self.checkpoint_task(task_output)
 
             print("=== Completed save_blog_callback ===\n")
             return filepath
 
-        return Task(
-            config=self.tasks_config['technical_publisher_task'], # type: ignore[index]
-            context=[
-                {
-                    "description": "Output directory for the blog post",
-                    "expected_output": "Directory path",
-                    "output_dir": self.output_dir
-                }
-            ],
+        # The publisher edits the writer's draft following the reviewer's feedback (compacted to the
+        # publisher's context_token_budget), so the final post keeps most of the draft's sections
+        return self._compacting_task(
+            'technical_publisher_task',
+            context=[self.technical_writer_task(), self.technical_reviewer_task()],
             callback=save_blog_callback,
-            dependencies=[self.technical_reviewer_task]  # Add dependency on reviewer task
+        )
+
+    @staticmethod
+    def _split_numbered_sections(description: str) -> Tuple[str, List[Tuple[str, str]], str]:
+        """Split a task description into its preamble, numbered sections and closing text.
+
+        Each section is returned as (title, text); a section runs until the next
+        numbered line or the first unindented line after it.
+        """
+        preamble, sections, closing = [], [], []
+        for line in description.splitlines():
+            if not closing and (match := NUMBERED_SECTION.fullmatch(line)):
+                sections.append((match.group(2).strip('*: '), [line]))
+            elif sections and not closing and (not line.strip() or line[0].isspace()):
+                sections[-1][1].append(line)
+            elif sections:
+                closing.append(line)
+            else:
+                preamble.append(line)
+
+        return (
+            '\n'.join(preamble).strip(),
+            [(title, '\n'.join(lines).strip()) for title, lines in sections],
+            '\n'.join(closing).strip(),
+        )
+
+    def _research_subtasks(self) -> Tuple[List[Agent], List[Task]]:
+        """Split research_task into one async sub-task per numbered section.
+
+        Every sub-task gets its own researcher agent, since concurrent tasks
+        must not share an agent's executor. The writer task, whose context is
+        not specified, receives the sub-task outputs merged in section order.
+        """
+        config = self.tasks_config['research_task'] # type: ignore[index]
+        preamble, sections, closing = self._split_numbered_sections(config['description'])
+        agents, subtasks = [], []
+
+        for number, (title, section) in enumerate(sections, 1):
+            researcher = Agent(
+                config=self.agents_config['researcher'], # type: ignore[index]
+                llm=self._build_llm('researcher'),
+                tools=self._research_tools(),
+                verbose=True
+            )
+            agents.append(researcher)
+            subtasks.append(Task(
+                name=f"research_task_{number}",
+                description=(
+                    f"{preamble}\n\nThis is part {number} of {len(sections)} of the research plan. "
+                    f"Cover only this part, in depth:\n\n{section}\n\n{closing}"
+                ),
+                expected_output=(
+                    f"A detailed research report on {{topic}} covering {title}, answering every question "
+                    f"of this part with concrete examples, code, configurations and sources"
+                ),
+                agent=researcher,
+                async_execution=True,
+                callback=self.checkpoint_task,
+            ))
+        return agents, subtasks
+
+    def revision_crew(self) -> Crew:
+        """Build a crew that revises one section of a published post.
+
+        The writer rewrites the section following the editor's instruction and
+        the reviewer returns the corrected final version. The kickoff inputs are
+        the topic, the section heading and text, the instruction and a compact
+        summary of the rest of the post (see revise.py), which also exports the
+        instrumentation once the post is saved.
+        """
+        writer, reviewer = self.technical_writer(), self.technical_reviewer()
+        revise_task = Task(
+            name="revise_section_task",
+            description=(
+                "Revise one section of the published technical article about \"{topic}\".\n\n"
+                "Editor's instruction:\n{instruction}\n\n"
+                "Current section:\n\n{section}\n\n"
+                "Outline and key facts of the rest of the article, for consistency:\n\n{post_context}\n\n"
+                "Rewrite only this section. Keep its heading \"{heading}\" and its heading level, keep what "
+                "the instruction does not ask to change, and stay consistent with the rest of the article."
+            ),
+            expected_output="The revised section in markdown, starting with its heading, without any commentary",
+            agent=writer,
+        )
+        review_task = Task(
+            name="review_section_task",
+            description=(
+                "Review the revised section \"{heading}\" of the technical article about \"{topic}\". "
+                "The editor asked for:\n{instruction}\n\n"
+                "Check that the instruction was followed, that the content and code are technically accurate "
+                "and that the section is consistent with the rest of the article. Fix any problem yourself "
+                "instead of describing it."
+            ),
+            expected_output=(
+                "The final version of the section in markdown, starting with its heading, ready to publish, "
+                "without review notes or commentary"
+            ),
+            agent=reviewer,
+            context=[revise_task],
+        )
+
+        tasks = [revise_task, review_task]
+        self.instrumentation.watch(tasks)
+        return Crew(
+            agents=[writer, reviewer],
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
         )
 
     @crew
     def crew(self) -> Crew:
+        agents, tasks = self.agents, self.tasks
+        if self.parallel_research:
+            research_agents, research_tasks = self._research_subtasks()
+            # Fall back to the single research task when it has nothing to split
+            if len(research_tasks) > 1:
+                agents = agents + research_agents
+                tasks = research_tasks + [task for task in tasks if task.name != 'research_task']
+
+        self.instrumentation.watch(tasks)
         return Crew(
-            agents=self.agents, # type: ignore[index]
-            tasks=self.tasks, # type: ignore[index]
+            agents=agents, # type: ignore[index]
+            tasks=tasks, # type: ignore[index]
             process=Process.sequential,
             verbose=True,
         )
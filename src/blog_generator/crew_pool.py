@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Optional, Tuple
+
+from crewai import Crew
+
+from blog_generator.crew import BlogGenerator
+
+
+class CrewPool:
+    """Hands out ready-built crews, building the next ones ahead of time on a background thread.
+
+    Every crew is handed out once: it comes with its own BlogGenerator, so
+    runs never share topic, checkpoints, instrumentation or saved paths.
+    What the pool saves is building the generator, its agents and its tasks
+    while a request waits. Up to `size` crews are kept ready; with `total`
+    set, no more than that many are built over the life of the pool (a batch
+    knows how many topics it has).
+
+    Provider connections are not pooled here: litellm already keeps one
+    HTTP client per provider and key for the whole process, so every crew
+    reuses its keep-alive connections.
+    """
+
+    def __init__(self, size: int = 2, total: Optional[int] = None, **options: Any):
+        if size < 1:
+            raise ValueError("The pool size must be at least 1")
+        self.size = size
+        self.total = total
+        # Keyword arguments of every BlogGenerator the pool builds
+        self.options = options
+        self._ready: Deque[Tuple[BlogGenerator, Crew]] = deque()
+        self._lock = threading.Lock()
+        self._building = False
+        self.built = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _build(self) -> Tuple[BlogGenerator, Crew]:
+        generator = BlogGenerator(**self.options)
+        return generator, generator.crew()
+
+    def _wanted(self) -> bool:
+        # Caller holds the lock
+        return len(self._ready) < self.size and (self.total is None or self.built < self.total)
+
+    def _fill(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if not self._wanted():
+                        return
+                    self.built += 1
+                try:
+                    built = self._build()
+                except Exception as e:
+                    # acquire() builds inline and raises the error where it can be reported
+                    print(f"Could not build a crew ahead of time: {e}")
+                    with self._lock:
+                        self.built -= 1
+                    return
+                with self._lock:
+                    self._ready.append(built)
+        finally:
+            with self._lock:
+                self._building = False
+
+    def warm(self) -> None:
+        """Start building crews in the background until `size` are ready."""
+        with self._lock:
+            if self._building or not self._wanted():
+                return
+            self._building = True
+        threading.Thread(target=self._fill, name="crew-pool", daemon=True).start()
+
+    def acquire(self) -> Tuple[BlogGenerator, Crew]:
+        """A generator and its crew for one run; built on the spot when none is ready."""
+        with self._lock:
+            built = self._ready.popleft() if self._ready else None
+            if built is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self.built += 1
+        if built is None:
+            start = time.perf_counter()
+            try:
+                built = self._build()
+            except Exception:
+                with self._lock:
+                    self.built -= 1
+                raise
+            print(f"Built a crew in {(time.perf_counter() - start) * 1000:.0f}ms (none was ready)")
+        self.warm()
+        return built
@@ -0,0 +1,277 @@
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from crewai.llms.base_llm import BaseLLM
+
+from blog_generator.streaming import TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent, subscribe
+from blog_generator.utils.llm_wrapper import LLMWrapper
+from blog_generator.utils.tokens import estimate_message_tokens, estimate_tokens
+
+# cProfile can only profile one thread at a time per process
+_profile_lock = threading.Lock()
+
+
+@dataclass
+class Span:
+    """One timed unit of work of a run: a task, an LLM call or a post-processing step."""
+    kind: str  # task, llm, step
+    name: str
+    run_id: str
+    start: float
+    duration: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+def _label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Instrumentation:
+    """Collects the spans of one run and exports them as JSONL or Prometheus text.
+
+    Task spans come from crewAI's task events, LLM spans from InstrumentedLLM
+    and step spans from `span()` blocks around local post-processing. Token
+    counts are estimates (see utils.tokens).
+    """
+
+    def __init__(self, run_id: str, profile: bool = False):
+        self.run_id = run_id
+        self.spans: List[Span] = []
+        self.profiler = cProfile.Profile() if profile else None
+        self._lock = threading.Lock()
+        self._task_ids = set()
+        self._open_tasks: Dict[int, Span] = {}
+        # Attributes of the spans open on each thread, innermost last
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, kind: str, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block; the yielded dict collects extra attributes."""
+        span = Span(kind=kind, name=name, run_id=self.run_id, start=time.time(), attributes=attributes)
+        start = time.perf_counter()
+        open_spans = getattr(self._local, 'open', None)
+        if open_spans is None:
+            open_spans = self._local.open = []
+        open_spans.append(span.attributes)
+        try:
+            yield span.attributes
+        except Exception as e:
+            span.attributes['error'] = str(e)
+            raise
+        finally:
+            open_spans.pop()
+            span.duration = time.perf_counter() - start
+            with self._lock:
+                self.spans.append(span)
+
+    def annotate(self, **attributes: Any) -> None:
+        """Add attributes to the innermost span open on this thread, if any (e.g. the model a call was routed to)."""
+        open_spans = getattr(self._local, 'open', None)
+        if open_spans:
+            open_spans[-1].update(attributes)
+
+    @contextmanager
+    def profiled(self) -> Iterator[None]:
+        """Run the enclosed block under cProfile when profiling is enabled."""
+        if self.profiler is None:
+            yield
+            return
+        with _profile_lock:
+            self.profiler.enable()
+            try:
+                yield
+            finally:
+                self.profiler.disable()
+
+    def watch(self, tasks: List[Any]) -> None:
+        """Record a task span for each of these tasks when it runs."""
+        self._task_ids.update(id(task) for task in tasks)
+        subscribe(self)
+
+    def _offer(self, source: Any, event: Any) -> None:
+        if id(source) not in self._task_ids:
+            return
+        if isinstance(event, TaskStartedEvent):
+            agent = source.agent.role.strip() if source.agent else None
+            with self._lock:
+                self._open_tasks[id(source)] = Span(
+                    kind='task', name=source.name, run_id=self.run_id, start=time.time(),
+                    attributes={'agent': agent, '_perf_start': time.perf_counter()})
+        elif isinstance(event, (TaskCompletedEvent, TaskFailedEvent)):
+            with self._lock:
+                span = self._open_tasks.pop(id(source), None)
+                if span is None:
+                    return
+                span.duration = time.perf_counter() - span.attributes.pop('_perf_start')
+                if isinstance(event, TaskFailedEvent):
+                    span.attributes['error'] = str(event.error)
+                else:
+                    span.attributes['output_tokens'] = estimate_tokens(event.output.raw or '')
+                self.spans.append(span)
+
+    def to_jsonl(self) -> str:
+        with self._lock:
+            spans = list(self.spans)
+        return ''.join(json.dumps(asdict(span), default=str) + '\n' for span in spans)
+
+    def to_prometheus(self) -> str:
+        """Aggregate the spans into Prometheus text exposition format."""
+        durations: Dict[tuple, List[float]] = {}
+        tokens: Dict[tuple, int] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            durations.setdefault((span.kind, span.name), []).append(span.duration)
+            for direction in ('prompt', 'completion'):
+                if f'{direction}_tokens' in span.attributes:
+                    key = (span.name, direction)
+                    tokens[key] = tokens.get(key, 0) + span.attributes[f'{direction}_tokens']
+
+        lines = [
+            "# HELP blog_generator_span_seconds Time spent in tasks, LLM calls and post-processing steps.",
+            "# TYPE blog_generator_span_seconds summary",
+        ]
+        for (kind, name), values in sorted(durations.items()):
+            labels = f'kind="{_label(kind)}",name="{_label(name)}",run_id="{_label(self.run_id)}"'
+            lines.append(f"blog_generator_span_seconds_sum{{{labels}}} {sum(values):.6f}")
+            lines.append(f"blog_generator_span_seconds_count{{{labels}}} {len(values)}")
+        lines += [
+            "# HELP blog_generator_llm_tokens_total Estimated LLM tokens by agent.",
+            "# TYPE blog_generator_llm_tokens_total counter",
+        ]
+        for (agent, direction), count in sorted(tokens.items()):
+            labels = f'agent="{_label(agent)}",direction="{direction}",run_id="{_label(self.run_id)}"'
+            lines.append(f"blog_generator_llm_tokens_total{{{labels}}} {count}")
+        lines += [
+            "# HELP blog_generator_llm_cost_dollars_total Estimated cost of the LLM calls by agent, tier and model.",
+            "# TYPE blog_generator_llm_cost_dollars_total counter",
+        ]
+        for (agent, tier, model), route in sorted(self.routing().items()):
+            labels = (f'agent="{_label(agent)}",tier="{_label(tier)}",model="{_label(model)}",'
+                      f'run_id="{_label(self.run_id)}"')
+            lines.append(f"blog_generator_llm_cost_dollars_total{{{labels}}} {route['cost']:.6f}")
+        lines += [
+            "# HELP blog_generator_context_tokens_saved_total Estimated prompt tokens removed by context compaction.",
+            "# TYPE blog_generator_context_tokens_saved_total counter",
+        ]
+        for task, saved in sorted(self.tokens_saved().items()):
+            labels = f'task="{_label(task)}",run_id="{_label(self.run_id)}"'
+            lines.append(f"blog_generator_context_tokens_saved_total{{{labels}}} {saved}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, directory: str) -> Dict[str, str]:
+        """Write spans.jsonl and metrics.prom (and profile.prof when profiling) to directory."""
+        os.makedirs(directory, exist_ok=True)
+        paths = {
+            'spans': os.path.join(directory, "spans.jsonl"),
+            'metrics': os.path.join(directory, "metrics.prom"),
+        }
+        with open(paths['spans'], "w", encoding="utf-8") as f:
+            f.write(self.to_jsonl())
+        with open(paths['metrics'], "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        if self.profiler is not None:
+            paths['profile'] = os.path.join(directory, "profile.prof")
+            self.profiler.dump_stats(paths['profile'])
+        return paths
+
+    def tokens_saved(self) -> Dict[str, int]:
+        """Estimated context tokens saved by compaction, per task."""
+        saved: Dict[str, int] = {}
+        with self._lock:
+            spans = [span for span in self.spans if span.name == 'context_compaction']
+        for span in spans:
+            task = span.attributes.get('task')
+            saved[task] = saved.get(task, 0) + span.attributes.get('tokens_saved', 0)
+        return saved
+
+    def routing(self) -> Dict[tuple, Dict[str, Any]]:
+        """Attempts, escalations, seconds and estimated cost of the routed LLM calls, per agent, tier and model.
+
+        Every attempt of a call counts under the tier that made it, so an
+        escalated call adds its discarded small-tier attempt as well as the
+        large-tier one. Calls answered from the response cache never reach a
+        model and are not counted.
+        """
+        routes: Dict[tuple, Dict[str, Any]] = {}
+        with self._lock:
+            spans = [span for span in self.spans if span.kind == 'llm' and 'attempts' in span.attributes]
+        for span in spans:
+            for attempt in span.attributes['attempts']:
+                key = (span.name, attempt['tier'], str(attempt.get('model')))
+                route = routes.setdefault(key, {'calls': 0, 'escalated': 0, 'discarded': 0,
+                                                'seconds': 0.0, 'cost': 0.0})
+                route['calls'] += 1
+                route['escalated'] += 'escalation' in attempt
+                route['discarded'] += bool(attempt.get('discarded'))
+                route['seconds'] += attempt.get('seconds', 0.0)
+                route['cost'] += attempt.get('cost', 0.0)
+        return routes
+
+    def durations(self, kind: Optional[str] = None) -> Dict[str, float]:
+        """Total seconds per span name of the spans finished so far, optionally of one kind."""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            spans = [span for span in self.spans if kind is None or span.kind == kind]
+        for span in spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration
+        return totals
+
+    def summary(self) -> str:
+        """Total time and estimated tokens per task, agent and step, one line each."""
+        totals: Dict[tuple, List[float]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            entry = totals.setdefault((span.kind, span.name), [0.0, 0, 0])
+            entry[0] += span.duration
+            entry[1] += span.attributes.get('prompt_tokens', 0)
+            entry[2] += span.attributes.get('completion_tokens', span.attributes.get('output_tokens', 0))
+
+        lines = [f"{'kind':<6} {'name':<28} {'time':>9} {'in tokens':>10} {'out tokens':>10}"]
+        for (kind, name), (seconds, tokens_in, tokens_out) in totals.items():
+            lines.append(f"{kind:<6} {name:<28} {seconds:>8.2f}s {tokens_in:>10} {tokens_out:>10}")
+        routes = self.routing()
+        if routes:
+            lines.append(f"{'model routing':<20} {'tier':<8} {'model':<24} {'calls':>5} {'time':>9} {'cost':>10}")
+            for (agent, tier, model), route in routes.items():
+                notes = [f"{route[key]} {key}" for key in ('escalated', 'discarded') if route[key]]
+                escalated = f"  ({', '.join(notes)})" if notes else ""
+                lines.append(f"{agent:<20} {tier:<8} {model:<24} {route['calls']:>5} {route['seconds']:>8.2f}s "
+                             f"${route['cost']:>9.4f}{escalated}")
+            lines.append(f"Estimated model cost: ${sum(route['cost'] for route in routes.values()):.4f}")
+        saved = {task: count for task, count in self.tokens_saved().items() if count}
+        if saved:
+            lines.append(f"Context compaction saved {sum(saved.values())} tokens "
+                         f"({', '.join(f'{task}: {count}' for task, count in saved.items())})")
+        return '\n'.join(lines)
+
+
+class InstrumentedLLM(LLMWrapper):
+    """LLM wrapper that records a span with estimated token counts for every call."""
+
+    def __init__(self, llm: BaseLLM, instrumentation: Instrumentation, agent_name: str):
+        super().__init__(llm)
+        self.instrumentation = instrumentation
+        self.agent_name = agent_name
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Union[str, Any]:
+        with self.instrumentation.span('llm', self.agent_name, model=self.model) as attributes:
+            attributes['prompt_tokens'] = estimate_message_tokens(messages)
+            response = self.llm.call(messages, tools, callbacks, available_functions, **kwargs)
+            if isinstance(response, str):
+                attributes['completion_tokens'] = estimate_tokens(response)
+            return response
@@ -0,0 +1,162 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class Job:
+    """A single blog generation request and its live progress."""
+    job_id: str
+    session_id: str
+    topic: str
+    status: str = "queued"  # queued, running, completed, failed
+    stage: Optional[str] = None
+    stages_done: int = 0
+    total_stages: int = 0
+    preview: str = ""
+    result: Optional[str] = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    version: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+class JobManager:
+    """Runs blog generation jobs on a bounded worker pool.
+
+    Every job gets its own BlogGenerator and crew, so concurrent users never
+    share crew state or overwrite each other's results. At most `max_workers`
+    crews run at once; further jobs wait in FIFO order. Crews come from a
+    CrewPool created with the first job, which keeps `max_workers` of them
+    built ahead of the jobs that will need them.
+    """
+
+    # Preview tasks whose streamed tokens and final text are exposed on the job
+    PREVIEW_TASKS = ('technical_writer_task', 'technical_publisher_task')
+
+    def __init__(self, max_workers: int = 2, max_history: int = 200):
+        self.max_workers = max_workers
+        self.max_history = max_history
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="blog-job")
+        self._jobs: Dict[str, Job] = {}
+        self._changed = threading.Condition()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def submit(self, topic: str, session_id: str) -> Job:
+        """Queue a job for topic on behalf of a UI session."""
+        job = Job(job_id=uuid.uuid4().hex[:8], session_id=session_id, topic=topic)
+        with self._changed:
+            self._jobs[job.job_id] = job
+            self._prune()
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def jobs(self, session_id: Optional[str] = None) -> List[Job]:
+        """All known jobs (optionally of one session), newest first."""
+        with self._changed:
+            jobs = list(self._jobs.values())
+        if session_id is not None:
+            jobs = [job for job in jobs if job.session_id == session_id]
+        return sorted(jobs, key=lambda job: job.created, reverse=True)
+
+    def queue_position(self, job_id: str) -> int:
+        """Number of queued jobs submitted before this one."""
+        job = self._jobs[job_id]
+        with self._changed:
+            return sum(1 for other in self._jobs.values()
+                       if other.status == "queued" and other.created < job.created)
+
+    def has_active(self, session_id: str) -> bool:
+        return any(not job.done for job in self.jobs(session_id))
+
+    def follow(self, job_id: str, interval: float = 0.25) -> Iterator[Job]:
+        """Yield the job each time it changes (at most every `interval` seconds) until it is done."""
+        job = self._jobs[job_id]
+        seen = -1
+        while True:
+            with self._changed:
+                if job.version == seen:
+                    self._changed.wait(timeout=interval)
+                version, done = job.version, job.done
+            if version != seen:
+                seen = version
+                yield job
+            if done:
+                return
+            time.sleep(interval)
+
+    def _update(self, job: Job, **changes: Any) -> None:
+        with self._changed:
+            for name, value in changes.items():
+                setattr(job, name, value)
+            job.version += 1
+            self._changed.notify_all()
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond max_history (caller holds the lock)."""
+        finished = sorted((job for job in self._jobs.values() if job.done), key=lambda job: job.created)
+        for job in finished[:max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[job.job_id]
+
+    def _crew_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                # Imported on first use so the UI starts without loading crewAI
+                from blog_generator.crew_pool import CrewPool
+                self._pool = CrewPool(size=self.max_workers, stream=True)
+            return self._pool
+
+    def _run(self, job: Job) -> None:
+        self._update(job, status="running", started=time.time(), stage="Initializing AI agents")
+        try:
+            from blog_generator.streaming import RunEventStream
+
+            _, crew = self._crew_pool().acquire()
+            stream = RunEventStream(crew)
+            self._update(job, total_stages=stream.total_tasks)
+
+            for event in stream.run({'topic': job.topic}):
+                if event.kind == "task_started":
+                    preview = "" if event.task in self.PREVIEW_TASKS else job.preview
+                    self._update(job, stage=event.task, preview=preview)
+                elif event.kind == "token":
+                    # Tokens are frequent; bump the version without waking followers each time
+                    with self._changed:
+                        job.preview += event.text
+                        job.version += 1
+                elif event.kind == "retry":
+                    # The call was escalated to a larger model; drop what the discarded attempt streamed
+                    with self._changed:
+                        if event.text and job.preview.endswith(event.text):
+                            job.preview = job.preview[:-len(event.text)]
+                            job.version += 1
+                elif event.kind == "task_completed":
+                    preview = event.text if event.task in self.PREVIEW_TASKS else job.preview
+                    self._update(job, stages_done=job.stages_done + 1, preview=preview)
+                elif event.kind == "error":
+                    raise RuntimeError(event.text)
+                elif event.kind == "done":
+                    self._update(job, status="completed", result=str(event.result), finished=time.time())
+        except Exception as e:
+            self._update(job, status="failed", error=str(e), finished=time.time())
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
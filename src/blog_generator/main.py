@@ -3,32 +3,47 @@ import sys
 import warnings
 import traceback
 import argparse
+import os
 from datetime import datetime
 
-from blog_generator.crew import BlogGenerator
-
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
 # This main file is intended to be a way for you to run your
 # crew locally, so refrain from adding unnecessary logic into this file.
 # Replace with inputs you want to test with, it will automatically
 # interpolate any tasks and agents information
+#
+# crewAI takes seconds to import, so modules that pull it in are imported
+# inside the functions that need them; --help and validate-config stay fast.
 
-def run_cli(topic=None):
+def run_cli(topic=None, use_cache=True, parallel_research=False, profile=False, pipelined=False, force=False,
+            dedup_threshold=None):
     """
     Run the crew from command line.
     """
     if not topic:
         topic = 'Top 10 questions will ask for Engineering Manager position and provide best answers'
     
+    if not force:
+        earlier = find_earlier_post(topic, dedup_threshold)
+        if earlier:
+            print(f"A post on a near-duplicate topic ('{earlier.topic}', similarity {earlier.similarity:.2f}) "
+                  f"was already generated on {earlier.post.created_at}: {earlier.path}")
+            print("Pass --force to generate it again.")
+            return earlier.path
+
     print("Starting blog generation process...")
     inputs = {
         'topic': topic,
     }
     
     try:
+        from blog_generator.crew import BlogGenerator
+
         print("Initializing BlogGenerator...")
-        generator = BlogGenerator()
+        generator = BlogGenerator(use_cache=use_cache, parallel_research=parallel_research, profile=profile,
+                                  pipelined=pipelined)
+        print(f"Run id: {generator.run_id} (resume with: replay {generator.run_id})")
         print("Creating crew...")
         crew = generator.crew()
         print("Starting crew execution...")
@@ -40,6 +55,159 @@ def run_cli(topic=None):
         print(traceback.format_exc())
         raise Exception(f"An error occurred while running the crew: {e}")
 
+def resume(run_id=None, use_cache=True, parallel_research=None, pipelined=None):
+    """
+    Resume a checkpointed run, skipping the stages it already completed.
+    """
+    from blog_generator.crew import BlogGenerator
+    from blog_generator.utils.checkpoint import CheckpointStore
+
+    if not run_id:
+        runs = CheckpointStore.list_runs(os.path.join(os.getcwd(), "checkpoints"))
+        if not runs:
+            print("No checkpointed runs found.")
+            return None
+        print("Checkpointed runs:")
+        for manifest in runs:
+            completed = ', '.join(c['task'] for c in manifest['completed']) or 'none'
+            print(f"  {manifest['run_id']}  topic: {manifest['inputs'].get('topic', '?')}  completed: {completed}")
+        return None
+
+    try:
+        generator = BlogGenerator(use_cache=use_cache, run_id=run_id)
+        if not generator.checkpoints.exists():
+            raise ValueError(f"No checkpoint found for run {run_id}")
+        manifest = generator.checkpoints.load()
+        inputs = manifest['inputs']
+        # Rebuild the same crew layout the run started with unless told otherwise
+        options = manifest.get('options', {})
+        if parallel_research is None:
+            parallel_research = options.get('parallel_research', False)
+        if pipelined is None:
+            pipelined = options.get('pipelined', False)
+        generator.parallel_research = parallel_research
+        generator.pipelined = pipelined
+        crew = generator.resume_crew()
+        print(f"Resuming run {run_id} with {len(crew.tasks)} remaining stage(s)...")
+        result = crew.kickoff(inputs=inputs)
+        print(f"Crew execution completed with result: {result}")
+        return result
+    except Exception as e:
+        print("Error occurred while resuming:")
+        print(traceback.format_exc())
+        raise Exception(f"An error occurred while resuming the crew: {e}")
+
+def revise_cli(post, section, instruction, use_cache=True):
+    """
+    Rewrite one section of a published post and save the result as a new post.
+    """
+    if not post or not section or not instruction:
+        print("revise mode needs --post, --section and --instruction")
+        return None
+    try:
+        from blog_generator.revise import revise_post
+
+        return revise_post(post, section, instruction, use_cache=use_cache)
+    except ValueError as e:
+        print(f"Cannot revise {post}: {e}")
+        return None
+    except Exception as e:
+        print("Error occurred while revising:")
+        print(traceback.format_exc())
+        raise Exception(f"An error occurred while revising the post: {e}")
+
+def output_index():
+    """
+    The index of the posts in output/, brought up to date with the directory.
+    """
+    from blog_generator.utils.output_index import OutputIndex
+
+    index = OutputIndex(os.path.join(os.getcwd(), "output"))
+    index.sync()
+    return index
+
+def find_earlier_post(topic, threshold=None):
+    """
+    The newest post generated on the same or a near-duplicate topic (a TopicMatch), or None.
+    """
+    import sqlite3
+    from blog_generator.utils.topic_dedup import TopicDeduplicator
+
+    try:
+        deduplicator = TopicDeduplicator.from_index(output_index(), threshold or TopicDeduplicator.DEFAULT_THRESHOLD)
+    except sqlite3.Error as e:
+        print(f"Could not look up earlier posts: {e}")
+        return None
+    return deduplicator.match(topic)
+
+def history_cli(query=None, limit=20):
+    """
+    List the most recent posts, or search them by topic and headings.
+    """
+    index = output_index()
+    posts = index.search(query, limit) if query else index.history(limit)
+    if not posts:
+        print("No posts found." if query else "No posts generated yet.")
+        return posts
+    print(f"{'created':<19}  {'sections':>8}  {'diagrams':<28}  topic")
+    for post in posts:
+        print(f"{post.created_at:<19}  {len(post.headings):>8}  {', '.join(post.diagram_types) or '-':<28}  "
+              f"{post.topic}")
+        print(f"{'':<19}  {post.path}")
+    print(f"{len(posts)} of {len(index)} posts")
+    return posts
+
+def export_cli(site_dir="site", workers=None, force=False):
+    """
+    Export every post in output/ to a static HTML site.
+    """
+    import time
+    from blog_generator.utils.html_export import export_site
+
+    start = time.perf_counter()
+    stats = export_site(os.path.join(os.getcwd(), "output"), site_dir, workers=workers, force=force)
+    print(f"Exported {stats['posts']} posts to {os.path.join(site_dir, 'index.html')} in "
+          f"{time.perf_counter() - start:.1f}s ({stats['rendered']} rendered, {stats['skipped']} unchanged)")
+    return stats
+
+def run_batch_cli(topics_file=None, concurrency=4, use_cache=True, parallel_research=False, pipelined=False,
+                  force=False, dedup_threshold=None):
+    """
+    Generate a blog post for every topic in a file (or stdin) concurrently.
+    """
+    from blog_generator.batch import load_topics, run_batch
+
+    topics = load_topics(topics_file)
+    return run_batch(topics, concurrency=concurrency, use_cache=use_cache, parallel_research=parallel_research,
+                     pipelined=pipelined, force=force, dedup_threshold=dedup_threshold)
+
+def run_benchmark_cli(runs=5, concurrency=1, latency=0.0, tokens_per_second=None,
+                      parallel_research=False, report_path=None, profile_path=None, pipelined=False,
+                      jitter=0.0, distribution="fixed"):
+    """
+    Benchmark complete crew runs offline against the fake LLM.
+    """
+    from blog_generator.benchmark import run_benchmark
+
+    return run_benchmark(runs=runs, concurrency=concurrency, latency=latency, jitter=jitter,
+                         distribution=distribution, tokens_per_second=tokens_per_second, parallel_research=parallel_research,
+                         report_path=report_path, profile_path=profile_path, pipelined=pipelined)
+
+def validate_config():
+    """
+    Check agents.yaml, tasks.yaml and models.yaml without importing crewAI. Returns True when valid.
+    """
+    from blog_generator.utils.config_validator import ConfigValidator
+
+    errors = ConfigValidator.validate()
+    if errors:
+        print(f"Found {len(errors)} configuration problem(s):")
+        for error in errors:
+            print(f"  - {error}")
+        return False
+    print("Configuration is valid.")
+    return True
+
 def run_ui():
     """
     Run the Gradio UI.
@@ -80,22 +248,165 @@ def main():
     parser = argparse.ArgumentParser(description="AI Blog Generator using CrewAI")
     parser.add_argument(
         "--mode", 
-        choices=["cli", "ui"], 
+        choices=["cli", "ui", "batch", "resume", "revise", "history", "export", "benchmark", "validate-config"], 
         default="cli",
-        help="Run mode: cli (command line) or ui (web interface)"
+        help="Run mode: cli (command line), ui (web interface), batch (many topics), resume (checkpointed run), "
+             "revise (rewrite one section of a post), history (list or search generated posts), export (static HTML site of the generated posts), benchmark (offline runs against a fake LLM) or validate-config (check agents.yaml, tasks.yaml and models.yaml)"
     )
     parser.add_argument(
         "--topic", 
         type=str,
         help="Blog topic (for CLI mode)"
     )
+    parser.add_argument(
+        "--topics-file",
+        type=str,
+        help="File with one topic per line, '-' for stdin (for batch mode, defaults to stdin)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Maximum number of crews running at once (for batch and benchmark modes, default 4 and 1), "
+             "or of processes rendering posts (for export mode, default one per CPU)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the model instead of replaying cached LLM responses"
+    )
+    parser.add_argument(
+        "--run-id",
+        type=str,
+        help="Checkpointed run to resume (for resume mode, lists runs when omitted)"
+    )
+    parser.add_argument(
+        "--post",
+        type=str,
+        help="Published post to revise (for revise mode)"
+    )
+    parser.add_argument(
+        "--section",
+        type=str,
+        help="Heading of the section to rewrite (for revise mode)"
+    )
+    parser.add_argument(
+        "--instruction",
+        type=str,
+        help="What to change in the section (for revise mode)"
+    )
+    parser.add_argument(
+        "--query",
+        type=str,
+        help="Words to search for in the topics and headings of generated posts (for history mode)"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Number of posts listed (for history mode)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Generate the post even when one on the same or a near-duplicate topic already exists in output/ "
+             "(batch mode: also generate near-duplicate topics queued in the same batch; "
+             "export mode: render every page again)"
+    )
+    parser.add_argument(
+        "--dedup-threshold",
+        type=float,
+        help="Similarity (0-1] above which two topics count as duplicates (for cli and batch modes, default 0.7)"
+    )
+    parser.add_argument(
+        "--site-dir",
+        type=str,
+        default="site",
+        help="Directory the static site is written to (for export mode)"
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Number of crew runs (for benchmark mode)"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Simulated latency per LLM call in seconds (for benchmark mode)"
+    )
+    parser.add_argument(
+        "--latency-distribution",
+        # FakeLLM.DISTRIBUTIONS, listed here so --help does not import crewAI
+        choices=["fixed", "uniform", "lognormal"],
+        default="fixed",
+        help="Distribution of the simulated latency (for benchmark mode): fixed, uniform within "
+             "--latency ± --latency-jitter, or lognormal with median --latency and sigma --latency-jitter"
+    )
+    parser.add_argument(
+        "--latency-jitter",
+        type=float,
+        default=0.0,
+        help="Spread of the simulated latency (for benchmark mode): seconds for uniform, sigma for lognormal"
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        help="Simulated generation speed of the fake LLM (for benchmark mode, unlimited by default)"
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        help="Write the benchmark report as JSON to this file (for benchmark mode)"
+    )
+    parser.add_argument(
+        "--parallel-research",
+        action="store_true",
+        default=None,
+        help="Research the numbered sections of the research task in parallel sub-tasks"
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        default=None,
+        help="Analyze the writer's draft while the review runs, so publishing only rescans changed sections"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="benchmark.prof",
+        help="Profile the local post-processing with cProfile (cli mode: saved with the run's checkpoints; "
+             "benchmark mode: merged over all runs into this file, default benchmark.prof)"
+    )
     
     args = parser.parse_args()
     
     if args.mode == "ui":
         run_ui()
+    elif args.mode == "validate-config":
+        sys.exit(0 if validate_config() else 1)
+    elif args.mode == "batch":
+        run_batch_cli(args.topics_file, args.concurrency or 4, use_cache=not args.no_cache,
+                      parallel_research=bool(args.parallel_research), pipelined=bool(args.pipelined),
+                      force=args.force, dedup_threshold=args.dedup_threshold)
+    elif args.mode == "history":
+        history_cli(args.query, args.limit)
+    elif args.mode == "export":
+        export_cli(args.site_dir, args.concurrency, force=args.force)
+    elif args.mode == "revise":
+        revise_cli(args.post, args.section, args.instruction, use_cache=not args.no_cache)
+    elif args.mode == "benchmark":
+        run_benchmark_cli(args.runs, args.concurrency or 1, args.latency, args.tokens_per_second,
+                          parallel_research=bool(args.parallel_research), report_path=args.report,
+                          profile_path=args.profile, pipelined=bool(args.pipelined),
+                          jitter=args.latency_jitter, distribution=args.latency_distribution)
+    elif args.mode == "resume":
+        resume(args.run_id, use_cache=not args.no_cache, parallel_research=args.parallel_research,
+               pipelined=args.pipelined)
     else:
-        run_cli(args.topic)
+        run_cli(args.topic, use_cache=not args.no_cache, parallel_research=bool(args.parallel_research),
+                profile=bool(args.profile), pipelined=bool(args.pipelined), force=args.force,
+                dedup_threshold=args.dedup_threshold)
 
 def run():
     """
@@ -103,6 +414,12 @@ def run():
     """
     run_cli()
 
+def replay():
+    """
+    Resume a checkpointed run: replay <run-id>. Lists runs when no id is given.
+    """
+    resume(sys.argv[1] if len(sys.argv) > 1 else None)
+
 if __name__ == "__main__":
     main()
 
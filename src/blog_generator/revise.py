@@ -0,0 +1,166 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from blog_generator.crew import BlogGenerator
+from blog_generator.utils.content_analyzer import ContentAnalyzer
+from blog_generator.utils.context_compactor import ContextCompactor
+from blog_generator.utils.markdown_ast import Heading, MarkdownDocument
+from blog_generator.utils.output_writer import post_name, read_post
+
+# Heading the publisher puts in front of the generated diagrams
+DIAGRAMS_HEADING = "Technical Diagrams"
+# Budget of the summary of the rest of the post when the writer has none configured
+DEFAULT_CONTEXT_BUDGET = 2000
+
+# Horizontal rule the publisher puts after each section
+_SEPARATOR = re.compile(r'\n---\s*\Z')
+_FRONTMATTER_TITLE = re.compile(r'^title:\s*"?(.*?)"?\s*$', re.MULTILINE)
+# A whole answer wrapped in a single markdown fence
+_WRAPPING_FENCE = re.compile(r'\A\s*(`{3,}|~{3,})[ \t]*(?:markdown|md)?[ \t]*\n(.*)\n\1\s*\Z', re.DOTALL)
+
+
+@dataclass
+class PublishedPost:
+    """A post written by the publisher, split into the parts a revision works with.
+
+    `content` is the article between the title and the generated Technical
+    Diagrams part; `prefix` (frontmatter and title), `diagrams` and `footer`
+    are kept as they are unless the diagrams have to be regenerated.
+    """
+    path: str
+    topic: str
+    prefix: str
+    content: str
+    diagrams: str
+    footer: str
+
+    @classmethod
+    def load(cls, path: str) -> "PublishedPost":
+        text = read_post(path)
+        doc = MarkdownDocument.parse(text)
+
+        title = next((h for h in doc.headings if h.level == 1), None)
+        content_start = text.index('\n', title.end) + 1 if title and title.end < len(text) else 0
+        # The article may have its own "Technical Diagrams" heading; the generated one comes last
+        marker = next((h for h in reversed(doc.headings)
+                       if h.level == 2 and h.text == DIAGRAMS_HEADING and h.start >= content_start), None)
+        content_end = marker.start if marker else len(text)
+        footer_start = text.rfind('\n---\n', content_end)
+        footer_start = footer_start if marker and footer_start != -1 else len(text)
+
+        frontmatter_title = _FRONTMATTER_TITLE.search(text[:content_start])
+        topic = (frontmatter_title.group(1) if frontmatter_title else title.text if title
+                 else post_name(path))
+        return cls(path, topic, text[:content_start], text[content_start:content_end],
+                   text[content_end:footer_start], text[footer_start:])
+
+    def find_section(self, heading: str) -> Tuple[Heading, int, int]:
+        """The heading matching `heading` (by text or anchor) and the span of its section.
+
+        The section runs up to the next heading of the same or a higher level,
+        so it includes its subsections.
+        """
+        doc = MarkdownDocument.parse(self.content)
+        wanted = heading.strip().lstrip('#').strip().lower()
+        matches = [h for h in doc.headings if h.text.lower() == wanted or h.anchor == wanted]
+        if not matches:
+            available = ', '.join(dict.fromkeys(f'"{h.text}"' for h in doc.headings)) or 'none'
+            raise ValueError(f"No section \"{heading}\" in {self.path}. Sections: {available}")
+        if len(matches) > 1:
+            raise ValueError(f"Section \"{heading}\" is ambiguous in {self.path} ({len(matches)} headings match)")
+
+        target = matches[0]
+        end = next((h.start for h in doc.headings if h.start > target.start and h.level <= target.level),
+                   len(self.content))
+        return target, target.start, end
+
+
+def _section_facts(text: str) -> Dict[str, List[Tuple]]:
+    """What diagram extraction finds in a piece of the post, comparable across texts."""
+    doc = MarkdownDocument.parse(text)
+    facts = ContentAnalyzer.scan(text, bounded=True, code_spans=doc.code_spans)
+    return {name: [match.groups() for match in matches] for name, matches in facts.items()}
+
+
+def _clean_revision(answer: str, target: Heading) -> str:
+    """The revised section from the reviewer's answer, with its original heading line."""
+    answer = answer.strip()
+    if fence := _WRAPPING_FENCE.match(answer):
+        answer = fence.group(2).strip()
+    first_line, _, rest = answer.partition('\n')
+    if first_line.lstrip().startswith('#'):
+        answer = rest.lstrip('\n')
+    return f"{'#' * target.level} {target.text}\n\n{answer}"
+
+
+def revise_post(post_path: str, heading: str, instruction: str, use_cache: bool = True,
+                generator: Optional[BlogGenerator] = None) -> str:
+    """Rewrite one section of a published post and save the result as a new post.
+
+    Only the writer and reviewer run, on that section, with the rest of the
+    post summarized as context. Diagram extraction compares the old and new
+    versions of the section; the diagrams are regenerated only when the
+    facts they are built from changed, and then only the revised section is
+    scanned, the others coming from the section cache filled while the crew
+    ran. Returns the path of the revised post.
+    """
+    if not instruction or not instruction.strip():
+        raise ValueError("An instruction is required to revise a section")
+
+    post = PublishedPost.load(post_path)
+    target, start, end = post.find_section(heading)
+    section = post.content[start:end].strip()
+    rest = post.content[:start] + post.content[end:]
+
+    generator = generator or BlogGenerator(use_cache=use_cache)
+    generator.topic = post.topic
+    # Scan the sections of the post while the crew runs, so regenerating the
+    # diagrams only has to scan the revised section
+    analysis = threading.Thread(target=generator._analyze_draft, args=(post.content,), daemon=True)
+    analysis.start()
+    instrumentation = generator.instrumentation
+    budget = generator.agents_config['technical_writer'].get('context_token_budget') or DEFAULT_CONTEXT_BUDGET
+    with instrumentation.span('step', 'summarize_post'):
+        post_context = ContextCompactor.summarize(rest, budget)
+
+    print(f"Revising section \"{target.text}\" of {post_path}...")
+    result = generator.revision_crew().kickoff(inputs={
+        'topic': post.topic,
+        'heading': target.text,
+        'section': section,
+        'instruction': instruction.strip(),
+        'post_context': post_context,
+    })
+    revised = _clean_revision(result.raw, target)
+    # Keep the separator the publisher put between this section and the next one
+    if _SEPARATOR.search(section) and not _SEPARATOR.search(revised):
+        revised += "\n\n---"
+
+    after = post.content[end:].lstrip('\n')
+    content = f"{post.content[:start]}{revised}\n\n{after}"
+    diagrams = post.diagrams
+    with instrumentation.span('step', 'content_analyzer') as attributes:
+        changed = _section_facts(section) != _section_facts(revised)
+        attributes['diagrams_changed'] = changed
+    if changed:
+        print("The revision changed what the diagrams are built from, regenerating them...")
+        analysis.join()
+        with instrumentation.span('step', 'diagram_generator') as attributes:
+            doc = MarkdownDocument.parse(content)
+            info = ContentAnalyzer.extract_diagram_info(doc, bounded=True, section_cache=generator.section_cache)
+            attributes['sections_reused'] = info.sections_reused
+            print(f"Reused the scans of {info.sections_reused}/{len(doc.sections)} sections")
+            rendered = generator._render_diagram_sections(info)
+            diagrams = f"## {DIAGRAMS_HEADING}\n\n{rendered}\n"
+
+    with instrumentation.span('step', 'file_write'):
+        # A name of its own, so the revision never overwrites the post it was made from
+        filepath = generator.save_blog_post(f"{post.prefix}{content}{diagrams}{post.footer}",
+                                            f"{post.topic} revised")
+        generator.output_writer.flush()
+    generator.saved_filepath = filepath
+    generator.export_instrumentation(result)
+    print(f"Revised post saved to: {filepath}")
+    return filepath
@@ -1,17 +1,32 @@
 import gradio as gr
 import sys
+import threading
 import warnings
 from datetime import datetime
-import markdown
 from pathlib import Path
 
 # Add the src directory to the path so we can import our modules
 sys.path.append(str(Path(__file__).parent))
 
-from blog_generator.crew import BlogGenerator
+from blog_generator.utils.html_export import BASIC_EXTENSIONS, export_html
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+_crew_pool = None
+_crew_pool_lock = threading.Lock()
+
+
+def get_crew_pool():
+    """The pool of crews built ahead of the next request, created on first use."""
+    global _crew_pool
+    with _crew_pool_lock:
+        if _crew_pool is None:
+            # Imported on first use so the UI starts without loading crewAI
+            from blog_generator.crew_pool import CrewPool
+            _crew_pool = CrewPool(size=1)
+        return _crew_pool
+
+
 def generate_blog_post(topic, progress=gr.Progress()):
     """Generate a blog post using the AI agents."""
     if not topic.strip():
@@ -19,10 +34,10 @@ def generate_blog_post(topic, progress=gr.Progress()):
     
     try:
         progress(0.1, desc="🤖 Initializing AI agents...")
-        generator = BlogGenerator()
+        # The next crew is built in the background while this one runs
+        _, crew = get_crew_pool().acquire()
         
         progress(0.2, desc="🔄 Creating crew...")
-        crew = generator.crew()
         
         progress(0.3, desc="⚡ Generating blog post...")
         inputs = {'topic': topic.strip()}
@@ -67,95 +82,7 @@ def download_markdown(content):
 
 def download_html(content):
     """Create a downloadable HTML file."""
-    if not content or content == "":
-        return None
-    
-    try:
-        # Convert markdown to HTML
-        html_content = markdown.markdown(content, extensions=['fenced_code', 'tables'])
-        
-        # Create full HTML document
-        full_html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Generated Blog Post</title>
-    <meta charset="utf-8">
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            line-height: 1.6;
-            color: #333;
-        }}
-        h1, h2, h3, h4, h5, h6 {{
-            color: #2c3e50;
-            margin-top: 2rem;
-            margin-bottom: 1rem;
-        }}
-        code {{
-            background-color: #f8f9fa;
-            padding: 2px 4px;
-            border-radius: 3px;
-            font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
-        }}
-        pre {{
-            background-color: #f8f9fa;
-            padding: 15px;
-            border-radius: 5px;
-            overflow-x: auto;
-            border-left: 4px solid #667eea;
-        }}
-        pre code {{
-            background-color: transparent;
-            padding: 0;
-        }}
-        blockquote {{
-            border-left: 4px solid #667eea;
-            margin: 0;
-            padding-left: 1rem;
-            color: #666;
-        }}
-        table {{
-            border-collapse: collapse;
-            width: 100%;
-            margin: 1rem 0;
-        }}
-        th, td {{
-            border: 1px solid #ddd;
-            padding: 8px;
-            text-align: left;
-        }}
-        th {{
-            background-color: #f8f9fa;
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 2rem;
-            padding-bottom: 1rem;
-            border-bottom: 2px solid #667eea;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>AI Generated Blog Post</h1>
-        <p>Generated on {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-    </div>
-    {html_content}
-</body>
-</html>
-"""
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"blog_post_{timestamp}.html"
-        
-        return (filename, full_html)
-        
-    except Exception as e:
-        return None
+    return export_html(content, BASIC_EXTENSIONS)
 
 def main():
     """Main function to launch the Gradio interface."""
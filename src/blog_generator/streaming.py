@@ -0,0 +1,166 @@
+import queue
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    from crewai.events import (
+        crewai_event_bus,
+        LLMCallStartedEvent,
+        LLMStreamChunkEvent,
+        TaskCompletedEvent,
+        TaskFailedEvent,
+        TaskStartedEvent,
+    )
+except ImportError:  # crewAI < 0.177 ships the event bus under utilities
+    from crewai.utilities.events import (
+        crewai_event_bus,
+        LLMCallStartedEvent,
+        LLMStreamChunkEvent,
+        TaskCompletedEvent,
+        TaskFailedEvent,
+        TaskStartedEvent,
+    )
+
+from blog_generator.utils.model_router import LLMEscalatedEvent
+
+
+@dataclass
+class RunEvent:
+    """A progress or token event from one crew run."""
+    kind: str  # task_started, task_completed, task_failed, token, retry, done, error
+    task: Optional[str] = None
+    agent: Optional[str] = None
+    text: str = ""
+    result: Any = None
+
+
+# Objects with an `_offer(source, event)` method that receive the crewAI events
+_listeners: "weakref.WeakSet[Any]" = weakref.WeakSet()
+_streams_lock = threading.Lock()
+_handlers_registered = False
+
+
+def _llm_chain(llm: Any) -> Iterator[Any]:
+    """Yield every LLM of a wrapper chain (e.g. CachedLLM), including each tier of a RoutedLLM.
+
+    The innermost LLMs are what emit chunks; a RoutedLLM emits the
+    escalation events.
+    """
+    while llm is not None:
+        yield llm
+        attributes = getattr(llm, '__dict__', {})
+        for tier_llm in attributes.get('llms', {}).values():
+            if tier_llm is not attributes.get('llm'):
+                yield from _llm_chain(tier_llm)
+        llm = attributes.get('llm')
+
+
+def _dispatch(source: Any, event: Any) -> None:
+    with _streams_lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        listener._offer(source, event)
+
+
+def _register_handlers() -> None:
+    """Register the event bus handlers once per process; they fan out to active streams."""
+    global _handlers_registered
+    with _streams_lock:
+        if _handlers_registered:
+            return
+        _handlers_registered = True
+
+    for event_type in (TaskStartedEvent, TaskCompletedEvent, TaskFailedEvent, LLMCallStartedEvent,
+                       LLMStreamChunkEvent, LLMEscalatedEvent):
+        crewai_event_bus.on(event_type)(_dispatch)
+
+
+def subscribe(listener: Any) -> None:
+    """Start passing task and stream chunk events to listener._offer(source, event).
+
+    Listeners are held weakly, so a forgotten listener does not outlive its owner.
+    """
+    _register_handlers()
+    with _streams_lock:
+        _listeners.add(listener)
+
+
+def unsubscribe(listener: Any) -> None:
+    with _streams_lock:
+        _listeners.discard(listener)
+
+
+class RunEventStream:
+    """Turns the crewAI events of a single crew run into an iterator of RunEvents.
+
+    Events are matched to this run by identity of its tasks and agents' LLMs, so
+    several crews can stream at the same time without seeing each other's tokens.
+    Token chunks are only produced by LLMs created with streaming enabled.
+    When a call is escalated to a larger model tier, a `retry` event carries
+    the text the discarded attempt streamed, for consumers to take back.
+    """
+
+    def __init__(self, crew: Any):
+        self.crew = crew
+        self.total_tasks = len(crew.tasks)
+        self._task_ids = {id(task) for task in crew.tasks}
+        self._llm_ids = {id(llm) for agent in crew.agents for llm in _llm_chain(agent.llm)}
+        self._current_task = None
+        # Text streamed by the current call of each LLM, by id
+        self._call_text: Dict[int, List[str]] = {}
+        self._events: "queue.Queue[RunEvent]" = queue.Queue()
+
+    def _offer(self, source: Any, event: Any) -> None:
+        if isinstance(event, LLMCallStartedEvent):
+            if id(source) in self._llm_ids:
+                self._call_text[id(source)] = []
+            return
+        if isinstance(event, LLMStreamChunkEvent):
+            if id(source) in self._llm_ids and not getattr(event, 'tool_call', None):
+                self._call_text.setdefault(id(source), []).append(event.chunk)
+                self._events.put(RunEvent('token', task=self._current_task, text=event.chunk))
+            return
+        if isinstance(event, LLMEscalatedEvent):
+            if id(source) in self._llm_ids:
+                discarded = "".join(chunk for llm in _llm_chain(source.llm)
+                                    for chunk in self._call_text.pop(id(llm), []))
+                self._events.put(RunEvent('retry', task=self._current_task, text=discarded))
+            return
+
+        if id(source) not in self._task_ids:
+            return
+        agent = source.agent.role.strip() if source.agent else None
+        if isinstance(event, TaskStartedEvent):
+            self._current_task = source.name
+            self._events.put(RunEvent('task_started', task=source.name, agent=agent))
+        elif isinstance(event, TaskCompletedEvent):
+            self._events.put(RunEvent('task_completed', task=source.name, agent=agent, text=event.output.raw))
+        elif isinstance(event, TaskFailedEvent):
+            self._events.put(RunEvent('task_failed', task=source.name, agent=agent, text=event.error))
+
+    def run(self, inputs: dict) -> Iterator[RunEvent]:
+        """Kick off the crew in a worker thread and yield its events as they happen.
+
+        The last event is either `done` (with the crew result) or `error`.
+        """
+        subscribe(self)
+
+        def worker():
+            try:
+                result = self.crew.kickoff(inputs=inputs)
+                self._events.put(RunEvent('done', result=result))
+            except Exception as e:
+                self._events.put(RunEvent('error', text=str(e)))
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        try:
+            while True:
+                event = self._events.get()
+                yield event
+                if event.kind in ('done', 'error'):
+                    break
+        finally:
+            unsubscribe(self)
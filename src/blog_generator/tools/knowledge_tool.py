@@ -0,0 +1,36 @@
+from crewai.tools import BaseTool
+from typing import Type
+from pydantic import BaseModel, Field, PrivateAttr
+
+from ..utils.knowledge_index import KnowledgeIndex
+
+
+class KnowledgeSearchToolInput(BaseModel):
+    """Input schema for KnowledgeSearchTool."""
+    query: str = Field(..., description="What to look up, in a few keywords (e.g. 'kafka consumer retry backoff').")
+    top_k: int = Field(5, ge=1, le=20, description="Number of passages to return.")
+
+class KnowledgeSearchTool(BaseTool):
+    name: str = "Search local knowledge"
+    description: str = (
+        "Search the team's internal documents and notes in the knowledge directory and return the most "
+        "relevant passages with their source. Use it to ground the research in local knowledge before "
+        "relying on general knowledge."
+    )
+    args_schema: Type[BaseModel] = KnowledgeSearchToolInput
+    _index: KnowledgeIndex = PrivateAttr()
+
+    def __init__(self, index: KnowledgeIndex, **kwargs):
+        super().__init__(**kwargs)
+        self._index = index
+
+    def _run(self, query: str, top_k: int = 5) -> str:
+        # The generator keeps the index up to date in the background; this searches the current snapshot
+        hits = self._index.search(query, top_k)
+        if not hits:
+            return f"No passages in the knowledge directory match '{query}'."
+        passages = []
+        for number, hit in enumerate(hits, 1):
+            where = f"{hit.source} > {hit.heading}" if hit.heading else hit.source
+            passages.append(f"[{number}] {where} (score {hit.score:.2f})\n{hit.text.strip()}")
+        return "\n\n".join(passages)
@@ -3,94 +3,113 @@ import sys
 import warnings
 import traceback
 from datetime import datetime
-import markdown
 import os
 from pathlib import Path
-import threading
-import time
+import uuid
 
 # Add the src directory to the path so we can import our modules
 sys.path.append(str(Path(__file__).parent))
 
-from blog_generator.crew import BlogGenerator
+from blog_generator.jobs import JobManager
+from blog_generator.utils.output_index import OutputIndex
+from blog_generator.utils.output_writer import read_post
+from blog_generator.utils.html_export import export_html
+from blog_generator.utils.topic_dedup import TopicDeduplicator
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+# Progress labels for each crew stage
+STAGE_LABELS = {
+    'research_task': "🔍 Researching",
+    'technical_writer_task': "✍️ Writing draft",
+    'technical_reviewer_task': "🔎 Reviewing",
+    'technical_publisher_task': "📝 Publishing",
+}
+# Minimum seconds between preview refreshes while tokens stream in
+STREAM_UPDATE_INTERVAL = 0.25
+# Crews running at once; further jobs wait in the job queue
+MAX_CONCURRENT_JOBS = int(os.getenv("BLOG_UI_MAX_JOBS", "2"))
+# Gradio event handlers allowed at once and requests allowed to wait for one
+QUEUE_CONCURRENCY = int(os.getenv("BLOG_UI_QUEUE_CONCURRENCY", "16"))
+QUEUE_MAX_SIZE = int(os.getenv("BLOG_UI_QUEUE_MAX_SIZE", "64"))
+
 class BlogGeneratorUI:
-    def __init__(self):
-        self.generator = None
-        self.crew = None
-        self.generation_status = "idle"
-        self.current_result = None
-        self.error_message = None
-    
-    def initialize_agents(self):
-        """Initialize the blog generator and crew."""
-        try:
-            if self.generator is None:
-                self.generator = BlogGenerator()
-            if self.crew is None:
-                self.crew = self.generator.crew()
-            return True
-        except Exception as e:
-            self.error_message = f"Error initializing agents: {str(e)}"
-            return False
+    def __init__(self, max_jobs=MAX_CONCURRENT_JOBS):
+        # Each request runs as a job with its own crew; nothing is shared between users
+        self.jobs = JobManager(max_workers=max_jobs)
+        # Generated posts, for the history tab and to reuse earlier posts on the same topic
+        self.posts = OutputIndex(os.path.join(os.getcwd(), "output"))
+        self.posts.sync()
     
-    def generate_blog_post(self, topic, show_diagrams, save_to_file, progress=gr.Progress()):
-        """Generate a blog post using the AI agents."""
+    def generate_blog_post(self, topic, show_diagrams, save_to_file, session_id, reuse_earlier=False,
+                           progress=gr.Progress()):
+        """Generate a blog post using the AI agents.
+
+        Queues a job for this session and yields (status, content, generation_status)
+        while it runs: the progress bar follows real task completion and the
+        writer's and publisher's tokens are streamed into the preview as they arrive.
+        With reuse_earlier, an earlier post on the same or a near-duplicate topic
+        is shown instead.
+        """
         if not topic.strip():
-            return "❌ Please enter a topic to generate a blog post.", "", "idle"
+            yield "❌ Please enter a topic to generate a blog post.", "", "idle"
+            return
         
         try:
-            self.generation_status = "generating"
-            self.error_message = None
-            
-            # Initialize agents
-            progress(0.1, desc="🤖 Initializing AI agents...")
-            if not self.initialize_agents():
-                return f"❌ {self.error_message}", "", "error"
-            
-            # Create crew
-            progress(0.2, desc="🔄 Creating crew...")
-            if self.crew is None:
-                self.crew = self.generator.crew()
+            earlier = TopicDeduplicator.from_index(self.posts).match(topic.strip()) if reuse_earlier else None
+            if earlier:
+                content = self.read_post(earlier.path)
+                if content is not None:
+                    yield (f"♻️ Showing the post on '{earlier.topic}' generated on {earlier.post.created_at}",
+                           content, "reused")
+                    return
             
-            # Generate blog post
-            progress(0.3, desc="⚡ Generating blog post...")
-            inputs = {'topic': topic.strip()}
+            job = self.jobs.submit(topic.strip(), session_id=session_id)
             
-            # Update progress during generation
-            def update_progress():
-                for i in range(4, 10):
-                    time.sleep(2)  # Simulate work
-                    progress(i/10, desc=f"🔄 AI agents working... ({i*10}%)")
+            for job in self.jobs.follow(job.job_id, interval=STREAM_UPDATE_INTERVAL):
+                if job.status == "queued":
+                    position = self.jobs.queue_position(job.job_id)
+                    status = f"⏳ Job {job.job_id} queued ({position} ahead)"
+                    progress(0.0, desc=status)
+                    yield status, "", "generating"
+                elif job.status == "running":
+                    label = STAGE_LABELS.get(job.stage, job.stage)
+                    status = f"{label}... ({job.stages_done}/{job.total_stages or '?'} stages done)"
+                    progress(job.stages_done / job.total_stages if job.total_stages else 0.0, desc=status)
+                    yield status, job.preview, "generating"
             
-            # Start progress thread
-            progress_thread = threading.Thread(target=update_progress)
-            progress_thread.start()
-            
-            # Generate the blog post
-            result = self.crew.kickoff(inputs=inputs)
-            
-            # Wait for progress thread to finish
-            progress_thread.join()
+            if job.status == "failed":
+                raise RuntimeError(job.error)
             
             progress(1.0, desc="✅ Blog post generated successfully!")
-            
-            # Store the result
-            self.current_result = result
-            self.generation_status = "completed"
-            
-            # Format the result for display
-            formatted_result = self.format_blog_post(result, topic.strip(), show_diagrams)
-            
-            return "✅ Blog post generated successfully!", formatted_result, "completed"
+            yield "✅ Blog post generated successfully!", job.result, "completed"
             
         except Exception as e:
-            self.generation_status = "error"
-            self.error_message = str(e)
             error_msg = f"❌ Error occurred during generation: {str(e)}"
-            return error_msg, "", "error"
+            yield error_msg, "", "error"
+    
+    def job_table(self, session_id=None):
+        """Rows for the job status panel, newest first."""
+        rows = []
+        for job in self.jobs.jobs():
+            owner = "you" if job.session_id == session_id else "team"
+            stage = STAGE_LABELS.get(job.stage, job.stage or "")
+            rows.append([job.job_id, owner, job.topic[:60], job.status, stage, f"{job.elapsed:.0f}s"])
+        return rows
+    
+    def history_table(self, query=""):
+        """Rows for the history tab: the latest posts, or those matching query."""
+        self.posts.sync()
+        posts = self.posts.search(query, 50) if query and query.strip() else self.posts.history(50)
+        return [[post.created_at, post.topic[:80], ', '.join(post.diagram_types), post.path] for post in posts]
+    
+    @staticmethod
+    def read_post(path):
+        """Content of a generated post, or None when it no longer exists."""
+        try:
+            return read_post(path)
+        except (OSError, EOFError, UnicodeDecodeError):
+            return None
     
     def format_blog_post(self, content, topic, show_diagrams):
         """Format the blog post with proper styling and diagrams."""
@@ -133,95 +152,7 @@ date: "{timestamp}"
     
     def download_html(self, content):
         """Create a downloadable HTML file."""
-        if not content:
-            return None
-        
-        try:
-            # Convert markdown to HTML
-            html_content = markdown.markdown(content, extensions=['fenced_code', 'tables', 'codehilite'])
-            
-            # Create full HTML document
-            full_html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Generated Blog Post</title>
-    <meta charset="utf-8">
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            line-height: 1.6;
-            color: #333;
-        }}
-        h1, h2, h3, h4, h5, h6 {{
-            color: #2c3e50;
-            margin-top: 2rem;
-            margin-bottom: 1rem;
-        }}
-        code {{
-            background-color: #f8f9fa;
-            padding: 2px 4px;
-            border-radius: 3px;
-            font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
-        }}
-        pre {{
-            background-color: #f8f9fa;
-            padding: 15px;
-            border-radius: 5px;
-            overflow-x: auto;
-            border-left: 4px solid #667eea;
-        }}
-        pre code {{
-            background-color: transparent;
-            padding: 0;
-        }}
-        blockquote {{
-            border-left: 4px solid #667eea;
-            margin: 0;
-            padding-left: 1rem;
-            color: #666;
-        }}
-        table {{
-            border-collapse: collapse;
-            width: 100%;
-            margin: 1rem 0;
-        }}
-        th, td {{
-            border: 1px solid #ddd;
-            padding: 8px;
-            text-align: left;
-        }}
-        th {{
-            background-color: #f8f9fa;
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 2rem;
-            padding-bottom: 1rem;
-            border-bottom: 2px solid #667eea;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>AI Generated Blog Post</h1>
-        <p>Generated on {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-    </div>
-    {html_content}
-</body>
-</html>
-"""
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"blog_post_{timestamp}.html"
-            
-            return (filename, full_html)
-            
-        except Exception as e:
-            return None
+        return export_html(content)
 
 def create_ui():
     """Create the Gradio interface."""
@@ -251,6 +182,10 @@ def create_ui():
     """
     
     with gr.Blocks(css=custom_css, title="AI Blog Generator") as demo:
+        # Per-browser-session id, used to tell this user's jobs apart from the team's
+        session_state = gr.State("")
+        demo.load(fn=lambda: uuid.uuid4().hex, outputs=[session_state])
+        
         # Header
         gr.HTML("""
         <div class="main-header">✍️ AI Blog Generator</div>
@@ -279,6 +214,11 @@ def create_ui():
                         value=True,
                         info="Save the generated blog post as a markdown file"
                     )
+                    reuse_earlier = gr.Checkbox(
+                        label="Reuse Earlier Post",
+                        value=True,
+                        info="Show the earlier post when this or a near-duplicate topic was already generated"
+                    )
                 
                 generate_btn = gr.Button(
                     "🎯 Generate Blog Post",
@@ -293,6 +233,16 @@ def create_ui():
                     value="⏳ Ready to generate blog post"
                 )
                 
+                # Job status panel
+                gr.Markdown("### 📋 Jobs")
+                jobs_table = gr.Dataframe(
+                    headers=["Job", "Owner", "Topic", "Status", "Stage", "Elapsed"],
+                    value=[],
+                    interactive=False,
+                    wrap=True
+                )
+                refresh_jobs_btn = gr.Button("🔄 Refresh jobs", size="sm")
+                
                 # About section
                 gr.Markdown("""
                 ### ℹ️ About
@@ -337,6 +287,22 @@ def create_ui():
                             label="🌐 Download as HTML",
                             variant="secondary"
                         )
+                    
+                    with gr.TabItem("🗂️ History"):
+                        with gr.Row():
+                            history_query = gr.Textbox(
+                                label="Search topics and headings",
+                                placeholder="Example: kafka consumer",
+                                scale=4
+                            )
+                            history_btn = gr.Button("🔎 Search", size="sm", scale=1)
+                        history_table = gr.Dataframe(
+                            headers=["Created", "Topic", "Diagrams", "File"],
+                            value=ui.history_table,
+                            interactive=False,
+                            wrap=True
+                        )
+                        gr.Markdown("*Select a post to open it.*")
         
         # Footer
         gr.HTML(f"""
@@ -347,34 +313,73 @@ def create_ui():
         """)
         
         # Event handlers
-        def on_generate(topic, show_diagrams, save_to_file, progress=gr.Progress()):
-            status, content, generation_status = ui.generate_blog_post(topic, show_diagrams, save_to_file, progress)
-            
-            # Update outputs based on generation status
-            if generation_status == "completed":
-                # Update formatted view
-                formatted_content = ui.format_blog_post(content, topic, show_diagrams)
-                
-                # Update raw markdown
-                raw_content = content
-                
-                # Update download buttons
-                md_file = ui.download_markdown(formatted_content)
-                html_file = ui.download_html(formatted_content)
-                
-                return status, formatted_content, raw_content, md_file, html_file
-            else:
-                return status, "*Generation failed*", "*Generation failed*", None, None
+        def on_generate(topic, show_diagrams, save_to_file, reuse_earlier, session_id, progress=gr.Progress()):
+            for status, content, generation_status in ui.generate_blog_post(topic, show_diagrams, save_to_file, session_id, reuse_earlier, progress):
+                # Update outputs based on generation status
+                if generation_status == "generating":
+                    # Stream the partial content into both views
+                    yield status, content or "*Waiting for the first draft...*", content, None, None, ui.job_table(session_id)
+                elif generation_status == "completed":
+                    # Update formatted view
+                    formatted_content = ui.format_blog_post(content, topic, show_diagrams)
+                    
+                    # Update raw markdown
+                    raw_content = content
+                    
+                    # Update download buttons
+                    md_file = ui.download_markdown(formatted_content)
+                    html_file = ui.download_html(formatted_content)
+                    
+                    yield status, formatted_content, raw_content, md_file, html_file, ui.job_table(session_id)
+                elif generation_status == "reused":
+                    # Saved posts are already formatted
+                    yield status, content, content, ui.download_markdown(content), ui.download_html(content), ui.job_table(session_id)
+                else:
+                    yield status, "*Generation failed*", "*Generation failed*", None, None, ui.job_table(session_id)
         
         # Connect the generate button
         generate_btn.click(
             fn=on_generate,
-            inputs=[topic_input, show_diagrams, save_to_file],
-            outputs=[status_output, formatted_output, raw_output, download_md_btn, download_html_btn]
+            inputs=[topic_input, show_diagrams, save_to_file, reuse_earlier, session_state],
+            outputs=[status_output, formatted_output, raw_output, download_md_btn, download_html_btn, jobs_table],
+            concurrency_limit=QUEUE_CONCURRENCY
+        )
+        
+        refresh_jobs_btn.click(
+            fn=ui.job_table,
+            inputs=[session_state],
+            outputs=[jobs_table]
+        )
+        
+        history_btn.click(
+            fn=ui.history_table,
+            inputs=[history_query],
+            outputs=[history_table]
+        )
+        history_query.submit(
+            fn=ui.history_table,
+            inputs=[history_query],
+            outputs=[history_table]
+        )
+        
+        def on_history_select(rows, evt: gr.SelectData):
+            path = rows.iloc[evt.index[0], 3]
+            content = ui.read_post(path)
+            if content is None:
+                return f"❌ {path} no longer exists", gr.update(), gr.update()
+            return f"🗂️ Opened {os.path.basename(path)}", content, content
+        
+        history_table.select(
+            fn=on_history_select,
+            inputs=[history_table],
+            outputs=[status_output, formatted_output, raw_output]
         )
         
         # Auto-update download buttons when content changes
-        def update_downloads(content):
+        def update_downloads(content, session_id):
+            # Partial content is streamed while generating; only export the final post
+            if ui.jobs.has_active(session_id):
+                return gr.update(), gr.update()
             if content and content != "*Generation failed*":
                 md_file = ui.download_markdown(content)
                 html_file = ui.download_html(content)
@@ -383,10 +388,12 @@ def create_ui():
         
         formatted_output.change(
             fn=update_downloads,
-            inputs=[formatted_output],
+            inputs=[formatted_output, session_state],
             outputs=[download_md_btn, download_html_btn]
         )
     
+    # Bound how many handlers run at once and how many requests may wait
+    demo.queue(default_concurrency_limit=QUEUE_CONCURRENCY, max_size=QUEUE_MAX_SIZE)
     return demo
 
 def main():
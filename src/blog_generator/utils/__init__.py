@@ -1,5 +1,6 @@
-from .file_utils import save_blog_post
+from .output_writer import OutputWriter, save_blog_post
 from .diagram_generator import DiagramGenerator
 from .content_analyzer import ContentAnalyzer
+from .markdown_ast import MarkdownDocument
 
-__all__ = ['DiagramGenerator', 'ContentAnalyzer']
\ No newline at end of file
+__all__ = ['DiagramGenerator', 'ContentAnalyzer', 'MarkdownDocument', 'OutputWriter']
\ No newline at end of file
@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class CheckpointStore:
+    """Persists the output of every finished task so a failed run can be resumed.
+
+    Each run gets its own directory holding a `manifest.json` (run inputs and the
+    completed stages in order) plus one markdown file per completed task.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root_dir: str, run_id: Optional[str] = None):
+        self.root_dir = root_dir
+        self.run_id = run_id or self.new_run_id()
+        self.run_dir = os.path.join(root_dir, self.run_id)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_run_id() -> str:
+        """Create a sortable, unique run id."""
+        return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+    @staticmethod
+    def list_runs(root_dir: str) -> List[Dict]:
+        """Return the manifests of all checkpointed runs, newest first."""
+        if not os.path.isdir(root_dir):
+            return []
+        runs = []
+        for run_id in sorted(os.listdir(root_dir), reverse=True):
+            manifest_path = os.path.join(root_dir, run_id, CheckpointStore.MANIFEST)
+            if os.path.exists(manifest_path):
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    runs.append(json.load(f))
+        return runs
+
+    def exists(self) -> bool:
+        return os.path.exists(os.path.join(self.run_dir, self.MANIFEST))
+
+    def load(self) -> Dict:
+        """Load the manifest of this run."""
+        with open(os.path.join(self.run_dir, self.MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, filename: str, content: str) -> None:
+        # Write to a temp file first so a crash never leaves a truncated checkpoint
+        fd, tmp_path = tempfile.mkstemp(dir=self.run_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, os.path.join(self.run_dir, filename))
+
+    def _write_manifest(self, manifest: Dict) -> None:
+        manifest['updated'] = datetime.now().isoformat(timespec="seconds")
+        self._write(self.MANIFEST, json.dumps(manifest, indent=2))
+
+    def start(self, inputs: Dict, options: Optional[Dict] = None) -> None:
+        """Record the inputs (and generator options) of the run, keeping stages completed by earlier attempts."""
+        os.makedirs(self.run_dir, exist_ok=True)
+        if self.exists():
+            manifest = self.load()
+            manifest['inputs'] = inputs
+        else:
+            manifest = {
+                'run_id': self.run_id,
+                'inputs': inputs,
+                'created': datetime.now().isoformat(timespec="seconds"),
+                'completed': [],
+            }
+        if options is not None:
+            manifest['options'] = options
+        self._write_manifest(manifest)
+
+    def save(self, task_name: str, agent: str, output: str) -> None:
+        """Persist the output of a finished task."""
+        with self._lock:
+            if not self.exists():
+                self.start({})
+            self._write(f"{task_name}.md", output)
+            manifest = self.load()
+            manifest['completed'] = [c for c in manifest['completed'] if c['task'] != task_name]
+            manifest['completed'].append({'task': task_name, 'agent': agent})
+            self._write_manifest(manifest)
+
+    def completed_outputs(self) -> Dict[str, Dict[str, str]]:
+        """Map each completed task name to its agent and saved output."""
+        if not self.exists():
+            return {}
+        outputs = {}
+        for entry in self.load()['completed']:
+            with open(os.path.join(self.run_dir, f"{entry['task']}.md"), "r", encoding="utf-8") as f:
+                outputs[entry['task']] = {'agent': entry['agent'], 'raw': f.read()}
+        return outputs
@@ -0,0 +1,96 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+from .config_validator import CONFIG_DIR, CREW_MODULE, ConfigValidator
+
+CONFIG_FILES = ("agents.yaml", "tasks.yaml")
+
+
+class ConfigCache:
+    """Parsed and validated agents.yaml and tasks.yaml, shared by every crew of the process.
+
+    CrewBase reads and parses both files for every BlogGenerator, which was
+    most of the time it takes to build a crew. Here they are parsed (with
+    libyaml when available) and validated once, and again only when the
+    modification time or size of one of them changes. Each crew gets its own
+    copy of the entries because CrewBase replaces agent and task names in
+    them with the objects it builds. A reload that fails to parse or to
+    validate (e.g. a file caught halfway through being saved) keeps the
+    last valid configuration and prints the problems.
+    """
+
+    _entries: Dict[str, Tuple[Tuple, Dict[str, Dict]]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _signature(config_dir: str) -> Tuple:
+        signature = []
+        for filename in CONFIG_FILES:
+            stat = os.stat(os.path.join(config_dir, filename))
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    @staticmethod
+    def _parse(config_dir: str, crew_module: Optional[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        configs = {filename: ConfigValidator.load(os.path.join(config_dir, filename)) for filename in CONFIG_FILES}
+        agents, tasks = configs["agents.yaml"], configs["tasks.yaml"]
+        errors = ConfigValidator.check_agents(agents) + ConfigValidator.check_tasks(tasks, agents)
+        models_path = os.path.join(config_dir, "models.yaml")
+        if os.path.exists(models_path):
+            errors += ConfigValidator.check_models(ConfigValidator.load(models_path), agents, tasks)
+        if crew_module and os.path.exists(crew_module):
+            errors += ConfigValidator.check_crew(agents, tasks, crew_module)
+        return configs, errors
+
+    @staticmethod
+    def _copy(config: Dict) -> Dict:
+        # CrewBase assigns to the keys of an entry (agent, context, tools, llm) but never mutates their values
+        return {name: ({key: list(value) if isinstance(value, list) else value for key, value in entry.items()}
+                       if isinstance(entry, dict) else entry)
+                for name, entry in config.items()}
+
+    @classmethod
+    def configs(cls, config_dir: str = CONFIG_DIR, crew_module: Optional[str] = CREW_MODULE) -> Dict[str, Dict]:
+        """A copy of the agents.yaml and tasks.yaml entries of config_dir, by file name.
+
+        Raises ValueError when the configuration is invalid the first time it is loaded.
+        """
+        config_dir = os.path.abspath(config_dir)
+        with cls._lock:
+            signature = cls._signature(config_dir)
+            cached = cls._entries.get(config_dir)
+            if cached is None or cached[0] != signature:
+                if cached is None:
+                    configs, errors = cls._parse(config_dir, crew_module)
+                else:
+                    try:
+                        configs, errors = cls._parse(config_dir, crew_module)
+                    except (OSError, ValueError, yaml.YAMLError) as e:
+                        configs, errors = None, [str(e)]
+                if errors and cached is None:
+                    raise ValueError("Invalid crew configuration:\n" + "\n".join(f"  - {e}" for e in errors))
+                if errors:
+                    print(f"Ignoring the changed configuration in {config_dir}, it has {len(errors)} problem(s):")
+                    for error in errors:
+                        print(f"  - {error}")
+                    # Keep serving the last valid configuration until the files are fixed
+                    configs = cached[1]
+                cached = cls._entries[config_dir] = (signature, configs)
+        return {filename: cls._copy(config) for filename, config in cached[1].items()}
+
+    @classmethod
+    def load_yaml(cls, path) -> Dict:
+        """Drop-in for CrewBase.load_yaml: the cached entries of agents.yaml or tasks.yaml, any other file parsed."""
+        path = os.fspath(path)
+        filename = os.path.basename(path)
+        if filename not in CONFIG_FILES:
+            return ConfigValidator.load(path)
+        return cls.configs(os.path.dirname(path))[filename]
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._entries.clear()
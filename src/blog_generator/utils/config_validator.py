@@ -0,0 +1,200 @@
+import ast
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+import yaml
+
+# Same placeholder syntax crewAI interpolates into agent and task texts
+PLACEHOLDER = re.compile(r'\{([A-Za-z_][A-Za-z0-9_\-]*)\}')
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config")
+CREW_MODULE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "crew.py")
+
+# libyaml's loader parses the configs about ten times faster than the pure Python one
+SAFE_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+AGENT_REQUIRED = ('role', 'goal', 'backstory')
+TASK_REQUIRED = ('description', 'expected_output')
+
+# Keys of a tier in models.yaml and of a task's escalation in tasks.yaml
+TIER_KEYS = ('model', 'input_cost', 'output_cost')
+ESCALATION_KEYS = ('tier', 'above_prompt_tokens', 'on_error', 'min_response_tokens')
+
+
+def _is_positive_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+class ConfigValidator:
+    """Checks agents.yaml and tasks.yaml without importing crewAI.
+
+    Every check returns a list of human readable problems; an empty list means
+    the configuration is valid.
+    """
+
+    @staticmethod
+    def load(path: str) -> Dict:
+        """Read a YAML config file that must contain a mapping of names to entries."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.load(f, Loader=SAFE_LOADER)
+        if data is None:
+            return {}
+        if not isinstance(data, dict):
+            raise ValueError(f"{os.path.basename(path)} must be a mapping of names to entries")
+        return data
+
+    @staticmethod
+    def _check_fields(kind: str, name: str, entry, required: Iterable[str]) -> List[str]:
+        if not isinstance(entry, dict):
+            return [f"{kind} '{name}' must be a mapping"]
+        errors = []
+        for key in required:
+            value = entry.get(key)
+            if not isinstance(value, str) or not value.strip():
+                errors.append(f"{kind} '{name}' is missing '{key}'")
+        return errors
+
+    @staticmethod
+    def _check_placeholders(kind: str, name: str, entry, inputs: Iterable[str]) -> List[str]:
+        if not isinstance(entry, dict):
+            return []
+        errors = []
+        for key, value in entry.items():
+            if not isinstance(value, str):
+                continue
+            for placeholder in sorted(set(PLACEHOLDER.findall(value)) - set(inputs)):
+                errors.append(f"{kind} '{name}' {key} uses unknown input {{{placeholder}}}")
+        return errors
+
+    @staticmethod
+    def check_agents(agents: Dict, inputs: Iterable[str] = ('topic',)) -> List[str]:
+        errors = []
+        for name, entry in agents.items():
+            errors += ConfigValidator._check_fields("Agent", name, entry, AGENT_REQUIRED)
+            errors += ConfigValidator._check_placeholders("Agent", name, entry, inputs)
+            budget = entry.get('context_token_budget') if isinstance(entry, dict) else None
+            if budget is not None and not _is_positive_int(budget):
+                errors.append(f"Agent '{name}' context_token_budget must be a positive integer")
+        return errors
+
+    @staticmethod
+    def check_tasks(tasks: Dict, agents: Dict, inputs: Iterable[str] = ('topic',)) -> List[str]:
+        errors = []
+        seen = set()
+        for name, entry in tasks.items():
+            errors += ConfigValidator._check_fields("Task", name, entry, TASK_REQUIRED)
+            errors += ConfigValidator._check_placeholders("Task", name, entry, inputs)
+            if not isinstance(entry, dict):
+                continue
+            if entry.get('agent') is not None and entry['agent'] not in agents:
+                errors.append(f"Task '{name}' uses unknown agent '{entry['agent']}'")
+            for upstream in entry.get('context') or []:
+                if upstream not in seen:
+                    errors.append(f"Task '{name}' context '{upstream}' is not an earlier task")
+            seen.add(name)
+        return errors
+
+    @staticmethod
+    def check_models(models: Dict, agents: Optional[Dict] = None, tasks: Optional[Dict] = None) -> List[str]:
+        """Check models.yaml and, when given, the model tiers and escalations agents and tasks refer to."""
+        tiers = models.get('tiers')
+        if not isinstance(tiers, dict) or not tiers:
+            return ["models.yaml must define at least one tier under 'tiers'"]
+        errors = []
+        for name, entry in tiers.items():
+            if entry is None:
+                continue
+            if not isinstance(entry, dict):
+                errors.append(f"Tier '{name}' must be a mapping")
+                continue
+            errors += [f"Tier '{name}' has unknown key '{key}'" for key in entry if key not in TIER_KEYS]
+            if entry.get('model') is not None and not isinstance(entry['model'], str):
+                errors.append(f"Tier '{name}' model must be a model name")
+            for key in ('input_cost', 'output_cost'):
+                value = entry.get(key)
+                if value is not None and (not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0):
+                    errors.append(f"Tier '{name}' {key} must be a non-negative number")
+        default = models.get('default_tier')
+        if default is not None and default not in tiers:
+            errors.append(f"default_tier '{default}' is not a tier")
+
+        for name, entry in (agents or {}).items():
+            tier = entry.get('model_tier') if isinstance(entry, dict) else None
+            if tier is not None and tier not in tiers:
+                errors.append(f"Agent '{name}' uses unknown model_tier '{tier}'")
+
+        rules = {}
+        for name, entry in (tasks or {}).items():
+            rule = entry.get('escalation') if isinstance(entry, dict) else None
+            if rule is None:
+                continue
+            if not isinstance(rule, dict):
+                errors.append(f"Task '{name}' escalation must be a mapping")
+                continue
+            errors += [f"Task '{name}' escalation has unknown key '{key}'" for key in rule if key not in ESCALATION_KEYS]
+            if rule.get('tier') not in tiers:
+                errors.append(f"Task '{name}' escalates to unknown tier '{rule.get('tier')}'")
+            for key in ('above_prompt_tokens', 'min_response_tokens'):
+                if rule.get(key) is not None and not _is_positive_int(rule[key]):
+                    errors.append(f"Task '{name}' escalation {key} must be a positive integer")
+            if not isinstance(rule.get('on_error', False), bool):
+                errors.append(f"Task '{name}' escalation on_error must be true or false")
+            # Escalation applies to the agent's LLM, so every task of an agent must agree on it
+            agent = entry.get('agent')
+            if agent in rules and rules[agent][1] != rule:
+                errors.append(f"Tasks '{rules[agent][0]}' and '{name}' of agent '{agent}' escalate differently")
+            rules.setdefault(agent, (name, rule))
+        return errors
+
+    @staticmethod
+    def crew_members(crew_module: str = CREW_MODULE) -> Dict[str, List[str]]:
+        """Names of the @agent and @task methods of the crew module, read from its source."""
+        with open(crew_module, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=crew_module)
+        members = {'agent': [], 'task': []}
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.FunctionDef):
+                continue
+            for decorator in node.decorator_list:
+                if isinstance(decorator, ast.Name) and decorator.id in members:
+                    members[decorator.id].append(node.name)
+        return members
+
+    @staticmethod
+    def check_crew(agents: Dict, tasks: Dict, crew_module: str = CREW_MODULE) -> List[str]:
+        """Every @agent and @task method must have a config entry of the same name."""
+        members = ConfigValidator.crew_members(crew_module)
+        errors = [f"Agent '{name}' of the crew has no entry in agents.yaml"
+                  for name in members['agent'] if name not in agents]
+        errors += [f"Task '{name}' of the crew has no entry in tasks.yaml"
+                   for name in members['task'] if name not in tasks]
+        return errors
+
+    @staticmethod
+    def validate(config_dir: str = CONFIG_DIR, inputs: Iterable[str] = ('topic',),
+                 crew_module: Optional[str] = CREW_MODULE) -> List[str]:
+        """Validate the agents.yaml and tasks.yaml in config_dir against each other and the crew."""
+        configs = {}
+        errors = []
+        for filename in ("agents.yaml", "tasks.yaml"):
+            path = os.path.join(config_dir, filename)
+            try:
+                configs[filename] = ConfigValidator.load(path)
+            except (OSError, ValueError, yaml.YAMLError) as e:
+                errors.append(f"{filename}: {e}")
+        if errors:
+            return errors
+
+        agents, tasks = configs["agents.yaml"], configs["tasks.yaml"]
+        errors += ConfigValidator.check_agents(agents, inputs)
+        errors += ConfigValidator.check_tasks(tasks, agents, inputs)
+        models_path = os.path.join(config_dir, "models.yaml")
+        if os.path.exists(models_path):
+            try:
+                errors += ConfigValidator.check_models(ConfigValidator.load(models_path), agents, tasks)
+            except (OSError, ValueError, yaml.YAMLError) as e:
+                errors.append(f"models.yaml: {e}")
+        if crew_module and os.path.exists(crew_module):
+            errors += ConfigValidator.check_crew(agents, tasks, crew_module)
+        return errors
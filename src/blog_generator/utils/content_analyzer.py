@@ -1,45 +1,329 @@
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+import hashlib
 import re
+import threading
+import time
+
+from .markdown_ast import MarkdownDocument
+
+# Limits of bounded extraction: open-ended spans match at most MAX_SPAN
+# characters (class bodies MAX_BODY_SPAN) and a document gets TIME_BUDGET seconds.
+MAX_SPAN = 500
+MAX_BODY_SPAN = 20000
+TIME_BUDGET = 2.0
+
+# Extraction patterns, compiled once. Each one is applied with an anchored
+# `match` at the positions found by _TRIGGER_PATTERN instead of being searched
+# over the whole document.
+_COMPONENT_PATTERN = re.compile(r'(?:component|service|module|system)\s+["\']([^"\']+)["\'].*?(?:using|with)\s+([^\n.]+)', re.IGNORECASE)
+_RELATION_PATTERN = re.compile(r'([A-Za-z_]+)\s+(?:calls|connects to|uses|interacts with)\s+([A-Za-z_]+)(?:\s+via\s+([^\n.]+))?', re.IGNORECASE)
+_STEP_PATTERN = re.compile(r'(?:step|stage|phase)\s*\d*:?\s*([^\n.]+)', re.IGNORECASE)
+_CONDITION_PATTERN = re.compile(r'if\s+([^\n,]+)(?:\s*,\s*then\s+([^\n.]+))?', re.IGNORECASE)
+_STATE_PATTERN = re.compile(r'(?:state|status):\s*([^\n.]+)(?:\s*contains\s*([^\n.]+))?', re.IGNORECASE)
+_TRANSITION_PATTERN = re.compile(r'(?:when|if)\s+([^\n,]+)\s*,?\s*(?:then)?\s+(?:transition|move|go)\s+(?:from\s+([^\n]+)\s+)?to\s+([^\n.]+)', re.IGNORECASE)
+_CLASS_PATTERN = re.compile(r'class\s+([A-Za-z_][A-Za-z0-9_]*)\s*(?:\(([^)]+)\))?\s*:([^}]+)')
+_ATTR_PATTERN = re.compile(r'(?:self\.)?([A-Za-z_][A-Za-z0-9_]*)\s*(?::\s*([A-Za-z_][A-Za-z0-9_]*))?\s*=')
+_METHOD_PATTERN = re.compile(r'def\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(([^)]*)\)\s*(?:->\s*([A-Za-z_][A-Za-z0-9_]*))?\s*:')
+
+# Every extraction starts with one of these keywords (relations start with the
+# word before their verb), so a single zero-width sweep finds all candidates.
+# The leading character class lets the regex engine skip other positions quickly.
+_TRIGGER_PATTERN = re.compile(
+    r'(?=[csmupiw])'
+    r'(?=(?P<component>component|service|module|system)'
+    r'|(?P<relation>calls|connects to|uses|interacts with)'
+    r'|(?P<step>step|stage|phase)'
+    r'|(?P<condition>if)'
+    r'|(?P<state>state|status)'
+    r'|(?P<transition>when)'
+    r'|(?P<cls>class))',
+    re.IGNORECASE
+)
+
+# Which extractors each trigger group feeds, and the pattern of each extractor
+_TRIGGER_EXTRACTORS = {
+    'component': ('component',),
+    'relation': ('relation',),
+    'step': ('step',),
+    'condition': ('condition', 'transition'),
+    'state': ('state',),
+    'transition': ('transition',),
+    'cls': ('class',),
+}
+_EXTRACTOR_PATTERNS = {
+    'component': _COMPONENT_PATTERN,
+    'relation': _RELATION_PATTERN,
+    'step': _STEP_PATTERN,
+    'condition': _CONDITION_PATTERN,
+    'state': _STATE_PATTERN,
+    'transition': _TRANSITION_PATTERN,
+    'class': _CLASS_PATTERN,
+}
+
+
+
+def _cap_spans(pattern: str) -> str:
+    """Bound the open-ended `[^...]+` and `.*?` spans of pattern."""
+    def cap(match: re.Match) -> str:
+        limit = MAX_BODY_SPAN if match.group(1) == '[^}]' else MAX_SPAN
+        return f"{match.group(1)}{{1,{limit}}}"
+
+    pattern = re.sub(r'(\[\^[^\]]*\])\+', cap, pattern)
+    return pattern.replace('.*?', f'.{{0,{MAX_SPAN}}}?')
+
+
+_BOUNDED_EXTRACTOR_PATTERNS = {
+    name: re.compile(_cap_spans(pattern.pattern), pattern.flags)
+    for name, pattern in _EXTRACTOR_PATTERNS.items()
+}
+
+# Characters matched by [A-Za-z_] under re.IGNORECASE, including the four
+# non-ASCII letters that case-fold onto ASCII ones
+_WORD_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_İıſK')
+
+
+def _relation_start(content: str, verb_pos: int, floor: int) -> Optional[int]:
+    """Start of the word separated by whitespace from the relation verb at verb_pos.
+
+    Like `finditer`, the word may not start before floor (the end of the previous match).
+    """
+    word_end = verb_pos
+    while word_end > floor and content[word_end - 1].isspace():
+        word_end -= 1
+    if word_end == verb_pos:
+        return None
+
+    word_start = word_end
+    while word_start > floor and content[word_start - 1] in _WORD_CHARS:
+        word_start -= 1
+    if word_start == word_end:
+        return None
+    return word_start
+
+
+class ExtractionTimeout(Exception):
+    """Raised by a bounded scan that ran past its deadline."""
+
+    def __init__(self, extractor: str):
+        super().__init__(f"Diagram extraction ran out of time in the {extractor} extractor")
+        self.extractor = extractor
+
+
+class DiagramInfo(dict):
+    """Diagrams extracted from a document, plus what limited a bounded extraction.
+
+    `truncated` lists the extractors whose matches were cut at a span cap, and
+    `timed_out` names the extractor that was running when the time budget ran
+    out, in which case the diagrams are the comprehensive fallback.
+    With a section cache, `sections_reused` counts the sections whose scan
+    came from the cache.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.truncated: List[str] = []
+        self.timed_out: Optional[str] = None
+        self.sections_reused = 0
+
+    @property
+    def limited(self) -> bool:
+        return bool(self.truncated or self.timed_out)
+
+
+class SectionCache:
+    """Scan results of document sections, keyed by a hash of their text.
+
+    A document that shares sections with one analyzed earlier (such as a final
+    post and the draft it was edited from) only has its changed sections scanned.
+    """
+
+    MAX_ENTRIES = 512
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Dict[str, List[re.Match]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str, bounded: bool) -> bytes:
+        digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16)
+        digest.update(b'b' if bounded else b'u')
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[Dict[str, List[re.Match]]]:
+        with self._lock:
+            facts = self._entries.get(key)
+            if facts is not None:
+                self._entries.move_to_end(key)
+            return facts
+
+    def put(self, key: bytes, facts: Dict[str, List[re.Match]]) -> None:
+        with self._lock:
+            self._entries[key] = facts
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
 
 class ContentAnalyzer:
     """Analyzes content to extract information for diagram generation."""
 
     @staticmethod
-    def extract_diagram_info(content: str) -> Dict:
-        """Extract information from content to generate appropriate diagrams."""
-        diagrams = {}
-        
-        # Extract architecture/component information
-        if architecture_data := ContentAnalyzer._extract_architecture_info(content):
-            diagrams['architecture'] = {
-                'type': 'component',
-                'data': architecture_data
-            }
-        
-        # Extract workflow/process information
-        if workflow_data := ContentAnalyzer._extract_workflow_info(content):
-            diagrams['workflow'] = {
-                'type': 'flowchart',
-                'data': workflow_data
-            }
-        
-        # Extract state machine information
-        if state_data := ContentAnalyzer._extract_state_info(content):
-            diagrams['state_machine'] = {
-                'type': 'state',
-                'data': state_data
-            }
-        
-        # Extract class structure information
-        if class_data := ContentAnalyzer._extract_class_info(content):
-            diagrams['class'] = {
-                'type': 'class',
-                'data': class_data
-            }
+    def scan(content: str, bounded: bool = False, deadline: Optional[float] = None,
+             code_spans: Optional[List[Tuple[int, int]]] = None) -> Dict[str, List[re.Match]]:
+        """Collect the matches of every extractor in a single sweep over content.
+
+        Returns the same matches, in the same order, as running `finditer` of
+        each extraction pattern over the whole document. In bounded mode the
+        patterns' open-ended spans are capped. When `deadline` (a
+        `time.perf_counter()` value) passes, ExtractionTimeout is raised.
+        With `code_spans`, classes are only looked for inside those ranges
+        and their bodies end with the range.
+        """
+        patterns = _BOUNDED_EXTRACTOR_PATTERNS if bounded else _EXTRACTOR_PATTERNS
+        facts = {name: [] for name in patterns}
+        last_end = dict.fromkeys(patterns, 0)
+        span_index = 0
+
+        for trigger in _TRIGGER_PATTERN.finditer(content):
+            pos = trigger.start()
+            for name in _TRIGGER_EXTRACTORS[trigger.lastgroup]:
+                if deadline is not None and time.perf_counter() > deadline:
+                    raise ExtractionTimeout(name)
+
+                if name == 'relation':
+                    start = _relation_start(content, pos, last_end[name])
+                    if start is None:
+                        continue
+                elif pos < last_end[name]:
+                    continue
+                else:
+                    start = pos
+
+                endpos = len(content)
+                if name == 'class' and code_spans is not None:
+                    while span_index < len(code_spans) and code_spans[span_index][1] <= pos:
+                        span_index += 1
+                    if span_index == len(code_spans) or code_spans[span_index][0] > pos:
+                        continue
+                    endpos = code_spans[span_index][1]
+
+                if match := patterns[name].match(content, start, endpos):
+                    facts[name].append(match)
+                    last_end[name] = match.end()
+
+        return facts
+
+    @staticmethod
+    def scan_sections(doc: MarkdownDocument, cache: SectionCache, bounded: bool = False,
+                      deadline: Optional[float] = None) -> Tuple[Dict[str, List[re.Match]], int]:
+        """Scan a parsed document section by section, reusing cached section scans.
+
+        Matches do not cross headings, so the result can differ from `scan` of
+        the whole text where a match used to run into the next section.
+        Returns the merged matches and the number of sections taken from the cache.
+        """
+        patterns = _BOUNDED_EXTRACTOR_PATTERNS if bounded else _EXTRACTOR_PATTERNS
+        facts = {name: [] for name in patterns}
+        code_spans = doc.code_spans
+        reused = 0
+
+        for section in doc.sections:
+            text = doc.section_text(section)
+            key = SectionCache.key(text, bounded)
+            section_facts = cache.get(key)
+            if section_facts is None:
+                # Headings are never inside code blocks, so every block lies within one section
+                spans = [(start - section.start, end - section.start)
+                         for start, end in code_spans if section.start <= start < section.end]
+                section_facts = ContentAnalyzer.scan(text, bounded=bounded, deadline=deadline, code_spans=spans)
+                cache.put(key, section_facts)
+            else:
+                reused += 1
+            for name, matches in section_facts.items():
+                facts[name].extend(matches)
+
+        return facts, reused
+
+    @staticmethod
+    def _truncated_extractors(facts: Dict[str, List[re.Match]]) -> List[str]:
+        """Names of the extractors with a match whose span filled its cap."""
+        def filled(name: str, match: re.Match) -> bool:
+            for index, group in enumerate(match.groups(), 1):
+                limit = MAX_BODY_SPAN if (name, index) == ('class', 3) else MAX_SPAN
+                if group is not None and len(group) >= limit:
+                    return True
+            return False
+
+        return [name for name, matches in facts.items()
+                if any(filled(name, match) for match in matches)]
+
+    @staticmethod
+    def extract_diagram_info(content: Union[str, MarkdownDocument], bounded: bool = False,
+                             time_budget: Optional[float] = TIME_BUDGET,
+                             section_cache: Optional[SectionCache] = None) -> DiagramInfo:
+        """Extract information from content to generate appropriate diagrams.
+
+        Content may be raw text or a parsed MarkdownDocument, in which case
+        class structures are only taken from its code blocks, and with a
+        `section_cache` it is scanned section by section (see scan_sections).
+        With `bounded`, span lengths are capped and extraction gives up after
+        `time_budget` seconds, returning the comprehensive diagrams instead.
+        """
+        doc = None
+        code_spans = None
+        if isinstance(content, MarkdownDocument):
+            doc, content, code_spans = content, content.text, content.code_spans
+
+        diagrams = DiagramInfo()
+        deadline = None
+        if bounded and time_budget is not None:
+            deadline = time.perf_counter() + time_budget
+
+        try:
+            if doc is not None and section_cache is not None:
+                facts, diagrams.sections_reused = ContentAnalyzer.scan_sections(
+                    doc, section_cache, bounded=bounded, deadline=deadline)
+            else:
+                facts = ContentAnalyzer.scan(content, bounded=bounded, deadline=deadline, code_spans=code_spans)
+            if bounded:
+                diagrams.truncated = ContentAnalyzer._truncated_extractors(facts)
+
+            # Extract architecture/component information
+            if architecture_data := ContentAnalyzer._build_architecture_info(facts):
+                diagrams['architecture'] = {
+                    'type': 'component',
+                    'data': architecture_data
+                }
+            
+            # Extract workflow/process information
+            if workflow_data := ContentAnalyzer._build_workflow_info(facts):
+                diagrams['workflow'] = {
+                    'type': 'flowchart',
+                    'data': workflow_data
+                }
+            
+            # Extract state machine information
+            if state_data := ContentAnalyzer._build_state_info(facts):
+                diagrams['state_machine'] = {
+                    'type': 'state',
+                    'data': state_data
+                }
+            
+            # Extract class structure information
+            if class_data := ContentAnalyzer._build_class_info(facts, deadline):
+                diagrams['class'] = {
+                    'type': 'class',
+                    'data': class_data
+                }
+        except ExtractionTimeout as e:
+            # Partial results are dropped so the fallback below replaces them entirely
+            diagrams.clear()
+            diagrams.timed_out = e.extractor
         
         # Generate comprehensive diagrams if none were extracted
         if not diagrams:
-            diagrams = ContentAnalyzer._generate_comprehensive_diagrams(content)
+            diagrams.update(ContentAnalyzer._generate_comprehensive_diagrams(content))
         
         return diagrams
 
@@ -211,14 +495,13 @@ class ContentAnalyzer:
         return diagrams
 
     @staticmethod
-    def _extract_architecture_info(content: str) -> Optional[Dict]:
-        """Extract system architecture information from content."""
+    def _build_architecture_info(facts: Dict[str, List[re.Match]]) -> Optional[Dict]:
+        """Build system architecture information from the scanned matches."""
         components = {}
         relationships = []
         
-        # Look for component/service descriptions
-        component_pattern = r'(?:component|service|module|system)\s+["\']([^"\']+)["\'].*?(?:using|with)\s+([^\n.]+)'
-        for match in re.finditer(component_pattern, content, re.IGNORECASE):
+        # Component/service descriptions
+        for match in facts['component']:
             name, tech = match.groups()
             component_id = name.lower().replace(' ', '_')
             components[component_id] = {
@@ -228,9 +511,8 @@ class ContentAnalyzer:
                 'desc': f"{name} using {tech.strip()}"
             }
         
-        # Look for relationships/interactions
-        relation_pattern = r'([A-Za-z_]+)\s+(?:calls|connects to|uses|interacts with)\s+([A-Za-z_]+)(?:\s+via\s+([^\n.]+))?'
-        for match in re.finditer(relation_pattern, content, re.IGNORECASE):
+        # Relationships/interactions
+        for match in facts['relation']:
             from_comp, to_comp, tech = match.groups()
             relationships.append({
                 'from': from_comp.lower(),
@@ -248,17 +530,14 @@ class ContentAnalyzer:
         return None
 
     @staticmethod
-    def _extract_workflow_info(content: str) -> Optional[Dict]:
-        """Extract workflow/process information from content."""
+    def _build_workflow_info(facts: Dict[str, List[re.Match]]) -> Optional[Dict]:
+        """Build workflow/process information from the scanned matches."""
         nodes = {}
         connections = []
         
-        # Look for steps/stages in processes
-        step_pattern = r'(?:step|stage|phase)\s*\d*:?\s*([^\n.]+)'
-        steps = re.finditer(step_pattern, content, re.IGNORECASE)
+        # Steps/stages in processes
         prev_step_id = None
-        
-        for i, match in enumerate(steps):
+        for i, match in enumerate(facts['step']):
             step_desc = match.group(1).strip()
             step_id = f"step_{i}"
             nodes[step_id] = {
@@ -273,9 +552,8 @@ class ContentAnalyzer:
                 })
             prev_step_id = step_id
         
-        # Look for conditions/decisions
-        condition_pattern = r'if\s+([^\n,]+)(?:\s*,\s*then\s+([^\n.]+))?'
-        for match in re.finditer(condition_pattern, content, re.IGNORECASE):
+        # Conditions/decisions
+        for match in facts['condition']:
             condition, action = match.groups()
             cond_id = f"cond_{len(nodes)}"
             nodes[cond_id] = {
@@ -302,14 +580,13 @@ class ContentAnalyzer:
         return None
 
     @staticmethod
-    def _extract_state_info(content: str) -> Optional[Dict]:
-        """Extract state machine information from content."""
+    def _build_state_info(facts: Dict[str, List[re.Match]]) -> Optional[Dict]:
+        """Build state machine information from the scanned matches."""
         states = []
         transitions = []
         
-        # Look for states and their descriptions
-        state_pattern = r'(?:state|status):\s*([^\n.]+)(?:\s*contains\s*([^\n.]+))?'
-        for match in re.finditer(state_pattern, content, re.IGNORECASE):
+        # States and their descriptions
+        for match in facts['state']:
             state_name, substates = match.groups()
             state = {'name': state_name.strip()}
             
@@ -319,9 +596,8 @@ class ContentAnalyzer:
             
             states.append(state)
         
-        # Look for transitions between states
-        transition_pattern = r'(?:when|if)\s+([^\n,]+)\s*,?\s*(?:then)?\s+(?:transition|move|go)\s+(?:from\s+([^\n]+)\s+)?to\s+([^\n.]+)'
-        for match in re.finditer(transition_pattern, content, re.IGNORECASE):
+        # Transitions between states
+        for match in facts['transition']:
             trigger, from_state, to_state = match.groups()
             if from_state:
                 transitions.append({
@@ -338,30 +614,32 @@ class ContentAnalyzer:
         return None
 
     @staticmethod
-    def _extract_class_info(content: str) -> Optional[Dict]:
-        """Extract class structure information from content."""
+    def _build_class_info(facts: Dict[str, List[re.Match]],
+                          deadline: Optional[float] = None) -> Optional[Dict]:
+        """Build class structure information from the scanned matches."""
         classes = {}
         
-        # Look for class definitions and their properties
-        class_pattern = r'class\s+([A-Za-z_][A-Za-z0-9_]*)\s*(?:\(([^)]+)\))?\s*:([^}]+)'
-        for match in re.finditer(class_pattern, content):
-            class_name, parent, body = match.groups()
+        for match in facts['class']:
+            if deadline is not None and time.perf_counter() > deadline:
+                raise ExtractionTimeout('class')
+            class_name = match.group(1)
+            # The text that was scanned: the whole document or one of its sections
+            content = match.string
+            body_start, body_end = match.span(3)
             class_data = {
                 'attributes': [],
                 'methods': []
             }
             
-            # Extract attributes
-            attr_pattern = r'(?:self\.)?([A-Za-z_][A-Za-z0-9_]*)\s*(?::\s*([A-Za-z_][A-Za-z0-9_]*))?\s*='
-            for attr_match in re.finditer(attr_pattern, body):
+            # Attributes, searched within the class body without slicing it out
+            for attr_match in _ATTR_PATTERN.finditer(content, body_start, body_end):
                 attr_name, attr_type = attr_match.groups()
                 class_data['attributes'].append({
                     'name': f"{attr_name}: {attr_type if attr_type else 'Any'}"
                 })
             
-            # Extract methods
-            method_pattern = r'def\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(([^)]*)\)\s*(?:->\s*([A-Za-z_][A-Za-z0-9_]*))?\s*:'
-            for method_match in re.finditer(method_pattern, body):
+            # Methods
+            for method_match in _METHOD_PATTERN.finditer(content, body_start, body_end):
                 method_name, params, return_type = method_match.groups()
                 class_data['methods'].append({
                     'name': method_name,
@@ -376,4 +654,4 @@ class ContentAnalyzer:
                 'classes': classes,
                 'relationships': []  # Could be enhanced to detect relationships
             }
-        return None 
\ No newline at end of file
+        return None 
@@ -0,0 +1,174 @@
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from .markdown_ast import MarkdownDocument
+from .tokens import estimate_tokens
+
+# crewAI joins the outputs of upstream tasks with this separator
+OUTPUT_SEPARATOR = "\n\n----------\n\n"
+
+# Sentence boundaries in prose: end punctuation followed by the start of a new sentence
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9`*\[("])')
+_HAS_NUMBER = re.compile(r'\d')
+
+
+@dataclass
+class CompactedContext:
+    """The context a task is run with, and its size before and after compaction."""
+    text: str
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+class ContextCompactor:
+    """Shrinks the upstream task outputs passed to a task down to a token budget.
+
+    The most recent upstream output is kept verbatim when it fits in
+    LATEST_SHARE of the budget; older outputs (and the latest, when it does
+    not fit) are replaced by a structured summary: their outline, the key
+    facts of each section ranked by how informative they are, and a one-line
+    reference to every code block instead of its content.
+    """
+
+    # Part of the budget the most recent upstream output may take verbatim
+    LATEST_SHARE = 0.75
+
+    @staticmethod
+    def compact(context: str, budget: int) -> CompactedContext:
+        """Compact context to at most about `budget` estimated tokens."""
+        before = estimate_tokens(context)
+        if before <= budget:
+            return CompactedContext(context, before, before)
+
+        parts = context.split(OUTPUT_SEPARATOR)
+        latest = parts[-1]
+        if len(parts) == 1:
+            compacted = [ContextCompactor.summarize(latest, budget, 1, 1)]
+        else:
+            latest_tokens = estimate_tokens(latest)
+            if latest_tokens <= budget * ContextCompactor.LATEST_SHARE:
+                compacted_latest = latest
+            else:
+                latest_tokens = int(budget * ContextCompactor.LATEST_SHARE)
+                compacted_latest = ContextCompactor.summarize(latest, latest_tokens, len(parts), len(parts))
+            share = (budget - latest_tokens) // (len(parts) - 1)
+            compacted = [ContextCompactor.summarize(part, share, number, len(parts))
+                         for number, part in enumerate(parts[:-1], 1)]
+            compacted.append(compacted_latest)
+
+        text = OUTPUT_SEPARATOR.join(compacted)
+        return CompactedContext(text, before, estimate_tokens(text))
+
+    @staticmethod
+    def summarize(text: str, budget: int, number: int = 1, total: int = 1) -> str:
+        """Outline, key facts and code block references of one output, within budget."""
+        doc = MarkdownDocument.parse(text)
+        header = f"[Summary of upstream output {number} of {total}, compacted from {estimate_tokens(text)} tokens]"
+
+        # The outline and code references take at most half of the budget, the key facts the rest
+        headings = [heading for heading in doc.headings if heading.text]
+        code_refs = ContextCompactor._code_references(doc)
+        max_level = max((heading.level for heading in headings), default=0)
+        while True:
+            outline = [f"{'  ' * (heading.level - 1)}- {heading.text}"
+                       for heading in headings if heading.level <= max_level]
+            structure = estimate_tokens('\n'.join(outline + code_refs))
+            if structure <= budget // 2 or max_level <= 1:
+                break
+            max_level -= 1
+        while code_refs and structure > budget // 2:
+            code_refs.pop()
+            structure = estimate_tokens('\n'.join(outline + code_refs))
+
+        facts = ContextCompactor._select_facts(doc, budget - structure - estimate_tokens(header))
+        lines = [header]
+        if outline:
+            lines += ["Outline:"] + outline
+        if facts:
+            lines += ["Key facts:"] + facts
+        if code_refs:
+            lines += ["Code blocks (by reference):"] + code_refs
+        # A single top-level outline can still exceed a very small budget
+        while len(lines) > 1 and estimate_tokens('\n'.join(lines)) > budget:
+            lines.pop()
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _code_references(doc: MarkdownDocument) -> List[str]:
+        refs = []
+        headings = doc.headings
+        for number, block in enumerate(doc.code_blocks, 1):
+            body = doc.text[block.start:block.end].strip('\n')
+            first_line = next((line.strip() for line in body.split('\n') if line.strip()), "")
+            section = next((h.text for h in reversed(headings) if h.start < block.start), None)
+            where = f' in "{section}"' if section else ""
+            refs.append(f"- [code {number}] {block.info or 'text'}, {body.count(chr(10)) + 1} lines{where}: "
+                        f"`{first_line[:80]}`")
+        return refs
+
+    @staticmethod
+    def _candidates(doc: MarkdownDocument) -> List[Tuple[int, int, str]]:
+        """(priority, position, fact) for every list item and prose sentence outside code blocks.
+
+        The opening sentence of a section and anything with a number in it
+        (metrics, versions, limits) rank highest, then list items, then prose.
+        """
+        candidates = []
+        code_spans = doc.code_spans
+        items = {item.line: item for item in doc.list_items}
+        position = 0
+        for section in doc.sections:
+            first_sentence = True
+            line_number = doc.text.count('\n', 0, section.start)
+            paragraph: List[str] = []
+
+            def flush():
+                nonlocal first_sentence, position
+                for sentence in _SENTENCE_END.split(' '.join(paragraph)):
+                    sentence = sentence.strip()
+                    if len(sentence) < 20:
+                        continue
+                    priority = 2 if first_sentence or _HAS_NUMBER.search(sentence) else 0
+                    candidates.append((priority, position, sentence))
+                    first_sentence = False
+                    position += 1
+                paragraph.clear()
+
+            offset = section.start
+            for line in doc.section_text(section).split('\n'):
+                in_code = any(start <= offset < end for start, end in code_spans)
+                stripped = line.strip()
+                if line_number in items and not in_code:
+                    flush()
+                    item_text = items[line_number].text.strip()
+                    if item_text:
+                        priority = 2 if _HAS_NUMBER.search(item_text) else 1
+                        candidates.append((priority, position, item_text))
+                        position += 1
+                elif (in_code or not stripped or stripped.startswith(('#', '```', '~~~', '|', '>'))
+                      or (section.heading and line_number == section.heading.line)):
+                    flush()
+                else:
+                    paragraph.append(stripped)
+                offset += len(line) + 1
+                line_number += 1
+            flush()
+        return candidates
+
+    @staticmethod
+    def _select_facts(doc: MarkdownDocument, budget: int) -> List[str]:
+        """The highest ranked facts that fit in budget, in document order."""
+        chosen = []
+        used = 0
+        for priority, position, fact in sorted(ContextCompactor._candidates(doc), key=lambda c: (-c[0], c[1])):
+            cost = estimate_tokens(fact) + 1
+            if used + cost > budget:
+                continue
+            chosen.append((position, fact))
+            used += cost
+        return [f"- {fact}" for _, fact in sorted(chosen)]
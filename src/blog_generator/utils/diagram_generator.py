@@ -1,11 +1,77 @@
-from typing import Dict, List
+import hashlib
+import marshal
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
 
 class DiagramGenerator:
-    """Utility class for generating technical diagrams using Mermaid syntax."""
+    """Utility class for generating technical diagrams using Mermaid syntax.
+
+    Rendered diagrams are memoized by a structural hash of their type and data,
+    so identical diagrams (such as the default ones) are only rendered once.
+    Diagrams with more than MEMO_MAX_ITEMS nodes and edges are rendered
+    directly, since hashing them costs about as much as rendering.
+    """
+
+    # Number of rendered diagrams kept, least recently used are dropped first
+    CACHE_SIZE = 256
+    MEMO_MAX_ITEMS = 500
+
+    _cache: "OrderedDict[bytes, str]" = OrderedDict()
+    _cache_lock = threading.Lock()
 
     @staticmethod
     def generate_diagram(diagram_type: str, diagram_data: Dict) -> str:
         """Generate technical diagrams based on the type and data provided."""
+        if sum(len(items) for items in diagram_data.values()) > DiagramGenerator.MEMO_MAX_ITEMS:
+            return DiagramGenerator._render(diagram_type, diagram_data)
+
+        key = DiagramGenerator._structural_hash(diagram_type, diagram_data)
+        if key is None:
+            return DiagramGenerator._render(diagram_type, diagram_data)
+
+        with DiagramGenerator._cache_lock:
+            if key in DiagramGenerator._cache:
+                DiagramGenerator._cache.move_to_end(key)
+                return DiagramGenerator._cache[key]
+
+        diagram = DiagramGenerator._render(diagram_type, diagram_data)
+
+        with DiagramGenerator._cache_lock:
+            DiagramGenerator._cache[key] = diagram
+            while len(DiagramGenerator._cache) > DiagramGenerator.CACHE_SIZE:
+                DiagramGenerator._cache.popitem(last=False)
+        return diagram
+
+    @staticmethod
+    def generate_diagrams(diagrams: Dict[str, Dict]) -> Dict[str, str]:
+        """Render a batch of diagrams, as returned by ContentAnalyzer.extract_diagram_info.
+
+        Returns the Mermaid text of each diagram under the same key.
+        """
+        return {
+            name: DiagramGenerator.generate_diagram(diagram['type'], diagram['data'])
+            for name, diagram in diagrams.items()
+        }
+
+    @staticmethod
+    def clear_cache() -> None:
+        with DiagramGenerator._cache_lock:
+            DiagramGenerator._cache.clear()
+
+    @staticmethod
+    def _structural_hash(diagram_type: str, diagram_data: Dict) -> Optional[bytes]:
+        """Hash of the diagram's type and data, or None if the data holds non-builtin values."""
+        # marshal is the cheapest exact serialization of plain dicts and lists and,
+        # unlike a sorted dump, keeps key order, which determines the rendered lines
+        try:
+            encoded = marshal.dumps((diagram_type, diagram_data))
+        except ValueError:
+            return None
+        return hashlib.blake2b(encoded, digest_size=16).digest()
+
+    @staticmethod
+    def _render(diagram_type: str, diagram_data: Dict) -> str:
         if diagram_type == "flowchart":
             return DiagramGenerator._generate_flowchart(diagram_data)
         elif diagram_type == "class":
@@ -20,45 +86,41 @@ class DiagramGenerator:
     @staticmethod
     def _generate_flowchart(data: Dict) -> str:
         """Generate a flowchart diagram using Mermaid."""
-        diagram = """```mermaid
-flowchart TD
-"""
+        lines: List[str] = ["```mermaid\nflowchart TD\n"]
         # Add nodes
         for node_id, node_data in data.get('nodes', {}).items():
             shape = node_data.get('shape', '[]')  # Default to rectangle
             if shape == 'circle':
-                diagram += f'    {node_id}(("{node_data["label"]}"))\n'
+                lines.append(f'    {node_id}(("{node_data["label"]}"))\n')
             elif shape == 'diamond':
-                diagram += f'    {node_id}{{{node_data["label"]}}}\n'
+                lines.append(f'    {node_id}{{{node_data["label"]}}}\n')
             else:
-                diagram += f'    {node_id}["{node_data["label"]}"]\n'
+                lines.append(f'    {node_id}["{node_data["label"]}"]\n')
 
         # Add connections
         for conn in data.get('connections', []):
             style = conn.get('style', '-->')  # Default to normal arrow
             label = conn.get('label', '')
             if label:
-                diagram += f'    {conn["from"]} {style}|{label}| {conn["to"]}\n'
+                lines.append(f'    {conn["from"]} {style}|{label}| {conn["to"]}\n')
             else:
-                diagram += f'    {conn["from"]} {style} {conn["to"]}\n'
+                lines.append(f'    {conn["from"]} {style} {conn["to"]}\n')
 
-        diagram += "```"
-        return diagram
+        lines.append("```")
+        return ''.join(lines)
 
     @staticmethod
     def _generate_class_diagram(data: Dict) -> str:
         """Generate a class diagram using Mermaid."""
-        diagram = """```mermaid
-classDiagram
-"""
+        lines: List[str] = ["```mermaid\nclassDiagram\n"]
         # Add classes
         for class_name, class_data in data.get('classes', {}).items():
-            diagram += f'    class {class_name} {{\n'
+            lines.append(f'    class {class_name} {{\n')
             
             # Add attributes
             for attr in class_data.get('attributes', []):
                 visibility = attr.get('visibility', '+')  # Default to public
-                diagram += f'        {visibility}{attr["name"]}\n'
+                lines.append(f'        {visibility}{attr["name"]}\n')
             
             # Add methods
             for method in class_data.get('methods', []):
@@ -66,63 +128,59 @@ classDiagram
                 params = ', '.join(method.get('params', []))
                 return_type = method.get('return_type', '')
                 if return_type:
-                    diagram += f'        {visibility}{method["name"]}({params}) {return_type}\n'
+                    lines.append(f'        {visibility}{method["name"]}({params}) {return_type}\n')
                 else:
-                    diagram += f'        {visibility}{method["name"]}({params})\n'
+                    lines.append(f'        {visibility}{method["name"]}({params})\n')
             
-            diagram += '    }\n'
+            lines.append('    }\n')
 
         # Add relationships
         for rel in data.get('relationships', []):
-            diagram += f'    {rel["from"]} {rel["type"]} {rel["to"]}\n'
+            lines.append(f'    {rel["from"]} {rel["type"]} {rel["to"]}\n')
 
-        diagram += "```"
-        return diagram
+        lines.append("```")
+        return ''.join(lines)
 
     @staticmethod
     def _generate_component_diagram(data: Dict) -> str:
         """Generate a component diagram using Mermaid."""
-        diagram = """```mermaid
-C4Component
-"""
+        lines: List[str] = ["```mermaid\nC4Component\n"]
         # Add containers
         for container in data.get('containers', []):
-            diagram += f'    Container({container["id"]}, "{container["name"]}", "{container["tech"]}", "{container["desc"]}")\n'
+            lines.append(f'    Container({container["id"]}, "{container["name"]}", "{container["tech"]}", "{container["desc"]}")\n')
 
         # Add components
         for component in data.get('components', []):
-            diagram += f'    Component({component["id"]}, "{component["name"]}", "{component["tech"]}", "{component["desc"]}")\n'
+            lines.append(f'    Component({component["id"]}, "{component["name"]}", "{component["tech"]}", "{component["desc"]}")\n')
 
         # Add relationships
         for rel in data.get('relationships', []):
-            diagram += f'    Rel({rel["from"]}, {rel["to"]}, "{rel["label"]}", "{rel["tech"]}")\n'
+            lines.append(f'    Rel({rel["from"]}, {rel["to"]}, "{rel["label"]}", "{rel["tech"]}")\n')
 
-        diagram += "```"
-        return diagram
+        lines.append("```")
+        return ''.join(lines)
 
     @staticmethod
     def _generate_state_diagram(data: Dict) -> str:
         """Generate a state diagram using Mermaid."""
-        diagram = """```mermaid
-stateDiagram-v2
-"""
+        lines: List[str] = ["```mermaid\nstateDiagram-v2\n"]
         # Add states
         for state in data.get('states', []):
             if state.get('composite', False):
-                diagram += f'    state {state["name"]} {{\n'
+                lines.append(f'    state {state["name"]} {{\n')
                 for sub_state in state.get('substates', []):
-                    diagram += f'        {sub_state}\n'
-                diagram += '    }\n'
+                    lines.append(f'        {sub_state}\n')
+                lines.append('    }\n')
             else:
-                diagram += f'    {state["name"]}\n'
+                lines.append(f'    {state["name"]}\n')
 
         # Add transitions
         for trans in data.get('transitions', []):
             label = trans.get('label', '')
             if label:
-                diagram += f'    {trans["from"]} --> {trans["to"]}: {label}\n'
+                lines.append(f'    {trans["from"]} --> {trans["to"]}: {label}\n')
             else:
-                diagram += f'    {trans["from"]} --> {trans["to"]}\n'
+                lines.append(f'    {trans["from"]} --> {trans["to"]}\n')
 
-        diagram += "```"
-        return diagram 
\ No newline at end of file
+        lines.append("```")
+        return ''.join(lines)
@@ -0,0 +1,101 @@
+import glob
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from crewai.llms.base_llm import BaseLLM
+
+from .tokens import estimate_tokens
+
+# Used when there are no sample posts to draw canned answers from
+DEFAULT_ANSWER = """# Sample Post
+
+This is a canned answer from the offline fake LLM.
+
+## Overview
+
+Step 1: Install the package. Step 2: Configure the service.
+"""
+
+
+class FakeLLM(BaseLLM):
+    """Offline, deterministic stand-in for a model provider.
+
+    Answers are canned markdown posts (by default the samples in `output/`),
+    picked by a hash of the prompt so the same prompt always gets the same
+    answer. Each call sleeps for a latency drawn from the configured
+    distribution plus the time needed to "generate" the answer at
+    `tokens_per_second`, so runs behave like a real model without network access.
+    """
+
+    DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, distribution: str = "fixed",
+                 tokens_per_second: Optional[float] = None, samples_dir: Optional[str] = None,
+                 samples: Optional[List[str]] = None, seed: int = 0, model: str = "fake/offline"):
+        super().__init__(model=model, temperature=0.0)
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.latency = latency
+        self.jitter = jitter
+        self.distribution = distribution
+        self.tokens_per_second = tokens_per_second
+        self.seed = seed
+        self.samples = samples if samples is not None else self.load_samples(samples_dir)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def load_samples(samples_dir: Optional[str] = None) -> List[str]:
+        """Read the markdown posts in samples_dir (default `output/`), or a built-in answer."""
+        samples_dir = samples_dir or os.path.join(os.getcwd(), "output")
+        samples = []
+        for path in sorted(glob.glob(os.path.join(samples_dir, "*.md"))):
+            with open(path, "r", encoding="utf-8") as f:
+                samples.append(f.read())
+        return samples or [DEFAULT_ANSWER]
+
+    def _sample_latency(self, rng: random.Random) -> float:
+        if self.distribution == "uniform":
+            return max(0.0, rng.uniform(self.latency - self.jitter, self.latency + self.jitter))
+        if self.distribution == "lognormal" and self.latency > 0:
+            # latency is the median, jitter the sigma of the underlying normal
+            return rng.lognormvariate(0.0, self.jitter) * self.latency
+        return self.latency
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> str:
+        with self._lock:
+            self.calls += 1
+
+        prompt = json.dumps(messages, sort_keys=True, default=str)
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode("utf-8")).digest()
+        rng = random.Random(digest)
+        answer = self.samples[int.from_bytes(digest[:4], "big") % len(self.samples)]
+
+        delay = self._sample_latency(rng)
+        if self.tokens_per_second:
+            delay += estimate_tokens(answer) / self.tokens_per_second
+        if delay > 0:
+            time.sleep(delay)
+
+        return f"Thought: I now can give a great answer\nFinal Answer: {answer}"
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 128000
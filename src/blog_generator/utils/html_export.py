@@ -0,0 +1,221 @@
+import hashlib
+import html
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+import markdown
+
+from .output_index import OutputIndex
+from .output_writer import post_name, read_post
+
+# Extensions of the full UI (code highlighting) and of the simple UI
+DEFAULT_EXTENSIONS = ('fenced_code', 'tables', 'codehilite')
+BASIC_EXTENSIONS = ('fenced_code', 'tables')
+# Guessing the language of unlabeled code blocks ran every lexer over them and took most of the render time
+EXTENSION_CONFIGS = {'codehilite': {'guess_lang': False}}
+# Rendered documents kept in memory, by content hash
+CACHE_SIZE = 64
+
+CSS = """
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+            line-height: 1.6;
+            color: #333;
+        }
+        h1, h2, h3, h4, h5, h6 {
+            color: #2c3e50;
+            margin-top: 2rem;
+            margin-bottom: 1rem;
+        }
+        code {
+            background-color: #f8f9fa;
+            padding: 2px 4px;
+            border-radius: 3px;
+            font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
+        }
+        pre {
+            background-color: #f8f9fa;
+            padding: 15px;
+            border-radius: 5px;
+            overflow-x: auto;
+            border-left: 4px solid #667eea;
+        }
+        pre code {
+            background-color: transparent;
+            padding: 0;
+        }
+        blockquote {
+            border-left: 4px solid #667eea;
+            margin: 0;
+            padding-left: 1rem;
+            color: #666;
+        }
+        table {
+            border-collapse: collapse;
+            width: 100%;
+            margin: 1rem 0;
+        }
+        th, td {
+            border: 1px solid #ddd;
+            padding: 8px;
+            text-align: left;
+        }
+        th {
+            background-color: #f8f9fa;
+        }
+        .header {
+            text-align: center;
+            margin-bottom: 2rem;
+            padding-bottom: 1rem;
+            border-bottom: 2px solid #667eea;
+        }
+"""
+
+# The page around a rendered post, split once at import so rendering only concatenates
+_PAGE_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>"""
+_PAGE_STYLE = f"""</title>
+    <meta charset="utf-8">
+    <style>{CSS}    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>"""
+_PAGE_DATE = """</h1>
+        <p>Generated on """
+_PAGE_BODY = """</p>
+    </div>
+    """
+_PAGE_TAIL = """
+</body>
+</html>
+"""
+
+_converters = threading.local()
+_cache: "OrderedDict[Tuple[str, Tuple[str, ...]], str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _converter(extensions: Tuple[str, ...]) -> markdown.Markdown:
+    """This thread's Markdown instance for an extension set; building one loads every extension."""
+    instances = getattr(_converters, 'instances', None)
+    if instances is None:
+        instances = _converters.instances = {}
+    if extensions not in instances:
+        instances[extensions] = markdown.Markdown(
+            extensions=list(extensions),
+            extension_configs={name: config for name, config in EXTENSION_CONFIGS.items() if name in extensions},
+        )
+    return instances[extensions]
+
+
+def render_html(content: str, extensions: Iterable[str] = DEFAULT_EXTENSIONS) -> str:
+    """The HTML of a markdown document, cached by a hash of its content."""
+    extensions = tuple(extensions)
+    key = (hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest(), extensions)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    converter = _converter(extensions)
+    try:
+        body = converter.convert(content)
+    finally:
+        # Footnotes, abbreviations and the like are per document
+        converter.reset()
+
+    with _cache_lock:
+        _cache[key] = body
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return body
+
+
+def html_document(content: str, title: str = "Generated Blog Post", heading: str = "AI Generated Blog Post",
+                  generated: Optional[str] = None, extensions: Iterable[str] = DEFAULT_EXTENSIONS) -> str:
+    """A standalone HTML page with the rendered post and the inlined stylesheet."""
+    generated = generated or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return ''.join((_PAGE_HEAD, html.escape(title), _PAGE_STYLE, html.escape(heading), _PAGE_DATE,
+                    html.escape(generated), _PAGE_BODY, render_html(content, extensions), _PAGE_TAIL))
+
+
+def export_html(content: str, extensions: Iterable[str] = DEFAULT_EXTENSIONS) -> Optional[Tuple[str, str]]:
+    """(filename, HTML page) of a post for a download button, or None when there is nothing to export."""
+    if not content:
+        return None
+    try:
+        full_html = html_document(content, extensions=extensions)
+    except Exception:
+        return None
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return (f"blog_post_{timestamp}.html", full_html)
+
+
+def _write(path: str, content: str) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _export_page(job: Tuple[str, str, str, str]) -> str:
+    """Render one post to its page; runs in a worker process."""
+    source, target, topic, created = job
+    _write(target, html_document(read_post(source), title=topic, heading=topic, generated=created))
+    return target
+
+
+def export_site(output_dir: str, site_dir: str, workers: Optional[int] = None,
+                force: bool = False) -> Dict[str, int]:
+    """Export every post in output_dir to a static site: one page per post and an index page.
+
+    Posts are rendered by a pool of worker processes and written as they
+    finish, so memory stays flat however large the archive is. Pages newer
+    than their post are kept unless force is set, which makes re-exporting
+    an archive after a few new posts near instant.
+    """
+    index = OutputIndex(output_dir)
+    index.sync()
+    os.makedirs(site_dir, exist_ok=True)
+
+    jobs: List[Tuple[str, str, str, str]] = []
+    rows: List[str] = []
+    skipped = 0
+    for post in index.posts():
+        target = os.path.join(site_dir, f"{post_name(post.path)}.html")
+        rows.append(f'        <li><a href="{quote(os.path.basename(target))}">{html.escape(post.topic)}</a> '
+                    f'<small>{post.created_at}</small></li>\n')
+        if not force and os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(post.path):
+            skipped += 1
+            continue
+        jobs.append((post.path, target, post.topic, post.created_at))
+
+    rendered = 0
+    workers = workers or os.cpu_count() or 1
+    if len(jobs) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(_export_page, jobs, chunksize=max(1, len(jobs) // (4 * workers))):
+                rendered += 1
+    else:
+        for job in jobs:
+            _export_page(job)
+            rendered += 1
+
+    _write(os.path.join(site_dir, "index.html"), ''.join((
+        _PAGE_HEAD, "Blog posts", _PAGE_STYLE, "Blog posts", _PAGE_DATE,
+        datetime.now().strftime("%Y-%m-%d %H:%M:%S"), _PAGE_BODY, "<ul>\n", *rows, "    </ul>", _PAGE_TAIL,
+    )))
+    return {'posts': len(rows), 'rendered': rendered, 'skipped': skipped}
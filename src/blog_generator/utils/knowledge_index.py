@@ -0,0 +1,375 @@
+import hashlib
+import heapq
+import math
+import os
+import pickle
+import re
+import tempfile
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Files under the knowledge directory that are indexed
+TEXT_EXTENSIONS = ('.txt', '.md', '.markdown', '.rst')
+
+_TERM = re.compile(r'[a-z0-9][a-z0-9_+#.-]*[a-z0-9+#]|[a-z0-9]')
+# Runs of non-blank lines, and markdown headings, in the raw bytes of a file
+_PARAGRAPH = re.compile(rb'(?:[^\n]*[^\s\n][^\n]*(?:\n|\Z))+')
+_HEADING = re.compile(rb'[ \t]*#{1,6}[ \t]+([^\n]+?)[ \t#]*(?:\n|\Z)')
+_WORD = re.compile(rb'\S+')
+_STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her
+here hers him his how i if in into is it its itself just me more most my no nor not of off on once only or
+other our ours out over own same she should so some such than that the their them then there these they
+this those through to too under until up very was we were what when where which while who whom why will
+with would you your yours
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms of text without stopwords, as used for indexing and queries."""
+    return [term for term in _TERM.findall(text.lower()) if term not in _STOPWORDS]
+
+
+@dataclass
+class KnowledgeHit:
+    """A retrieved chunk: where it comes from, its text and its BM25 score."""
+    source: str
+    heading: str
+    text: str
+    score: float
+
+
+class KnowledgeIndex:
+    """Incremental BM25 index over the text files of the knowledge directory.
+
+    Files are split into chunks of about CHUNK_WORDS words along paragraph
+    boundaries, under the markdown heading they belong to. Each file gets a
+    segment, named after the hash of its content, with the byte spans of its
+    chunks and their postings; an update only re-chunks files whose mtime or
+    size changed and whose content hash differs, then merges the segments.
+    Chunk texts are not copied: hits are read back from the source files.
+
+    The merged postings hold precomputed BM25 weights, so a query only adds
+    up floats. Terms found in more than MAX_POSTINGS chunks keep only their
+    MAX_POSTINGS highest weighted postings, which bounds the cost of common
+    terms at the price of approximate scores for chunks outside them.
+
+    Since the weights depend on the number and average length of all
+    chunks, any change rebuilds the merged postings of the whole index.
+    update_in_background() does that off the caller's thread; searches keep
+    using the previous snapshot until the new one replaces it.
+    """
+
+    VERSION = 1
+    CHUNK_WORDS = 120
+    # BM25 parameters
+    K1 = 1.2
+    B = 0.75
+    # Postings kept per term
+    MAX_POSTINGS = 2000
+
+    _instances: Dict[Tuple[str, str], "KnowledgeIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, knowledge_dir: str, index_dir: str):
+        self.knowledge_dir = knowledge_dir
+        self.index_dir = index_dir
+        self.segments_dir = os.path.join(index_dir, "segments")
+        # Held by update(); _data_lock only guards the snapshot and the background updater
+        self._lock = threading.Lock()
+        self._data_lock = threading.Lock()
+        self._data: Optional[Dict] = None
+        self._updater: Optional[threading.Thread] = None
+
+    @classmethod
+    def open(cls, knowledge_dir: str, index_dir: str) -> "KnowledgeIndex":
+        """The index of knowledge_dir shared by every crew of the process, so it is loaded once."""
+        key = (os.path.abspath(knowledge_dir), os.path.abspath(index_dir))
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(*key)
+            return cls._instances[key]
+
+    def has_sources(self) -> bool:
+        """Whether the knowledge directory contains any file to index."""
+        return bool(self._files())
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.index_dir, "index.pkl")
+
+    def _segment_path(self, digest: str) -> str:
+        return os.path.join(self.segments_dir, f"{digest}.pkl")
+
+    @staticmethod
+    def chunk(content: bytes, chunk_words: int = CHUNK_WORDS) -> List[Tuple[str, int, int]]:
+        """Split the raw bytes of a file into (heading, start, end) chunks of about chunk_words words."""
+        chunks = []
+        heading = ""
+        start = end = words = 0
+
+        def flush():
+            nonlocal words
+            if words:
+                chunks.append((heading, start, end))
+            words = 0
+
+        for paragraph in _PARAGRAPH.finditer(content):
+            position = paragraph.start()
+            match = _HEADING.match(content, position, paragraph.end())
+            if match:
+                flush()
+                heading = match.group(1).decode("utf-8", errors="replace")
+                position = match.end()
+            paragraph_words = list(_WORD.finditer(content, position, paragraph.end()))
+            if not paragraph_words:
+                continue
+            if words and words + len(paragraph_words) > chunk_words:
+                flush()
+            # Paragraphs longer than a chunk are split on word boundaries
+            for offset in range(0, len(paragraph_words), chunk_words):
+                if offset:
+                    flush()
+                part = paragraph_words[offset:offset + chunk_words]
+                if not words:
+                    start = part[0].start()
+                end = part[-1].end()
+                words += len(part)
+        flush()
+        return chunks
+
+    def _files(self) -> Dict[str, os.stat_result]:
+        files = {}
+        if not os.path.isdir(self.knowledge_dir):
+            return files
+        for root, dirs, names in os.walk(self.knowledge_dir):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            for name in sorted(names):
+                if name.lower().endswith(TEXT_EXTENSIONS) and not name.startswith('.'):
+                    path = os.path.join(root, name)
+                    files[os.path.relpath(path, self.knowledge_dir)] = os.stat(path)
+        return files
+
+    def _load(self) -> Dict:
+        with self._data_lock:
+            if self._data is None:
+                self._data = self._read()
+            return self._data
+
+    def _read(self) -> Dict:
+        try:
+            with open(self._index_path, "rb") as f:
+                data = pickle.load(f)
+            if data.get('version') != self.VERSION:
+                raise ValueError("index version changed")
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            data = {'version': self.VERSION, 'files': {}, 'sources': [], 'doc_sources': array('I'),
+                    'spans': array('Q'), 'headings': [], 'terms': {}, 'offsets': array('Q', [0]),
+                    'doc_ids': array('I'), 'weights': array('f')}
+        return data
+
+    def _replace(self, data: Dict) -> None:
+        with self._data_lock:
+            self._data = data
+        self._write(self._index_path, data)
+
+    def _write(self, path: str, data) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _build_segment(self, content: bytes) -> Dict:
+        """Chunk spans, headings, lengths and postings (chunk numbers and term counts) of one file.
+
+        The postings of all terms are stored back to back in flat arrays, with
+        each term's slice given by `offsets`, which keeps segments small and
+        fast to load.
+        """
+        spans, headings, lengths = array('Q'), [], array('I')
+        postings: Dict[str, Tuple[array, array]] = {}
+        for number, (heading, start, end) in enumerate(self.chunk(content)):
+            spans.extend((start, end))
+            headings.append(heading)
+            counts: Dict[str, int] = {}
+            terms = tokenize(f"{heading}\n{content[start:end].decode('utf-8', errors='replace')}")
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            lengths.append(len(terms))
+            for term, count in counts.items():
+                term_postings = postings.get(term)
+                if term_postings is None:
+                    term_postings = postings[term] = (array('I'), array('H'))
+                term_postings[0].append(number)
+                term_postings[1].append(min(count, 0xFFFF))
+
+        terms, offsets, doc_ids, counts = [], array('Q', [0]), array('I'), array('H')
+        for term, (numbers, term_counts) in postings.items():
+            terms.append(term)
+            doc_ids.extend(numbers)
+            counts.extend(term_counts)
+            offsets.append(len(doc_ids))
+        return {'spans': spans, 'headings': headings, 'lengths': lengths, 'terms': terms, 'offsets': offsets,
+                'doc_ids': doc_ids, 'counts': counts}
+
+    def update(self) -> Dict[str, int]:
+        """Bring the index up to date with the knowledge directory.
+
+        Returns how many files were indexed, unchanged and removed.
+        """
+        with self._lock:
+            data = self._load()
+            known = data['files']
+            current = self._files()
+            files = {}
+            stats = {'indexed': 0, 'unchanged': 0, 'removed': len(known.keys() - current.keys())}
+            for rel_path, stat in current.items():
+                entry = known.get(rel_path)
+                if entry and not os.path.exists(self._segment_path(entry['digest'])):
+                    entry = None
+                if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                    files[rel_path] = entry
+                    stats['unchanged'] += 1
+                    continue
+                with open(os.path.join(self.knowledge_dir, rel_path), "rb") as f:
+                    content = f.read()
+                digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+                files[rel_path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'digest': digest}
+                if entry and entry['digest'] == digest:
+                    # Touched but not changed
+                    stats['unchanged'] += 1
+                    continue
+                stats['indexed'] += 1
+                if not os.path.exists(self._segment_path(digest)):
+                    self._write(self._segment_path(digest), self._build_segment(content))
+
+            if stats['indexed'] or stats['removed']:
+                self._merge(data, files)
+            elif files != known:
+                # Only mtimes changed
+                self._replace(dict(data, files=files))
+            return stats
+
+    def _update_quietly(self) -> None:
+        try:
+            stats = self.update()
+        except Exception as e:
+            # Searches keep using the previous snapshot
+            print(f"Could not update the knowledge index: {e}")
+            return
+        if stats['indexed'] or stats['removed']:
+            print(f"Knowledge index updated: {stats['indexed']} files indexed, {stats['removed']} removed")
+
+    def update_in_background(self) -> threading.Thread:
+        """Run update() on a background thread, unless one is already running, and return that thread."""
+        with self._data_lock:
+            if self._updater is None or not self._updater.is_alive():
+                self._updater = threading.Thread(target=self._update_quietly, name="knowledge-index", daemon=True)
+                self._updater.start()
+            return self._updater
+
+    def _merge(self, data: Dict, files: Dict[str, Dict]) -> None:
+        """Rebuild the postings with BM25 weights from the segments of all files."""
+        sources, doc_sources, spans, headings, lengths = [], array('I'), array('Q'), [], array('I')
+        segments = []
+        # Where each term's postings are: (segment, first chunk id of the segment, term number)
+        pieces: Dict[str, List[Tuple[Dict, int, int]]] = {}
+        for ordinal, (rel_path, entry) in enumerate(sorted(files.items())):
+            with open(self._segment_path(entry['digest']), "rb") as f:
+                segment = pickle.load(f)
+            segments.append(segment)
+            base = len(lengths)
+            sources.append(rel_path)
+            doc_sources.extend([ordinal] * len(segment['lengths']))
+            spans.extend(segment['spans'])
+            headings.extend(segment['headings'])
+            lengths.extend(segment['lengths'])
+            for number, term in enumerate(segment['terms']):
+                term_pieces = pieces.get(term)
+                if term_pieces is None:
+                    pieces[term] = [(segment, base, number)]
+                else:
+                    term_pieces.append((segment, base, number))
+
+        total = len(lengths)
+        average_length = (sum(lengths) / total) if total else 0.0
+        k1, b = self.K1, self.B
+        norms = [k1 * (1 - b + b * length / average_length) if average_length else k1 for length in lengths]
+        terms, offsets, all_doc_ids, all_weights = {}, array('Q', [0]), array('I'), array('f')
+        for term, term_pieces in pieces.items():
+            doc_ids, counts = array('I'), array('H')
+            for segment, base, number in term_pieces:
+                lo, hi = segment['offsets'][number], segment['offsets'][number + 1]
+                numbers = segment['doc_ids'][lo:hi]
+                doc_ids.extend(map(base.__add__, numbers) if base else numbers)
+                counts.extend(segment['counts'][lo:hi])
+            idf = math.log(1 + (total - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            scale = idf * (k1 + 1)
+            weights = array('f', [scale * count / (count + norms[doc_id])
+                                  for doc_id, count in zip(doc_ids, counts)])
+            if len(doc_ids) > self.MAX_POSTINGS:
+                best = heapq.nlargest(self.MAX_POSTINGS, range(len(doc_ids)), key=weights.__getitem__)
+                doc_ids = array('I', [doc_ids[i] for i in best])
+                weights = array('f', [weights[i] for i in best])
+            terms[term] = len(terms)
+            all_doc_ids.extend(doc_ids)
+            all_weights.extend(weights)
+            offsets.append(len(all_doc_ids))
+
+        # Searches running meanwhile keep using the previous data
+        self._replace(dict(data, files=files, sources=sources, doc_sources=doc_sources, spans=spans,
+                           headings=headings, terms=terms, offsets=offsets, doc_ids=all_doc_ids,
+                           weights=all_weights))
+
+        # Drop the segments of files that changed or were removed
+        live = {f"{entry['digest']}.pkl" for entry in files.values()}
+        for name in os.listdir(self.segments_dir) if os.path.isdir(self.segments_dir) else []:
+            if name.endswith(".pkl") and name not in live:
+                os.remove(os.path.join(self.segments_dir, name))
+
+    def __len__(self) -> int:
+        return len(self._load()['headings'])
+
+    def search(self, query: str, top_k: int = 5) -> List[KnowledgeHit]:
+        """The top_k chunks for query by BM25 score, best first.
+
+        Searches the current snapshot without waiting for a running update,
+        except when nothing was indexed yet: then the first build is awaited.
+        """
+        data = self._load()
+        updater = self._updater
+        if not data['files'] and updater is not None:
+            updater.join()
+            data = self._load()
+        terms, offsets, doc_ids, weights = data['terms'], data['offsets'], data['doc_ids'], data['weights']
+        scores: Dict[int, float] = {}
+        get = scores.get
+        for term in set(tokenize(query)):
+            number = terms.get(term)
+            if number is not None:
+                lo, hi = offsets[number], offsets[number + 1]
+                for doc_id, weight in zip(doc_ids[lo:hi], weights[lo:hi]):
+                    scores[doc_id] = get(doc_id, 0.0) + weight
+
+        hits = []
+        for doc_id, score in heapq.nlargest(top_k, scores.items(), key=lambda item: item[1]):
+            source = data['sources'][data['doc_sources'][doc_id]]
+            start, end = data['spans'][2 * doc_id], data['spans'][2 * doc_id + 1]
+            try:
+                with open(os.path.join(self.knowledge_dir, source), "rb") as f:
+                    f.seek(start)
+                    text = f.read(end - start).decode("utf-8", errors="replace")
+            except OSError:
+                # Removed since the last update
+                continue
+            hits.append(KnowledgeHit(source, data['headings'][doc_id], text, score))
+        return hits
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from crewai.llms.base_llm import BaseLLM
+
+from .llm_wrapper import LLMWrapper
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache for LLM responses.
+
+    Each response is stored as a small JSON file named after the hash of the
+    request that produced it. Entries older than `max_age` seconds are dropped
+    on read, and the least recently used entries are evicted once the cache
+    grows past `max_entries` files or `max_bytes` bytes.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 2000,
+                 max_bytes: int = 200 * 1024 * 1024, max_age: float = 30 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(role: str, messages: Union[str, List[Dict[str, Any]]], model: str,
+                 temperature: Optional[float], **extra: Any) -> str:
+        """Hash everything that determines the response into a cache key."""
+        payload = {
+            'role': role,
+            'messages': messages,
+            'model': model,
+            'temperature': temperature,
+            **extra,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss or expired entry."""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                self.misses += 1
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            # Touch the entry so eviction drops the least recently used ones first
+            os.utime(path, None)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry['response']
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response atomically, then evict old entries if over budget."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({'created': time.time(), 'response': response}, f)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove expired entries and the oldest ones beyond the size limits."""
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            over_budget = len(entries) - removed > self.max_entries or total_bytes > self.max_bytes
+            if not over_budget and now - mtime <= self.max_age:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            removed += 1
+            total_bytes -= size
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    pass
+
+
+class CachedLLM(LLMWrapper):
+    """LLM wrapper that answers repeated requests from a ResponseCache."""
+
+    def __init__(self, llm: BaseLLM, cache: ResponseCache, role: str):
+        super().__init__(llm)
+        self.cache = cache
+        self.role = role
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Union[str, Any]:
+        key = ResponseCache.make_key(
+            self.role, messages, self.model, self.temperature,
+            stop=self.stop, tools=tools,
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self.llm.call(messages, tools, callbacks, available_functions, **kwargs)
+        # Tool call results are not plain text and must not be replayed
+        if isinstance(response, str) and response:
+            self.cache.set(key, response)
+        return response
@@ -0,0 +1,205 @@
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from crewai.llms.base_llm import BaseLLM
+
+from .llm_wrapper import LLMWrapper
+from .tokens import estimate_message_tokens, estimate_tokens
+
+# Lower runs first: UI jobs someone is watching go before batch topics
+PRIORITIES = {'interactive': 0, 'batch': 1}
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Whether a provider error is a 429 (litellm, openai and anthropic errors carry status_code)."""
+    if getattr(error, 'status_code', None) == 429:
+        return True
+    return type(error).__name__ in ("RateLimitError", "RateLimitExceeded")
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked to wait in the Retry-After header of a 429, if it did."""
+    # litellm keeps the provider's headers aside; its `response` is a stand-in without them
+    headers = (getattr(error, 'litellm_response_headers', None)
+               or getattr(getattr(error, 'response', None), 'headers', None) or {})
+    try:
+        value = headers.get('retry-after') or headers.get('Retry-After')
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Allows `rate` units per minute with bursts of up to `capacity` units.
+
+    Reservations may exceed what is available: the bucket goes into debt and
+    `wait_time` reports how long until it is paid off, so a large prompt is
+    admitted on its own instead of waiting forever for a full bucket.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate / 60.0
+        self.capacity = capacity if capacity is not None else rate
+        self.available = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount can be taken (0 when it can be taken now)."""
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        return max(0.0, (needed - self.available) / self.rate)
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.available -= amount
+
+
+class LLMScheduler:
+    """Process-wide admission control for the calls to one model.
+
+    Calls wait for a requests-per-minute and a tokens-per-minute token bucket
+    (prompt tokens are estimated up front, the response is charged when it
+    arrives). Waiting calls are admitted by priority, then in arrival order,
+    so interactive UI jobs overtake queued batch topics. A 429 pauses every
+    caller of the model until the provider's Retry-After or a jittered
+    exponential backoff has passed, and the call is retried up to
+    `max_retries` times before the error is raised.
+    """
+
+    _instances: Dict[str, "LLMScheduler"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 max_retries: int = 6, base_delay: float = 1.0, max_delay: float = 60.0,
+                 rng: Optional[random.Random] = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+        self._condition = threading.Condition()
+        self._waiting: List = []
+        self._order = itertools.count()
+        self._paused_until = 0.0
+        # 429s answered with a retry
+        self.rate_limited = 0
+
+    @classmethod
+    def for_model(cls, model: str) -> "LLMScheduler":
+        """The scheduler shared by every agent of the process that calls model, configured from the environment.
+
+        BLOG_LLM_RPM and BLOG_LLM_TPM set the requests and tokens per minute
+        (unlimited when unset), BLOG_LLM_MAX_RETRIES the retries after a 429
+        (default 6).
+        """
+        with cls._instances_lock:
+            if model not in cls._instances:
+                cls._instances[model] = cls(
+                    requests_per_minute=float(os.getenv("BLOG_LLM_RPM", "0")) or None,
+                    tokens_per_minute=float(os.getenv("BLOG_LLM_TPM", "0")) or None,
+                    max_retries=int(os.getenv("BLOG_LLM_MAX_RETRIES", "6")),
+                )
+            return cls._instances[model]
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        wait = self._paused_until - now
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return max(0.0, wait)
+
+    def acquire(self, tokens: int, priority: str = 'interactive') -> float:
+        """Block until a call with a prompt of about `tokens` tokens may start; returns the seconds waited."""
+        start = time.monotonic()
+        ticket = (PRIORITIES.get(priority, len(PRIORITIES)), next(self._order))
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._waiting[0] == ticket:
+                        wait = self._wait_time(tokens, now)
+                        if wait <= 0:
+                            break
+                        self._condition.wait(wait)
+                    else:
+                        self._condition.wait()
+                if self.requests is not None:
+                    self.requests.take(1, now)
+                if self.tokens is not None:
+                    self.tokens.take(tokens, now)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+        return time.monotonic() - start
+
+    def charge(self, tokens: int) -> None:
+        """Take the tokens of a response from the tokens-per-minute budget."""
+        if self.tokens is not None and tokens:
+            with self._condition:
+                self.tokens.take(tokens, time.monotonic())
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Pause all callers after a 429 on the given attempt (0-based); returns the delay."""
+        delay = retry_after(error)
+        if delay is None:
+            # Full jitter, so the callers that hit the limit together do not retry together
+            delay = self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        with self._condition:
+            self.rate_limited += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self._condition.notify_all()
+        return delay
+
+    def call(self, llm: BaseLLM, messages: Union[str, List[Dict[str, str]]], priority: str = 'interactive',
+             *args: Any, **kwargs: Any) -> Union[str, Any]:
+        """Call llm once admitted, retrying on 429s."""
+        tokens = estimate_message_tokens(messages)
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens, priority)
+            try:
+                response = llm.call(messages, *args, **kwargs)
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+                delay = self.backoff(attempt, e)
+                print(f"Rate limited by {getattr(llm, 'model', 'the provider')}, retrying in {delay:.1f}s "
+                      f"(attempt {attempt + 1} of {self.max_retries})")
+                continue
+            if isinstance(response, str):
+                self.charge(estimate_tokens(response))
+            return response
+
+
+class ScheduledLLM(LLMWrapper):
+    """LLM wrapper that sends every call through the LLMScheduler of its model."""
+
+    def __init__(self, llm: BaseLLM, scheduler: Optional[LLMScheduler] = None, priority: str = 'interactive'):
+        super().__init__(llm)
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}, expected one of: {', '.join(PRIORITIES)}")
+        self.scheduler = scheduler or LLMScheduler.for_model(llm.model)
+        self.priority = priority
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Union[str, Any]:
+        return self.scheduler.call(self.llm, messages, self.priority, tools, callbacks, available_functions,
+                                   **kwargs)
@@ -0,0 +1,52 @@
+from typing import Any, Dict, List, Optional, Union
+
+from crewai.llms.base_llm import BaseLLM
+
+
+class LLMWrapper(BaseLLM):
+    """Base for LLMs that wrap another one and add behaviour around `call`.
+
+    Everything except `call` is delegated to the wrapped LLM, so agents see
+    the same model, stop words and context window as without the wrapper.
+    """
+
+    def __init__(self, llm: BaseLLM):
+        self.llm = llm
+
+    @property
+    def model(self) -> str:
+        return self.llm.model
+
+    @property
+    def temperature(self) -> Optional[float]:
+        return self.llm.temperature
+
+    @property
+    def stop(self) -> Optional[List[str]]:
+        return self.llm.stop
+
+    @stop.setter
+    def stop(self, value: Optional[List[str]]) -> None:
+        self.llm.stop = value
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the wrapper itself
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Union[str, Any]:
+        return self.llm.call(messages, tools, callbacks, available_functions, **kwargs)
+
+    def supports_stop_words(self) -> bool:
+        return self.llm.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.llm.get_context_window_size()
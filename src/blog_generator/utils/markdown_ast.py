@@ -0,0 +1,131 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+# Block syntax, following CommonMark for ATX headings, fences and list markers
+_FENCE_PATTERN = re.compile(r' {0,3}(`{3,}|~{3,})(.*)')
+_HEADING_PATTERN = re.compile(r' {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*')
+_LIST_ITEM_PATTERN = re.compile(r'([ \t]*)([-*+]|\d{1,9}[.)])[ \t]+(.*)')
+
+# First characters of lines that may open one of the blocks above
+_BLOCK_STARTS = frozenset('#`~-*+0123456789 \t')
+
+
+@dataclass
+class Heading:
+    """An ATX heading outside code blocks."""
+    level: int
+    text: str
+    line: int
+    start: int
+    end: int
+
+    @property
+    def anchor(self) -> str:
+        """Link anchor of the heading, as used in the generated tables of contents."""
+        return self.text.lower().replace(' ', '-').replace(':', '').replace('(', '').replace(')', '')
+
+
+@dataclass
+class CodeBlock:
+    """A fenced code block; start/end delimit its content without the fences.
+
+    An unclosed fence runs to the end of the document.
+    """
+    info: str
+    line: int
+    start: int
+    end: int
+    closed: bool = False
+
+
+@dataclass
+class ListItem:
+    """A bullet or ordered list item outside code blocks."""
+    indent: int
+    marker: str
+    text: str
+    line: int
+    start: int
+    end: int
+
+    @property
+    def ordered(self) -> bool:
+        return self.marker[0].isdigit()
+
+
+@dataclass
+class Section:
+    """The text from one heading (or the start of the document) up to the next heading."""
+    heading: Optional[Heading]
+    start: int
+    end: int
+
+
+@dataclass
+class MarkdownDocument:
+    """A markdown post parsed once into its headings, code blocks, list items and sections.
+
+    Offsets are character positions in `text`, so passes over the document can
+    slice or search the source directly instead of re-splitting it.
+    """
+    text: str
+    headings: List[Heading] = field(default_factory=list)
+    code_blocks: List[CodeBlock] = field(default_factory=list)
+    list_items: List[ListItem] = field(default_factory=list)
+
+    @classmethod
+    def parse(cls, text: str) -> "MarkdownDocument":
+        """Tokenize text line by line in a single pass."""
+        doc = cls(text)
+        fence: Optional[Tuple[str, CodeBlock]] = None
+        pos = 0
+
+        for number, line in enumerate(text.split('\n')):
+            start, pos = pos, min(pos + len(line) + 1, len(text))
+            stripped = line.rstrip('\r')
+            end = start + len(stripped)
+            if not stripped or stripped[0] not in _BLOCK_STARTS:
+                continue
+
+            fence_match = _FENCE_PATTERN.fullmatch(stripped)
+            if fence is not None:
+                # Inside a code block only a matching closing fence is significant
+                marker, block = fence
+                if (fence_match and fence_match.group(1)[0] == marker[0]
+                        and len(fence_match.group(1)) >= len(marker) and not fence_match.group(2).strip()):
+                    block.end, block.closed = start, True
+                    fence = None
+                continue
+
+            if fence_match and not (fence_match.group(1)[0] == '`' and '`' in fence_match.group(2)):
+                block = CodeBlock(info=fence_match.group(2).strip(), line=number, start=pos, end=len(text))
+                doc.code_blocks.append(block)
+                fence = (fence_match.group(1), block)
+            elif heading_match := _HEADING_PATTERN.fullmatch(stripped):
+                level, heading_text = heading_match.groups()
+                doc.headings.append(Heading(len(level), (heading_text or '').strip(), number, start, end))
+            elif item_match := _LIST_ITEM_PATTERN.fullmatch(stripped):
+                indent, marker, item_text = item_match.groups()
+                doc.list_items.append(ListItem(len(indent.expandtabs(4)), marker, item_text, number, start, end))
+
+        return doc
+
+    @property
+    def sections(self) -> List[Section]:
+        """Split the document before every heading; the first section holds any preamble."""
+        sections = []
+        start, heading = 0, None
+        for next_heading in self.headings:
+            sections.append(Section(heading, start, next_heading.start))
+            start, heading = next_heading.start, next_heading
+        sections.append(Section(heading, start, len(self.text)))
+        return sections
+
+    @property
+    def code_spans(self) -> List[Tuple[int, int]]:
+        """Character ranges of the code block contents, in document order."""
+        return [(block.start, block.end) for block in self.code_blocks]
+
+    def section_text(self, section: Section) -> str:
+        return self.text[section.start:section.end]
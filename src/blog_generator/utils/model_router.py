@@ -0,0 +1,227 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from crewai.llms.base_llm import BaseLLM
+
+try:
+    from crewai.events import crewai_event_bus
+    from crewai.events.base_events import BaseEvent
+except ImportError:  # crewAI < 0.177 ships the event bus under utilities
+    from crewai.utilities.events import crewai_event_bus
+    from crewai.utilities.events.base_events import BaseEvent
+
+from .config_validator import CONFIG_DIR, ConfigValidator
+from .llm_scheduler import is_rate_limited
+from .llm_wrapper import LLMWrapper
+from .tokens import estimate_message_tokens, estimate_tokens
+
+MODELS_CONFIG = os.path.join(CONFIG_DIR, "models.yaml")
+
+
+@dataclass
+class ModelTier:
+    """A model the agents can be routed to, with its price in USD per million tokens."""
+    name: str
+    # litellm model name; None uses crewAI's default model (the MODEL environment variable)
+    model: Optional[Any] = None
+    input_cost: Optional[float] = None
+    output_cost: Optional[float] = None
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """Estimated USD cost of a call; prices missing from models.yaml come from litellm's price table."""
+        input_cost, output_cost = self.input_cost, self.output_cost
+        if input_cost is None or output_cost is None:
+            listed_input, listed_output = _listed_prices(model)
+            input_cost = listed_input if input_cost is None else input_cost
+            output_cost = listed_output if output_cost is None else output_cost
+        return (prompt_tokens * input_cost + completion_tokens * output_cost) / 1_000_000
+
+
+def _listed_prices(model: str) -> Tuple[float, float]:
+    """litellm's input and output price per million tokens of model, 0 when it is not listed."""
+    try:
+        from litellm import model_cost
+    except ImportError:
+        return 0.0, 0.0
+    entry = model_cost.get(model) or model_cost.get(model.split("/", 1)[-1]) or {}
+    return (entry.get('input_cost_per_token', 0.0) * 1_000_000,
+            entry.get('output_cost_per_token', 0.0) * 1_000_000)
+
+
+@dataclass
+class EscalationRule:
+    """When a call of a task's agent goes to a larger tier instead of the agent's own.
+
+    A prompt over `above_prompt_tokens` goes straight to `tier`. A call that
+    fails (other than on a rate limit, which the scheduler already retried)
+    is retried on `tier` when `on_error` is set, and so is a response shorter
+    than `min_response_tokens`.
+    """
+    tier: str
+    above_prompt_tokens: Optional[int] = None
+    on_error: bool = False
+    min_response_tokens: Optional[int] = None
+
+
+class LLMEscalatedEvent(BaseEvent):
+    """Emitted by a RoutedLLM before it retries a call on a larger tier, discarding the answer it streamed."""
+    type: str = "llm_escalated"
+    from_tier: str
+    to_tier: str
+    reason: str
+
+
+class ModelRouter:
+    """The model tiers of config/models.yaml and the tier and escalation of every agent.
+
+    Agents pick a tier with `model_tier` in agents.yaml (default_tier
+    otherwise); an agent with an explicit `llm` keeps that model. Tasks set
+    their agent's escalation with `escalation` in tasks.yaml.
+    BLOG_MODEL_<TIER> (e.g. BLOG_MODEL_SMALL) overrides the model of a tier.
+    """
+
+    _instances: Dict[str, Tuple[Tuple, "ModelRouter"]] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, tiers: Dict[str, ModelTier], default_tier: str):
+        if default_tier not in tiers:
+            raise ValueError(f"Unknown default tier {default_tier!r}, expected one of: {', '.join(tiers)}")
+        self.tiers = tiers
+        self.default_tier = default_tier
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "ModelRouter":
+        errors = ConfigValidator.check_models(config)
+        if errors:
+            raise ValueError("Invalid model configuration:\n" + "\n".join(f"  - {e}" for e in errors))
+        tiers = {}
+        for name, entry in config['tiers'].items():
+            entry = entry or {}
+            tiers[name] = ModelTier(
+                name=name,
+                model=os.getenv(f"BLOG_MODEL_{name.upper()}") or entry.get('model'),
+                input_cost=entry.get('input_cost'),
+                output_cost=entry.get('output_cost'),
+            )
+        return cls(tiers, config.get('default_tier') or next(iter(tiers)))
+
+    @classmethod
+    def open(cls, path: str = MODELS_CONFIG) -> "ModelRouter":
+        """The router of a models.yaml, loaded again when the file changes."""
+        path = os.path.abspath(path)
+        with cls._instances_lock:
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            cached = cls._instances.get(path)
+            if cached is None or cached[0] != signature:
+                cached = cls._instances[path] = (signature, cls.from_config(ConfigValidator.load(path)))
+            return cached[1]
+
+    def tier_for(self, agent_config: Dict) -> ModelTier:
+        if agent_config.get('llm'):
+            # An agent configured with its own llm keeps it
+            return ModelTier(name="custom", model=agent_config['llm'])
+        return self.tiers[agent_config.get('model_tier') or self.default_tier]
+
+    @staticmethod
+    def escalations(tasks: Dict) -> Dict[str, EscalationRule]:
+        """The escalation rule of every agent whose task has one (the validator rejects conflicting ones)."""
+        return {entry['agent']: EscalationRule(**entry['escalation']) for entry in tasks.values()
+                if isinstance(entry, dict) and entry.get('escalation')}
+
+    def build(self, agent_config: Dict, rule: Optional[EscalationRule],
+              make_llm: Callable[[ModelTier], BaseLLM], instrumentation: Any = None) -> BaseLLM:
+        """The LLM of an agent: its tier's model, behind a RoutedLLM that escalates as rule says and reports the cost."""
+        tier = self.tier_for(agent_config)
+        tiers = {tier.name: tier}
+        if rule is not None and rule.tier != tier.name:
+            tiers[rule.tier] = self.tiers[rule.tier]
+        llms = {name: make_llm(routed) for name, routed in tiers.items()}
+        return RoutedLLM(llms, tiers, tier.name, rule, instrumentation)
+
+
+class RoutedLLM(LLMWrapper):
+    """LLM wrapper that calls the model of the agent's tier, escalating calls as its task's rule says.
+
+    The LLM span that InstrumentedLLM has open for each call gets the tier
+    and model that answered, the escalation reason and the estimated cost,
+    plus every attempt with its own tier, model, time and cost. The run
+    profile therefore also counts the small-tier attempts an escalation
+    threw away. Everything else is delegated to the LLM of the agent's
+    own tier.
+    """
+
+    def __init__(self, llms: Dict[str, BaseLLM], tiers: Dict[str, ModelTier], tier: str,
+                 rule: Optional[EscalationRule] = None, instrumentation: Any = None):
+        super().__init__(llms[tier])
+        self.llms = llms
+        self.tiers = tiers
+        self.tier = tier
+        self.rule = rule
+        self.instrumentation = instrumentation
+
+    def _call_tier(self, tier: str, messages: Union[str, List[Dict[str, str]]], prompt_tokens: int,
+                   args: Tuple, kwargs: Dict, route: Dict[str, Any],
+                   escalation: Optional[str] = None) -> Union[str, Any]:
+        llm = self.llms[tier]
+        attempt: Dict[str, Any] = {'tier': tier, 'model': llm.model, 'cost': 0.0}
+        if escalation is not None:
+            attempt['escalation'] = escalation
+            route['escalated'] = escalation
+        route.setdefault('attempts', []).append(attempt)
+        route.update(tier=tier, model=llm.model)
+        start = time.perf_counter()
+        try:
+            response = llm.call(messages, *args, **kwargs)
+        except Exception as e:
+            attempt['error'] = str(e)
+            raise
+        finally:
+            attempt['seconds'] = time.perf_counter() - start
+        completion_tokens = estimate_tokens(response) if isinstance(response, str) else 0
+        attempt['cost'] = self.tiers[tier].cost(llm.model, prompt_tokens, completion_tokens)
+        route['cost'] = route.get('cost', 0.0) + attempt['cost']
+        return response
+
+    def _retry(self, rule: EscalationRule, reason: str, route: Dict[str, Any]) -> None:
+        """Mark the last attempt as discarded and tell listeners (the UI preview) its tokens are void."""
+        route['attempts'][-1]['discarded'] = True
+        crewai_event_bus.emit(self, LLMEscalatedEvent(from_tier=self.tier, to_tier=rule.tier, reason=reason))
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Union[str, Any]:
+        args = (tools, callbacks, available_functions)
+        prompt_tokens = estimate_message_tokens(messages)
+        rule = self.rule if self.rule is not None and self.rule.tier != self.tier else None
+        # Tier, model and total cost of the call, and every attempt it took
+        route: Dict[str, Any] = {}
+        try:
+            if rule and rule.above_prompt_tokens and prompt_tokens > rule.above_prompt_tokens:
+                return self._call_tier(rule.tier, messages, prompt_tokens, args, kwargs, route, "prompt_tokens")
+            try:
+                response = self._call_tier(self.tier, messages, prompt_tokens, args, kwargs, route)
+            except Exception as e:
+                if not (rule and rule.on_error) or is_rate_limited(e):
+                    raise
+                print(f"{self.model} failed ({e}), retrying on the {rule.tier} tier")
+                self._retry(rule, "error", route)
+                return self._call_tier(rule.tier, messages, prompt_tokens, args, kwargs, route, "error")
+            if (rule and rule.min_response_tokens and isinstance(response, str)
+                    and estimate_tokens(response) < rule.min_response_tokens):
+                print(f"{self.model} answered with under {rule.min_response_tokens} tokens, "
+                      f"retrying on the {rule.tier} tier")
+                self._retry(rule, "short_response", route)
+                return self._call_tier(rule.tier, messages, prompt_tokens, args, kwargs, route, "short_response")
+            return response
+        finally:
+            if self.instrumentation is not None:
+                self.instrumentation.annotate(**route)
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .markdown_ast import MarkdownDocument
+from .output_writer import is_post, post_name, read_post
+
+# Sections of the generated Technical Diagrams part and the diagram type each one holds
+DIAGRAM_SECTIONS = {
+    'System Architecture': 'architecture',
+    'Process Flow': 'workflow',
+    'State Transitions': 'state_machine',
+    'Class Structure': 'class',
+}
+DIAGRAMS_HEADING = "Technical Diagrams"
+
+_FRONTMATTER_TITLE = re.compile(r'\A---\n(?:.*\n)*?title:\s*"?(.*?)"?\s*\n(?:.*\n)*?---\n')
+_FRONTMATTER_DATE = re.compile(r'\A---\n(?:.*\n)*?date:\s*"?(.*?)"?\s*\n(?:.*\n)*?---\n')
+_WORD = re.compile(r'\w+')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    topic TEXT NOT NULL,
+    topic_key TEXT NOT NULL,
+    created REAL NOT NULL,
+    run_id TEXT,
+    content_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    headings TEXT NOT NULL,
+    diagram_types TEXT NOT NULL,
+    timings TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_topic_key ON posts (topic_key, created);
+CREATE INDEX IF NOT EXISTS posts_created ON posts (created);
+CREATE INDEX IF NOT EXISTS posts_content_hash ON posts (content_hash);
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5 (topic, headings, tokenize = 'unicode61');
+"""
+
+
+def normalize_topic(topic: str) -> str:
+    """Case, punctuation and whitespace insensitive form of a topic, used to find earlier posts."""
+    return ' '.join(_WORD.findall(topic.lower()))
+
+
+@dataclass
+class PostRecord:
+    """What the index knows about one generated post."""
+    path: str
+    topic: str
+    created: float
+    content_hash: str
+    size: int
+    headings: List[str] = field(default_factory=list)
+    diagram_types: List[str] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    run_id: Optional[str] = None
+
+    @property
+    def created_at(self) -> str:
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.created))
+
+
+class OutputIndex:
+    """SQLite index of the posts in the output directory.
+
+    `save_blog_post` records every post it writes: topic, content hash, size,
+    headings, diagram types and stage timings. Lookups by topic and history
+    listings use indexed columns and searches use an FTS5 table over topics
+    and headings, so they stay instant with tens of thousands of posts.
+    `sync()` adds posts written before the index existed and drops entries
+    whose file was deleted.
+    """
+
+    FILENAME = "index.sqlite"
+
+    def __init__(self, output_dir: str, db_path: Optional[str] = None):
+        self.output_dir = output_dir
+        self.db_path = db_path or os.path.join(output_dir, self.FILENAME)
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        # A connection per call: crews save posts from their own threads
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        with self._schema_lock:
+            if not self._schema_ready:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript(_SCHEMA)
+                self._schema_ready = True
+        return connection
+
+    @staticmethod
+    def describe(content: str) -> Tuple[Optional[str], List[str], List[str]]:
+        """(frontmatter title, article headings, diagram types) of a post written by the publisher.
+
+        The diagram sections run from the last Technical Diagrams heading to
+        the next level 1 or 2 heading that is not one of DIAGRAM_SECTIONS
+        (earlier versions of the publisher put the article after them).
+        """
+        title = _FRONTMATTER_TITLE.match(content)
+        headings, diagram_types = [], []
+        doc = MarkdownDocument.parse(content)
+        marker = next((heading for heading in reversed(doc.headings)
+                       if heading.level == 2 and heading.text == DIAGRAMS_HEADING), None)
+        in_diagrams = False
+        for heading in doc.headings:
+            if heading is marker:
+                in_diagrams = True
+                continue
+            if in_diagrams and heading.level <= 2:
+                in_diagrams = heading.text in DIAGRAM_SECTIONS
+                if in_diagrams:
+                    diagram_types.append(DIAGRAM_SECTIONS[heading.text])
+                    continue
+            if not in_diagrams and heading.text:
+                headings.append(heading.text)
+        return (title.group(1) if title else None), headings, diagram_types
+
+    @staticmethod
+    def _created(path: str, content: str) -> float:
+        """When a post found on disk was generated: its frontmatter date, else its file's mtime."""
+        date = _FRONTMATTER_DATE.match(content)
+        if date:
+            try:
+                return time.mktime(time.strptime(date.group(1), "%Y-%m-%d %H:%M:%S"))
+            except ValueError:
+                pass
+        return os.path.getmtime(path)
+
+    def record(self, path: str, content: str, topic: str, run_id: Optional[str] = None,
+               timings: Optional[Dict[str, float]] = None, created: Optional[float] = None) -> PostRecord:
+        """Add or replace the entry of the post written to path."""
+        _, headings, diagram_types = self.describe(content)
+        record = PostRecord(
+            path=os.path.abspath(path),
+            topic=topic,
+            created=created if created is not None else time.time(),
+            content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+            size=len(content.encode("utf-8")),
+            headings=headings,
+            diagram_types=diagram_types,
+            timings={name: round(seconds, 3) for name, seconds in (timings or {}).items()},
+            run_id=run_id,
+        )
+        with closing(self._connect()) as connection, connection:
+            self._insert(connection, record)
+        return record
+
+    @staticmethod
+    def _insert(connection: sqlite3.Connection, record: PostRecord) -> None:
+        row = connection.execute("SELECT id FROM posts WHERE path = ?", (record.path,)).fetchone()
+        if row is not None:
+            connection.execute("DELETE FROM posts_fts WHERE rowid = ?", (row['id'],))
+            connection.execute("DELETE FROM posts WHERE id = ?", (row['id'],))
+        cursor = connection.execute(
+            "INSERT INTO posts (path, topic, topic_key, created, run_id, content_hash, size, headings, "
+            "diagram_types, timings) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (record.path, record.topic, normalize_topic(record.topic), record.created, record.run_id,
+             record.content_hash, record.size, json.dumps(record.headings), json.dumps(record.diagram_types),
+             json.dumps(record.timings)),
+        )
+        connection.execute("INSERT INTO posts_fts (rowid, topic, headings) VALUES (?, ?, ?)",
+                           (cursor.lastrowid, record.topic, '\n'.join(record.headings)))
+
+    @staticmethod
+    def _record(row: sqlite3.Row) -> PostRecord:
+        return PostRecord(
+            path=row['path'], topic=row['topic'], created=row['created'], content_hash=row['content_hash'],
+            size=row['size'], headings=json.loads(row['headings']), diagram_types=json.loads(row['diagram_types']),
+            timings=json.loads(row['timings']), run_id=row['run_id'],
+        )
+
+    def _posts_on_disk(self) -> Iterable[str]:
+        for root, dirs, names in os.walk(self.output_dir):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for name in names:
+                if is_post(name):
+                    yield os.path.abspath(os.path.join(root, name))
+
+    def sync(self) -> Dict[str, int]:
+        """Index the posts in the output directory that are not indexed yet and forget deleted ones."""
+        with closing(self._connect()) as connection, connection:
+            known = {row['path'] for row in connection.execute("SELECT path FROM posts")}
+            on_disk = set(self._posts_on_disk())
+            removed = known - on_disk
+            connection.executemany("DELETE FROM posts_fts WHERE rowid IN (SELECT id FROM posts WHERE path = ?)",
+                                   [(path,) for path in removed])
+            connection.executemany("DELETE FROM posts WHERE path = ?", [(path,) for path in removed])
+            added = 0
+            for path in sorted(on_disk - known):
+                try:
+                    content = read_post(path)
+                except (OSError, EOFError, UnicodeDecodeError):
+                    continue
+                title, headings, diagram_types = self.describe(content)
+                topic = title or post_name(path).replace('_', ' ')
+                self._insert(connection, PostRecord(
+                    path=path, topic=topic, created=self._created(path, content),
+                    content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+                    size=len(content.encode("utf-8")), headings=headings, diagram_types=diagram_types,
+                ))
+                added += 1
+        return {'added': added, 'removed': len(removed)}
+
+    def find_topic(self, topic: str) -> List[PostRecord]:
+        """Earlier posts on the same topic (ignoring case and punctuation) that still exist, newest first."""
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT * FROM posts WHERE topic_key = ? ORDER BY created DESC",
+                                      (normalize_topic(topic),)).fetchall()
+        return [self._record(row) for row in rows if os.path.exists(row['path'])]
+
+    def history(self, limit: int = 20, offset: int = 0) -> List[PostRecord]:
+        """The most recently generated posts."""
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT * FROM posts ORDER BY created DESC LIMIT ? OFFSET ?",
+                                      (limit, offset)).fetchall()
+        return [self._record(row) for row in rows]
+
+    def posts(self) -> List[PostRecord]:
+        """Every indexed post, newest first."""
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT * FROM posts ORDER BY created DESC").fetchall()
+        return [self._record(row) for row in rows]
+
+    def search(self, query: str, limit: int = 20) -> List[PostRecord]:
+        """Posts whose topic or headings contain every word of query (as prefixes), best match first."""
+        words = _WORD.findall(query.lower())
+        if not words:
+            return self.history(limit)
+        match = ' '.join(f'"{word}"*' for word in words)
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT posts.* FROM posts_fts JOIN posts ON posts.id = posts_fts.rowid "
+                "WHERE posts_fts MATCH ? ORDER BY bm25(posts_fts, 4.0, 1.0), posts.created DESC LIMIT ?",
+                (match, limit),
+            ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
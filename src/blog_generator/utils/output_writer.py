@@ -0,0 +1,240 @@
+import atexit
+import gzip
+import hashlib
+import os
+import queue
+import re
+import tempfile
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Callable, Dict, Optional, Set, Tuple
+
+try:
+    import zstandard
+except ImportError:  # Optional; only needed for zstd compressed posts
+    zstandard = None
+
+# File extension of a post for each compression
+EXTENSIONS = {None: ".md", 'gzip': ".md.gz", 'zstd': ".md.zst"}
+SHARDINGS = (None, 'date', 'hash')
+
+_UNSAFE = re.compile(r'[^\w.-]+')
+
+
+def read_post(path: str) -> str:
+    """Text of a post written by OutputWriter, decompressed according to its extension."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(EXTENSIONS['gzip']):
+        data = gzip.decompress(data)
+    elif path.endswith(EXTENSIONS['zstd']):
+        if zstandard is None:
+            raise OSError(f"Reading {path} needs the zstandard package")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return data.decode("utf-8")
+
+
+def is_post(name: str) -> bool:
+    return name.endswith(tuple(EXTENSIONS.values()))
+
+
+def post_name(path: str) -> str:
+    """File name of a post without its extension (topics may contain dots)."""
+    name = os.path.basename(path)
+    for extension in sorted(EXTENSIONS.values(), key=len, reverse=True):
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return os.path.splitext(name)[0]
+
+
+class PendingPost(Future):
+    """A post being written: `path` is where it goes, the result is where it ended up."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+
+
+class OutputWriter:
+    """Writes generated posts to the output directory.
+
+    Every post is written to a temp file, fsynced and then linked into place,
+    so readers never see a truncated post and an existing post is never
+    overwritten: posts on the same topic saved within the same second get a
+    numbered suffix. Posts can be sharded into subdirectories by date
+    (YYYY/MM/DD) or by a hash of their topic (two hex digits), which keeps
+    directories small under batch load, and compressed with gzip or zstd.
+
+    With background=True the writes happen on a writer thread fed by a
+    bounded queue; `write` returns as soon as the post is queued (blocking
+    while the queue is full) and `flush` waits until everything queued is on
+    disk. The thread is drained when the process exits.
+    """
+
+    _instances: Dict[Tuple, "OutputWriter"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, output_dir: str, sharding: Optional[str] = None, compression: Optional[str] = None,
+                 background: bool = False, max_pending: int = 32, fsync: bool = True):
+        if sharding not in SHARDINGS:
+            raise ValueError(f"Unknown sharding {sharding!r}, expected one of: date, hash")
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unknown compression {compression!r}, expected one of: gzip, zstd")
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package (pip install zstandard)")
+        self.output_dir = output_dir
+        self.sharding = sharding
+        self.compression = compression
+        self.fsync = fsync
+        # Paths handed out but not written yet, so concurrent saves never pick the same name
+        self._reserved: Set[str] = set()
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = queue.Queue(maxsize=max_pending) if background else None
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def open(cls, output_dir: str) -> "OutputWriter":
+        """The writer of output_dir shared by every crew of the process, configured from the environment.
+
+        BLOG_OUTPUT_SHARDING (date or hash), BLOG_OUTPUT_COMPRESSION (gzip or
+        zstd), BLOG_OUTPUT_BACKGROUND (1 to write on a background thread) and
+        BLOG_OUTPUT_QUEUE_SIZE (posts waiting to be written, default 32).
+        """
+        options = (
+            os.getenv("BLOG_OUTPUT_SHARDING") or None,
+            os.getenv("BLOG_OUTPUT_COMPRESSION") or None,
+            os.getenv("BLOG_OUTPUT_BACKGROUND", "0") not in ("", "0", "false"),
+            int(os.getenv("BLOG_OUTPUT_QUEUE_SIZE", "32")),
+        )
+        key = (os.path.abspath(output_dir),) + options
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(*key)
+            return cls._instances[key]
+
+    @classmethod
+    def flush_all(cls) -> None:
+        """Wait for the posts queued by every shared writer to be written."""
+        with cls._instances_lock:
+            writers = list(cls._instances.values())
+        for writer in writers:
+            writer.flush()
+
+    def _shard(self, slug: str, when: datetime) -> str:
+        if self.sharding == 'date':
+            return os.path.join(self.output_dir, when.strftime("%Y"), when.strftime("%m"), when.strftime("%d"))
+        if self.sharding == 'hash':
+            return os.path.join(self.output_dir, hashlib.blake2b(slug.encode("utf-8"), digest_size=1).hexdigest())
+        return self.output_dir
+
+    def reserve(self, topic: str, when: Optional[datetime] = None) -> str:
+        """A path for a new post on topic that no existing or pending post uses."""
+        when = when or datetime.now()
+        slug = _UNSAFE.sub('_', topic.strip()).strip('_') or "post"
+        directory = self._shard(slug, when)
+        stem = os.path.join(directory, f"{slug}_{when.strftime('%Y%m%d_%H%M%S')}")
+        extension = EXTENSIONS[self.compression]
+        with self._lock:
+            number = 1
+            path = f"{stem}{extension}"
+            while path in self._reserved or os.path.exists(path):
+                number += 1
+                path = f"{stem}_{number}{extension}"
+            self._reserved.add(path)
+        return path
+
+    def _encode(self, content: str) -> bytes:
+        data = content.encode("utf-8")
+        if self.compression == 'gzip':
+            return gzip.compress(data, mtime=0)
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor().compress(data)
+        return data
+
+    def _publish(self, path: str, content: str) -> str:
+        """Write content to a temp file next to path and link it into place; returns the final path."""
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._encode(content))
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            final = path
+            while True:
+                try:
+                    # Unlike a rename, a link fails instead of replacing a post another process wrote meanwhile
+                    os.link(tmp_path, final)
+                    break
+                except FileExistsError:
+                    stem, extension = final[:-len(EXTENSIONS[self.compression])], EXTENSIONS[self.compression]
+                    final = f"{stem}_{os.getpid()}{extension}"
+                except OSError:
+                    # File systems without hard links
+                    os.replace(tmp_path, final)
+                    break
+            return final
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            with self._lock:
+                self._reserved.discard(path)
+
+    def write(self, content: str, topic: str,
+              on_written: Optional[Callable[[str, str], None]] = None) -> PendingPost:
+        """Save a post on topic; the future resolves to its path once it is on disk.
+
+        on_written(path, content) is called once the post is on disk, on the
+        writer thread when writing in the background.
+        """
+        path = self.reserve(topic)
+        future = PendingPost(path)
+        if self._queue is None:
+            self._write(path, content, on_written, future)
+        else:
+            self._start()
+            self._queue.put((path, content, on_written, future))
+        return future
+
+    def _write(self, path: str, content: str, on_written: Optional[Callable[[str, str], None]],
+               future: PendingPost) -> None:
+        try:
+            final = self._publish(path, content)
+            if on_written is not None:
+                on_written(final, content)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(final)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._drain, name="output-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _drain(self) -> None:
+        while True:
+            path, content, on_written, future = self._queue.get()
+            try:
+                self._write(path, content, on_written, future)
+                if future.exception() is not None:
+                    print(f"Error saving blog post to {path}: {future.exception()}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Wait until every queued post is written."""
+        if self._queue is not None:
+            self._queue.join()
+
+
+def save_blog_post(content: str, output_dir: str, topic: str) -> str:
+    """Save a blog post to output_dir with the shared writer of that directory, waiting until it is written."""
+    file_path = OutputWriter.open(output_dir).write(content, topic).result()
+    print(f"Blog post saved to {file_path}")
+    return file_path
@@ -0,0 +1,16 @@
+from typing import Dict, List, Union
+
+# Average characters per token of English prose for common BPE tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of text, without needing the model's tokenizer."""
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def estimate_message_tokens(messages: Union[str, List[Dict[str, str]]]) -> int:
+    """Rough token count of a prompt given as a string or a list of chat messages."""
+    if isinstance(messages, str):
+        return estimate_tokens(messages)
+    return sum(estimate_tokens(str(message.get('content', ''))) for message in messages)
@@ -0,0 +1,134 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .output_index import OutputIndex, PostRecord
+
+_WORD = re.compile(r'[a-z0-9_+#]+')
+
+# Words that do not change what a topic is about. Question words (how, what, when, why, ...) are not
+# among them: "What is Docker" and "Why Docker" are different articles.
+_STOPWORDS = frozenset("""
+a an and are as at be by can complete do does everything for from i in into is it its know learn
+learning must need of on or our should the this to top ultimate understanding using will with you your
+""".split())
+
+# Phrases with the same meaning in a topic, mapped to one shingle; longer phrases are replaced first
+_SYNONYMS = {
+    'intro': ('introduction', 'introducing', 'intro', 'beginners', 'beginner', 'getting started',
+              'get started', 'basics', 'basic', 'fundamentals', 'primer', 'overview', '101',
+              'tutorial', 'crash course', 'guide', 'explained', 'for dummies', 'first steps'),
+    'advanced': ('deep dive', 'deep-dive', 'advanced', 'internals', 'under the hood', 'in depth', 'in-depth'),
+    'best practice': ('best practices', 'best practice', 'tips and tricks', 'tips', 'dos and donts',
+                      "do's and don'ts", 'patterns'),
+    'vs': ('versus', 'vs.', 'vs', 'compared to', 'comparison', 'compared'),
+    'kubernetes': ('k8s', 'kubernetes'),
+    'javascript': ('javascript', 'js'),
+    'typescript': ('typescript', 'ts'),
+    'python': ('python', 'py'),
+    'postgresql': ('postgresql', 'postgres', 'pg'),
+    'database': ('databases', 'database', 'db', 'dbs'),
+    'machine learning': ('machine learning', 'ml'),
+    'interview': ('interviews', 'interview', 'interview questions'),
+}
+_PHRASES = sorted(((phrase, canonical) for canonical, phrases in _SYNONYMS.items() for phrase in phrases),
+                  key=lambda item: len(item[0]), reverse=True)
+_SYNONYM_PATTERN = re.compile(r'(?<![a-z0-9])(' + '|'.join(re.escape(phrase) for phrase, _ in _PHRASES)
+                              + r')(?![a-z0-9])')
+_CANONICAL = {phrase: canonical.replace(' ', '_') for phrase, canonical in _PHRASES}
+
+
+def _stem(word: str) -> str:
+    """Strip one common inflection, e.g. indexing/indexes/indexed -> index, cache/caching -> cach."""
+    for suffix in ('ing', 'ed', 'es', 's', 'e'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith(('ss', 'us', 'is')):
+            return word[:-len(suffix)]
+    return word
+
+
+def shingles(topic: str) -> FrozenSet[str]:
+    """The words a topic is about: lowercased, synonyms unified, stopwords and inflections removed."""
+    text = _SYNONYM_PATTERN.sub(lambda match: f" {_CANONICAL[match.group(1)]} ", topic.lower())
+    words = set()
+    for word in _WORD.findall(text.replace("'", "")):
+        if word in _STOPWORDS:
+            continue
+        words.add(_stem(word))
+    return frozenset(words)
+
+
+@dataclass
+class TopicMatch:
+    """An earlier topic that a new one duplicates: a generated post or a topic queued before it."""
+    topic: str
+    similarity: float
+    post: Optional[PostRecord] = None
+
+    @property
+    def path(self) -> Optional[str]:
+        return self.post.path if self.post else None
+
+
+class TopicDeduplicator:
+    """Finds topics that are paraphrases of a generated post or of a topic queued earlier.
+
+    Topics are compared by the Jaccard similarity of their shingles (see
+    `shingles`), so "Intro to Kafka" and "Kafka for beginners" match. An
+    inverted index from shingle to topics limits the comparison to topics
+    sharing at least one shingle, which keeps lookups fast against tens of
+    thousands of posts. Topics are short, so the similarity is computed
+    exactly instead of estimated from MinHash signatures.
+    """
+
+    DEFAULT_THRESHOLD = 0.7
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        if not 0 < threshold <= 1:
+            raise ValueError("The duplicate threshold must be in (0, 1]")
+        self.threshold = threshold
+        self._entries: List[Tuple[str, FrozenSet[str], Optional[PostRecord]]] = []
+        self._postings: Dict[str, List[int]] = {}
+
+    @classmethod
+    def from_index(cls, index: OutputIndex, threshold: float = DEFAULT_THRESHOLD) -> "TopicDeduplicator":
+        """A deduplicator knowing every post in the output index, newest first."""
+        deduplicator = cls(threshold)
+        for post in index.posts():
+            deduplicator.add(post.topic, post)
+        return deduplicator
+
+    def add(self, topic: str, post: Optional[PostRecord] = None) -> None:
+        """Remember topic (and the post generated for it) for later matches."""
+        topic_shingles = shingles(topic)
+        number = len(self._entries)
+        self._entries.append((topic, topic_shingles, post))
+        for shingle in topic_shingles:
+            self._postings.setdefault(shingle, []).append(number)
+
+    def match(self, topic: str) -> Optional[TopicMatch]:
+        """The most similar known topic at or above the threshold; the earliest added wins ties."""
+        topic_shingles = shingles(topic)
+        if not topic_shingles:
+            return None
+        shared: Dict[int, int] = {}
+        for shingle in topic_shingles:
+            for number in self._postings.get(shingle, ()):
+                shared[number] = shared.get(number, 0) + 1
+
+        best = None
+        for number, count in sorted(shared.items()):
+            other = self._entries[number][1]
+            similarity = count / (len(topic_shingles) + len(other) - count)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (number, similarity)
+        if best is None:
+            return None
+        known_topic, _, post = self._entries[best[0]]
+        return TopicMatch(known_topic, round(best[1], 3), post)
+
+    def check(self, topic: str) -> Optional[TopicMatch]:
+        """Match topic against everything known so far, and remember it when it is new."""
+        found = self.match(topic)
+        if found is None:
+            self.add(topic)
+        return found